@@ -4,11 +4,17 @@ Análisis Estadístico de Resultados: Scraping Completo 1°-6° Básico
 Versión: 1.0 - Análisis Detallado
 """
 
-import pandas as pd
-import numpy as np
+import argparse
 from datetime import datetime
 
-def analyze_combined_file(file_path="oa_1b_6b_completo_todas_materias.csv"):
+from lazy_imports import lazy_import
+
+# pandas solo se carga al analizar el archivo (no para --help ni --expected-only)
+pd = lazy_import('pandas')
+
+DEFAULT_FILE = "oa_1b_6b_completo_todas_materias.csv"
+
+def analyze_combined_file(file_path=DEFAULT_FILE):
     """Analiza el archivo combinado con todas las estadísticas"""
     
     print("🔍 ANÁLISIS ESTADÍSTICO: SCRAPING COMPLETO 1°-6° BÁSICO")
@@ -150,8 +156,19 @@ def compare_with_expected():
 def main():
     """Función principal de análisis"""
     
+    parser = argparse.ArgumentParser(description='Análisis estadístico del scraping completo 1°-6° básico')
+    parser.add_argument('file', nargs='?', default=DEFAULT_FILE,
+                        help=f'CSV combinado a analizar (default: {DEFAULT_FILE})')
+    parser.add_argument('--expected-only', action='store_true',
+                        help='Mostrar solo la configuración esperada, sin leer el archivo')
+    args = parser.parse_args()
+    
+    if args.expected_only:
+        compare_with_expected()
+        return
+    
     # Analizar archivo principal
-    results = analyze_combined_file()
+    results = analyze_combined_file(args.file)
     
     if results:
         # Comparar con expectativas
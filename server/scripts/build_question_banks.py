@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Bancos de preguntas por engine × skin × dificultad en un .npz columnar
+Materializa los `difficulty_scaling` de los engines numéricos (ENG01 COUNTER,
+ENG02 DRAG_DROP_NUM) para cada skin del catálogo con question_bank.py y verifica
+el archivo escrito: invariantes de cada ítem y cobertura de cada combinación de
+rango y paso (ENG01) u operación (ENG02).
+
+Uso:
+    python build_question_banks.py                               # catálogo de 90, 200 ítems por banco
+    python build_question_banks.py --catalog completo --items 500 --seed 7 --out /tmp/banks.npz
+    python build_question_banks.py --verify --coverage           # revisar el archivo existente
+    python build_question_banks.py --query SKIN_MAT_001 easy 0
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from create_6_engines_basicos import create_engine_specifications
+from generate_skin_catalog import DEFAULT_VARIANTS, build_catalogs, iter_skins
+from question_bank import (
+    DEFAULT_ITEMS_PER_BANK, DEFAULT_SEED, DIFFICULTIES, GENERATORS, QuestionBank, build_banks, save_banks, verify_banks,
+)
+
+DEFAULT_OUT = 'question_banks.npz'
+
+def print_coverage(coverage):
+    """Ítems por combinación (todas las skins) y máximo de valores distintos en un banco"""
+    print(f"   {'engine':<6} {'dificultad':<10} {'rango':<7} {'paso/operación':<18} {'ítems':>7} {'valores/banco':>14}")
+    for (engine_id, difficulty, value_range, combination), (items, distinct) in sorted(
+            coverage.items(), key=lambda entry: (entry[0][0], DIFFICULTIES.index(entry[0][1]), entry[0][3])):
+        print(f"   {engine_id:<6} {difficulty:<10} {value_range:<7} {str(combination):<18} {items:7d} {distinct:14d}")
+
+def main():
+    """Genera, guarda y verifica los bancos de preguntas"""
+
+    parser = argparse.ArgumentParser(description='Genera bancos de preguntas por engine × skin × dificultad')
+    parser.add_argument('--catalog', choices=['90', 'completo'], default='90',
+                        help="Catálogo de skins (default: 90; 'completo' = generate_skin_catalog.py)")
+    parser.add_argument('--variants', type=int, default=DEFAULT_VARIANTS,
+                        help=f'Variantes del catálogo completo (default: {DEFAULT_VARIANTS})')
+    parser.add_argument('--items', type=int, default=DEFAULT_ITEMS_PER_BANK,
+                        help=f'Ítems por banco (default: {DEFAULT_ITEMS_PER_BANK})')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f'Semilla base (default: {DEFAULT_SEED})')
+    parser.add_argument('--out', default=DEFAULT_OUT, help=f'Archivo .npz (default: {DEFAULT_OUT})')
+    parser.add_argument('--verify', action='store_true', help='Solo verificar --out, sin regenerarlo (exit 1 si hay problemas)')
+    parser.add_argument('--coverage', action='store_true', help='Mostrar la cobertura por rango y paso u operación')
+    parser.add_argument('--query', nargs=3, metavar=('SKIN_ID', 'DIFICULTAD', 'INDICE'),
+                        help='Mostrar un ítem de --out y salir')
+    args = parser.parse_args()
+
+    if args.query:
+        skin_id, difficulty, index = args.query
+        try:
+            item = QuestionBank.load(args.out).item(skin_id, difficulty, int(index))
+        except (KeyError, IndexError, ValueError) as e:
+            print(f"❌ Error: {e.args[0]}")
+            return False
+        print(json.dumps(item, ensure_ascii=False))
+        return True
+
+    if args.items < 1:
+        parser.error('--items debe ser >= 1')
+
+    engines = create_engine_specifications()
+    catalogs = build_catalogs(args.catalog, args.variants)
+
+    if not args.verify:
+        print(f"🧮 Bancos de preguntas: catálogo '{args.catalog}', {args.items} ítems por banco, semilla {args.seed}")
+        print(f"   Engines con generador: {', '.join(GENERATORS)}")
+        start = time.perf_counter()
+        banks = build_banks(iter_skins(catalogs), engines, items_per_bank=args.items, seed=args.seed)
+        total = save_banks(args.out, banks, engines, seed=args.seed, items_per_bank=args.items)
+        elapsed = time.perf_counter() - start
+        items = sum(count for data in banks.values() for _, _, _, count in data['banks'])
+        print(f"✅ {args.out}: {total} bancos, {items} ítems, {os.path.getsize(args.out) / 1024:.0f} KB en {elapsed:.2f}s")
+
+    if not os.path.exists(args.out):
+        print(f"❌ Error: no existe {args.out}")
+        return False
+    bank = QuestionBank.load(args.out)
+    problems, coverage = verify_banks(bank, iter_skins(catalogs), engines)
+    if args.coverage:
+        print_coverage(coverage)
+    if problems:
+        for problem in problems[:20]:
+            print(f"   ❌ {problem}")
+        print(f"❌ {len(problems)} problemas en {args.out}")
+        return False
+    print(f"✅ {len(bank.index)} bancos verificados: {len(coverage)} combinaciones cubiertas")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Pipeline offline de assets de skins: manifest, atlas de texturas y audio sprites
+Traduce los `assets_needed` de cada skin del catálogo a assets de pools
+compartidos (temática, engine, global), los deduplica por hash de contenido y
+los empaqueta en bundles con skin_assets.py:
+
+    <out-dir>/manifest.json          bundles, ubicación de cada asset y skins → bundles
+    <out-dir>/skins/<skin_id>.json   manifest por skin: solo sus bundles y assets
+    <out-dir>/atlas/*.png|json       un atlas por temática (sprites) y engine (animaciones)
+    <out-dir>/audio/*.wav|json       un audio sprite por engine (formato howler.js)
+    <out-dir>/packs/*.zip            fuentes y textos
+    <out-dir>/files/*                fondos
+
+Un dispositivo descarga los pocos bundles de la skin en vez de un archivo por
+asset. Los archivos fuente se buscan en --assets-dir/<pool>/<nombre>.<ext>; sin
+ellos se generan igual los layouts y el manifest (con medidas de referencia) y
+el bundle queda "built": false. Los atlas PNG requieren Pillow.
+
+Uso:
+    python build_skin_assets.py                                  # catálogo de 90 skins
+    python build_skin_assets.py --catalog completo --assets-dir ../assets/skins --out-dir skin_assets
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from generate_skin_catalog import DEFAULT_VARIANTS, build_catalogs, iter_skins
+from skin_assets import (
+    DEFAULT_MAX_ATLAS_SIZE, DEFAULT_PADDING, PIL_AVAILABLE, AssetSource, build_manifest, write_bundles,
+)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_ASSETS_DIR = SCRIPTS_DIR.parent / 'assets' / 'skins'
+DEFAULT_OUT_DIR = 'skin_assets'
+# Lo único que escribe este script en --out-dir (y lo único que borra al regenerar)
+OUTPUT_ENTRIES = ('manifest.json', 'skins', 'atlas', 'audio', 'packs', 'files')
+
+def skin_manifest(manifest, skin_id):
+    """Manifest de una sola skin: sus bundles y la ubicación de sus assets"""
+    entry = manifest['skins'][skin_id]
+    return {
+        'skin_id': skin_id,
+        'version': manifest['version'],
+        'bundles': {bundle_id: manifest['bundles'][bundle_id] for bundle_id in entry['bundles']},
+        'assets': {key: manifest['assets'][key] for key in entry['assets']},
+    }
+
+def write_manifests(manifest, out_dir):
+    out_dir = Path(out_dir)
+    skins_dir = out_dir / 'skins'
+    skins_dir.mkdir(parents=True, exist_ok=True)
+    with open(out_dir / 'manifest.json', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+    for skin_id in manifest['skins']:
+        with open(skins_dir / f'{skin_id}.json', 'w', encoding='utf-8') as f:
+            json.dump(skin_manifest(manifest, skin_id), f, ensure_ascii=False, sort_keys=True)
+
+def clean_out_dir(out_dir):
+    """
+    Borra la salida de una corrida anterior: bundles viejos no deben quedar
+    colgando. Un directorio con otros archivos y sin manifest.json no se toca
+    """
+    if not out_dir.exists():
+        return
+    if not out_dir.is_dir():
+        raise ValueError(f"{out_dir} no es un directorio")
+    if any(out_dir.iterdir()) and not (out_dir / 'manifest.json').is_file():
+        raise ValueError(f"{out_dir} no está vacío y no tiene manifest.json de una corrida anterior: "
+                         f"usar un directorio nuevo")
+    for name in OUTPUT_ENTRIES:
+        path = out_dir / name
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+def main():
+    """Construye manifest y bundles de assets para un catálogo de skins"""
+
+    parser = argparse.ArgumentParser(description='Deduplica y empaqueta los assets de las skins en bundles compartidos')
+    parser.add_argument('--catalog', choices=['90', 'completo'], default='90',
+                        help="Catálogo de skins (default: 90; 'completo' = generate_skin_catalog.py)")
+    parser.add_argument('--variants', type=int, default=DEFAULT_VARIANTS,
+                        help=f'Variantes del catálogo completo (default: {DEFAULT_VARIANTS})')
+    parser.add_argument('--assets-dir', default=str(DEFAULT_ASSETS_DIR),
+                        help='Archivos fuente: <assets-dir>/<pool>/<nombre>.<ext> (default: ../assets/skins)')
+    parser.add_argument('--out-dir', default=DEFAULT_OUT_DIR, help=f'Directorio de salida (default: {DEFAULT_OUT_DIR})')
+    parser.add_argument('--max-atlas-size', type=int, default=DEFAULT_MAX_ATLAS_SIZE,
+                        help=f'Lado máximo de una página de atlas en px (default: {DEFAULT_MAX_ATLAS_SIZE})')
+    parser.add_argument('--padding', type=int, default=DEFAULT_PADDING,
+                        help=f'Separación entre sprites del atlas en px (default: {DEFAULT_PADDING})')
+    args = parser.parse_args()
+
+    print(f"🎨 Assets de skins: catálogo '{args.catalog}'")
+    start = time.perf_counter()
+
+    catalogs = build_catalogs(args.catalog, args.variants)
+    themes = {key: theme for catalog in catalogs for key, theme in catalog.themes.items()}
+    source = AssetSource(args.assets_dir if Path(args.assets_dir).is_dir() else None)
+    if source.assets_dir is None:
+        print(f"⚠️ Sin archivos fuente en {args.assets_dir}: solo layouts y manifest")
+    elif not PIL_AVAILABLE:
+        print("⚠️ Pillow no está instalado: los atlas quedan solo como layout (pip install -r requirements.txt)")
+
+    out_dir = Path(args.out_dir)
+    try:
+        manifest, bundles = build_manifest(iter_skins(catalogs), themes, source,
+                                           max_size=args.max_atlas_size, padding=args.padding)
+        clean_out_dir(out_dir)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return False
+
+    written = write_bundles(bundles, out_dir)
+    write_manifests(manifest, out_dir)
+    elapsed = time.perf_counter() - start
+
+    stats = manifest['stats']
+    by_type = {}
+    for bundle in manifest['bundles'].values():
+        by_type[bundle['type']] = by_type.get(bundle['type'], 0) + 1
+    built = [size for size in written.values() if size is not None]
+    print(f"✅ {out_dir}/manifest.json (versión {manifest['version']}) y {stats['skins']} manifests por skin")
+    print(f"   📦 {stats['naive_files']} archivos sumando assets_needed → {stats['unique_assets']} assets únicos "
+          f"({stats['packed_assets']} por contenido) → {stats['bundles']} bundles")
+    print(f"   {', '.join(f'{count} {kind}' for kind, count in sorted(by_type.items()))}")
+    print(f"   🏗️ {len(built)}/{len(written)} bundles construidos ({sum(built) / 1024:.0f} KB) en {elapsed:.2f}s")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
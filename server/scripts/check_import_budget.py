@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Presupuesto de tiempo de import para los CLI del pipeline de OA
+Ejecuta `python -X importtime <script> --help` para cada CLI y falla si el
+arranque carga alguna dependencia pesada (lazy_imports.HEAVY_MODULES) o si la
+suma de tiempos de import supera el presupuesto. Así un `import pandas` al
+inicio de un script nuevo (o una constante de módulo que toque el proxy) se
+detecta antes de llegar a los drivers que lanzan un subproceso por etapa.
+
+Uso:
+    python check_import_budget.py                      # todos los CLI, presupuesto por defecto
+    python check_import_budget.py --budget-ms 150 scrape_oa.py enrich_oa.py
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from lazy_imports import HEAVY_MODULES
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+# CLI con argparse: `--help` no debe hacer nada más que parsear argumentos
+CLI_SCRIPTS = [
+    'scrape_oa.py',
+    'oa_diff.py',
+    'oa_reference.py',
+    'enrich_oa.py',
+    'combinar_final_completo.py',
+    'load_847_oa_to_supabase.py',
+    'load_to_supabase.py',
+    'oa_game_index.py',
+    'generate_skin_catalog.py',
+    'build_skin_assets.py',
+    'build_question_banks.py',
+    'pipeline.py',
+    'analizar_resultados_completos.py',
+]
+
+# Suma de tiempos propios de import (-X importtime), incluye los módulos del intérprete
+DEFAULT_BUDGET_MS = 150
+
+def parse_importtime(stderr):
+    """
+    Líneas de -X importtime → (módulos top-level importados, suma de tiempos propios en ms)
+    Formato: 'import time:      self [us] |  cumulative | imported package'
+    """
+    modules = set()
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # encabezado
+        total_us += int(fields[0])
+        modules.add(fields[2].strip().split('.')[0])
+    return modules, total_us / 1000
+
+def measure(script):
+    """Importa `script` vía --help; retorna (script, módulos pesados, ms, error)"""
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'],
+                            cwd=SCRIPTS_DIR, env=env, capture_output=True, text=True)
+    modules, total_ms = parse_importtime(result.stderr)
+    error = None
+    if result.returncode != 0:
+        error = (result.stderr.strip().splitlines() or [f'exit {result.returncode}'])[-1]
+    heavy = sorted(module for module in modules if module in HEAVY_MODULES)
+    return script, heavy, total_ms, error
+
+def main():
+    """Mide el arranque de cada CLI y reporta los que exceden el presupuesto"""
+
+    parser = argparse.ArgumentParser(description='Verifica que los CLI del pipeline arranquen sin dependencias pesadas')
+    parser.add_argument('scripts', nargs='*', default=CLI_SCRIPTS,
+                        help='Scripts a medir (default: todos los CLI del pipeline)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Máximo de la suma de tiempos de import por script (default: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Scripts medidos en paralelo (default: 1, mediciones más estables)')
+    args = parser.parse_args()
+
+    print(f"⏱️  Presupuesto de import: {args.budget_ms:.0f} ms por CLI, sin {', '.join(HEAVY_MODULES)}")
+    print("-" * 70)
+
+    failures = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        for script, heavy, total_ms, error in executor.map(measure, args.scripts):
+            problems = []
+            if error:
+                problems.append(f"--help falló: {error}")
+            if heavy:
+                problems.append(f"importa {', '.join(heavy)}")
+            if total_ms > args.budget_ms:
+                problems.append("excede el presupuesto")
+            icon = '❌' if problems else '✅'
+            detail = f"  ({'; '.join(problems)})" if problems else ''
+            print(f"   {icon} {script:<36} {total_ms:7.1f} ms{detail}")
+            failures += bool(problems)
+
+    print("-" * 70)
+    if failures:
+        print(f"❌ {failures}/{len(args.scripts)} CLI fuera de presupuesto")
+        return False
+    print(f"✅ {len(args.scripts)} CLI dentro del presupuesto")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
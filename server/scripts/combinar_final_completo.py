@@ -1,14 +1,16 @@
 #!/usr/bin/env python3
 """
 Script para Combinar TODOS los Archivos Extraídos - Incluyendo ING_PROP
-Versión: 1.4.0 - Combinación Final Correcta
+Versión: 1.5.0 - Lectura en paralelo y regla explícita de duplicados
 """
 
-import pandas as pd
+import argparse
 import glob
 import os
 from datetime import datetime
 
+from oa_merge import DEFAULT_RULE, DEFAULT_WORKERS, MERGE_RULES, merge_oa, read_partials, write_conflict_report
+
 def log_info(message):
     """Logger simple"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -19,71 +21,57 @@ def log_success(message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] ✅ {message}")
 
+SUBJECT_FILES = [
+    "oa_his_todos_grados.csv",
+    "oa_edf_todos_grados.csv",
+    "oa_art_todos_grados.csv",
+    "oa_mus_todos_grados.csv",
+    "oa_tec_todos_grados.csv",
+    "oa_ori_todos_grados.csv",
+    "oa_ing_todos_grados.csv"
+]
+
+def partial_files(existing_file="oa_1b_6b_completo_todas_materias.csv"):
+    """Archivos a combinar, en orden fijo: existente, oa_completo_* (ordenados) y por asignatura"""
+    files = [existing_file] if os.path.exists(existing_file) else []
+    files.extend(sorted(glob.glob("oa_completo_*.csv")))
+    files.extend(f for f in SUBJECT_FILES if os.path.exists(f))
+    return files
+
 def main():
     """Función principal de combinación"""
     
+    parser = argparse.ArgumentParser(description='Combina todos los CSV parciales de OA en el archivo final')
+    parser.add_argument('--rule', choices=list(MERGE_RULES), default=DEFAULT_RULE,
+                        help=f'Versión que gana en oa_code duplicados (default: {DEFAULT_RULE})')
+    parser.add_argument('--conflicts-out', default='oa_merge_conflictos.csv',
+                        help='Reporte de duplicados con contenido distinto')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Archivos leídos en paralelo')
+    args = parser.parse_args()
+    
     print("🔄 COMBINANDO TODOS LOS ARCHIVOS DE OA")
     print("=" * 60)
     
-    all_dataframes = []
-    
-    # 1. CARGAR ARCHIVO EXISTENTE (si existe)
-    existing_file = "oa_1b_6b_completo_todas_materias.csv"
-    if os.path.exists(existing_file):
-        try:
-            existing_df = pd.read_csv(existing_file)
-            all_dataframes.append(existing_df)
-            log_info(f"📄 Archivo existente: {len(existing_df)} registros")
-        except Exception as e:
-            log_info(f"⚠️  Error cargando archivo existente: {e}")
-    
-    # 2. CARGAR TODOS LOS ARCHIVOS oa_completo_*
-    completo_files = glob.glob("oa_completo_*.csv")
-    log_info(f"🔍 Encontrados {len(completo_files)} archivos oa_completo_*")
+    # 1. LEER TODOS LOS ARCHIVOS EN PARALELO
+    files = partial_files()
+    log_info(f"🔍 Encontrados {len(files)} archivos parciales")
+    all_dataframes, errors = read_partials(files, workers=args.workers)
+    for file_path, df in all_dataframes:
+        log_info(f"📄 {file_path}: {len(df)} registros")
+    for file_path, error in errors:
+        log_info(f"⚠️  Error cargando {file_path}: {error}")
     
-    for file_path in completo_files:
-        try:
-            df = pd.read_csv(file_path)
-            if len(df) > 0:
-                all_dataframes.append(df)
-                log_info(f"📄 {file_path}: {len(df)} registros")
-        except Exception as e:
-            log_info(f"⚠️  Error cargando {file_path}: {e}")
-    
-    # 3. CARGAR ARCHIVOS ESPECÍFICOS DE ASIGNATURAS
-    subject_files = [
-        "oa_his_todos_grados.csv",
-        "oa_edf_todos_grados.csv", 
-        "oa_art_todos_grados.csv",
-        "oa_mus_todos_grados.csv",
-        "oa_tec_todos_grados.csv",
-        "oa_ori_todos_grados.csv",
-        "oa_ing_todos_grados.csv"
-    ]
-    
-    for file_path in subject_files:
-        if os.path.exists(file_path):
-            try:
-                df = pd.read_csv(file_path)
-                if len(df) > 0:
-                    all_dataframes.append(df)
-                    log_info(f"📄 {file_path}: {len(df)} registros")
-            except Exception as e:
-                log_info(f"⚠️  Error cargando {file_path}: {e}")
-    
-    # 4. COMBINAR TODOS LOS DATAFRAMES
+    # 2. COMBINAR Y RESOLVER DUPLICADOS CON LA REGLA EXPLÍCITA
     if all_dataframes:
-        log_info("🔄 Combinando todos los DataFrames...")
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        # Eliminar duplicados basado en código OA
-        initial_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates(subset=['oa_code'], keep='first')
-        final_count = len(combined_df)
-        
-        duplicates_removed = initial_count - final_count
-        if duplicates_removed > 0:
-            log_info(f"🔄 Duplicados eliminados: {duplicates_removed}")
+        log_info(f"🔄 Combinando todos los DataFrames (regla: {args.rule})...")
+        combined_df, conflicts, stats = merge_oa(all_dataframes, rule=args.rule)
+        final_count = stats['unique']
+        
+        if stats['duplicates'] > 0:
+            log_info(f"🔄 Duplicados resueltos: {stats['duplicates']} ({stats['conflicts']} con contenido distinto)")
+        write_conflict_report(conflicts, args.conflicts_out)
+        if stats['conflicts'] > 0:
+            log_info(f"⚠️  Conflictos: {args.conflicts_out}")
         
         # Ordenar por grado y asignatura
         grade_order = ['1B', '2B', '3B', '4B', '5B', '6B']
@@ -7,11 +7,16 @@ Versión: 1.0 - Targeted Recovery
 
 import sys
 import os
-import subprocess
-import time
+import logging
 import pandas as pd
 from datetime import datetime
 
+from oa_merge import DEFAULT_RULE, merge_oa, write_conflict_report
+from scrape_oa import MinEducOAScraper
+
+# El scraper corre en este mismo proceso: solo mostrar sus advertencias
+logging.getLogger('scrape_oa').setLevel(logging.WARNING)
+
 def log_info(message):
     """Logger simple"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -27,8 +32,8 @@ def log_error(message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] ❌ {message}")
 
-def scrape_single_subject_all_grades(subject, max_oa=50):
-    """Procesa una asignatura específica para todos los grados relevantes"""
+def scrape_single_subject_all_grades(scraper, subject):
+    """Procesa una asignatura específica para todos los grados relevantes (en memoria)"""
     
     # Definir grados según disponibilidad de la asignatura
     if subject == 'ING':
@@ -36,90 +41,61 @@ def scrape_single_subject_all_grades(subject, max_oa=50):
     else:
         grades = ['1B', '2B', '3B', '4B', '5B', '6B']  # Otras asignaturas en todos los grados
     
-    output_file = f"oa_{subject.lower()}_todos_grados.csv"
-    
-    # Construir comando
-    command = ["python", "scrape_oa.py"]
-    command.extend(["--grades"] + grades)
-    command.extend(["--subjects", subject])
-    command.extend(["--max-oa", str(max_oa)])
-    command.extend(["--out", output_file])
-    command.append("--verbose")
-    
     log_info(f"Procesando asignatura {subject} en grados: {', '.join(grades)}")
-    log_info(f"Comando: {' '.join(command)}")
     
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=600)
-        
-        if result.returncode == 0:
-            if os.path.exists(output_file):
-                df = pd.read_csv(output_file)
-                count = len(df)
-                if count > 0:
-                    log_success(f"Asignatura {subject}: {count} OA extraídos")
-                    
-                    # Mostrar distribución por grado
-                    grade_dist = df['grade'].value_counts().sort_index()
-                    for grade, cnt in grade_dist.items():
-                        log_info(f"   {grade}: {cnt} OA")
-                    
-                    return True, output_file, count
-                else:
-                    log_error(f"Asignatura {subject}: Archivo vacío")
-                    return False, None, 0
-            else:
-                log_error(f"Asignatura {subject}: Archivo no creado")
-                return False, None, 0
-        else:
-            log_error(f"Asignatura {subject}: Error en scraping")
-            log_error(f"STDERR: {result.stderr[:200]}...")
-            return False, None, 0
-            
-    except subprocess.TimeoutExpired:
-        log_error(f"Asignatura {subject}: Timeout (10 minutos)")
-        return False, None, 0
+        records = scraper.scrape_batch({grade: [subject] for grade in grades})
     except Exception as e:
         log_error(f"Asignatura {subject}: Excepción - {e}")
-        return False, None, 0
+        return False, [], 0
+    
+    count = len(records)
+    if count == 0:
+        log_error(f"Asignatura {subject}: Sin OA extraídos")
+        return False, [], 0
+    
+    log_success(f"Asignatura {subject}: {count} OA extraídos")
+    
+    # Mostrar distribución por grado
+    grade_dist = pd.Series([r['grade'] for r in records]).value_counts().sort_index()
+    for grade, cnt in grade_dist.items():
+        log_info(f"   {grade}: {cnt} OA")
+    
+    return True, records, count
 
-def combine_with_existing(new_files, existing_file="oa_1b_6b_completo_todas_materias.csv"):
-    """Combina los nuevos archivos con el archivo existente"""
+def combine_with_existing(new_records, existing_file="oa_1b_6b_completo_todas_materias.csv", rule=DEFAULT_RULE):
+    """Combina los registros nuevos con el archivo existente; los duplicados se resuelven con `rule`"""
     
     output_file = "oa_1b_6b_COMPLETO_FINAL.csv"
+    conflicts_file = "oa_1b_6b_COMPLETO_FINAL_conflictos.csv"
     
-    log_info("Combinando archivos nuevos con datos existentes...")
+    log_info("Combinando registros nuevos con datos existentes...")
     
     try:
+        frames = []
         # Cargar archivo existente
         if os.path.exists(existing_file):
             existing_df = pd.read_csv(existing_file)
+            frames.append((existing_file, existing_df))
             log_info(f"Datos existentes: {len(existing_df)} registros")
         else:
             log_error(f"Archivo existente no encontrado: {existing_file}")
-            existing_df = pd.DataFrame()
-        
-        # Cargar y combinar nuevos archivos
-        combined_df = existing_df.copy()
         
-        for file in new_files:
-            if os.path.exists(file):
-                df = pd.read_csv(file)
-                combined_df = pd.concat([combined_df, df], ignore_index=True)
-                log_info(f"   📄 {file}: +{len(df)} registros")
-            else:
-                log_error(f"   ❌ {file}: No encontrado")
+        new_df = pd.DataFrame(new_records)
+        log_info(f"   📄 Registros nuevos: +{len(new_df)}")
+        frames.append(('scraping actual', new_df))
         
-        # Eliminar duplicados
-        before_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates(subset=['oa_code'], keep='first')
-        after_count = len(combined_df)
+        # Un solo concat y una versión por oa_code según la regla
+        combined_df, conflicts, stats = merge_oa(frames, rule=rule)
+        write_conflict_report(conflicts, conflicts_file)
         
         # Guardar archivo final
         combined_df.to_csv(output_file, index=False, encoding='utf-8')
         
         log_success(f"Archivo final combinado: {output_file}")
-        log_success(f"Total registros: {after_count} (eliminados {before_count - after_count} duplicados)")
+        log_success(f"Total registros: {stats['unique']} (resueltos {stats['duplicates']} duplicados con regla '{rule}')")
+        if stats['conflicts'] > 0:
+            log_info(f"⚠️  {stats['conflicts']} duplicados con contenido distinto: {conflicts_file}")
         
         return True, output_file
         
@@ -195,43 +171,39 @@ def main():
     print()
     
     max_oa_per_page = 100
-    successful_files = []
+    scraper = MinEducOAScraper(max_oa_limit=max_oa_per_page)
+    successful_subjects = []
+    new_records = []
     total_new_oa = 0
     failed_subjects = []
     
     # Procesar cada asignatura faltante
-    for i, subject in enumerate(missing_subjects, 1):
-        print(f"\n📖 ASIGNATURA {subject} ({i}/{len(missing_subjects)})")
-        print("-" * 40)
-        
-        success, output_file, oa_count = scrape_single_subject_all_grades(
-            subject=subject,
-            max_oa=max_oa_per_page
-        )
-        
-        if success:
-            successful_files.append(output_file)
-            total_new_oa += oa_count
-            log_success(f"Asignatura {subject} completada: {oa_count} OA")
-        else:
-            failed_subjects.append(subject)
-            log_error(f"Asignatura {subject} falló")
-        
-        # Pausa entre asignaturas
-        if i < len(missing_subjects):
-            log_info("Pausa de 3 segundos...")
-            time.sleep(3)
+    with scraper:
+        for i, subject in enumerate(missing_subjects, 1):
+            print(f"\n📖 ASIGNATURA {subject} ({i}/{len(missing_subjects)})")
+            print("-" * 40)
+            
+            success, records, oa_count = scrape_single_subject_all_grades(scraper, subject)
+            
+            if success:
+                successful_subjects.append(subject)
+                new_records.extend(records)
+                total_new_oa += oa_count
+                log_success(f"Asignatura {subject} completada: {oa_count} OA")
+            else:
+                failed_subjects.append(subject)
+                log_error(f"Asignatura {subject} falló")
     
     # Resumen del proceso de recuperación
     print(f"\n📊 RESUMEN DE RECUPERACIÓN")
     print("-" * 40)
-    log_success(f"Asignaturas exitosas: {len(successful_files)}/{len(missing_subjects)}")
+    log_success(f"Asignaturas exitosas: {len(successful_subjects)}/{len(missing_subjects)}")
     log_success(f"Total OA nuevos: {total_new_oa}")
     
     if failed_subjects:
         log_error(f"Asignaturas fallidas: {', '.join(failed_subjects)}")
     
-    if not successful_files:
+    if not successful_subjects:
         log_error("No se recuperó ninguna asignatura")
         return
     
@@ -239,7 +211,7 @@ def main():
     print(f"\n📁 COMBINANDO CON DATOS EXISTENTES")
     print("-" * 40)
     
-    success, final_file = combine_with_existing(successful_files)
+    success, final_file = combine_with_existing(new_records)
     
     if not success:
         log_error("Error combinando con datos existentes")
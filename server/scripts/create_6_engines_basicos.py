@@ -9,6 +9,16 @@ import json
 import uuid
 from datetime import datetime
 
+from sql_literals import RowEncoder
+from sql_writer import insert_statements, write_sql
+
+ENGINE_ENCODER = RowEncoder([
+    ('engine_id', 'text'), ('code', 'text'), ('name', 'text'), ('version', 'text'), ('description', 'text'),
+    ('subject_affinity', 'text[]'), ('recommended_grades', 'text[]'), ('bloom_levels', 'text[]'),
+    ('cognitive_skills', 'text[]'), ('game_mechanics', 'jsonb'), ('technical_config', 'jsonb'),
+    ('learning_objectives', 'text[]'), ('difficulty_scaling', 'jsonb'), ('status', 'text')
+])
+
 def create_engine_specifications():
     """Define las especificaciones técnicas de los 6 engines básicos"""
     
@@ -242,9 +252,9 @@ def create_engine_specifications():
     return engines
 
 def generate_engine_sql(engines):
-    """Genera SQL para insertar los engines en Supabase"""
+    """Genera SQL para insertar los engines en Supabase, fragmento a fragmento (ver sql_writer)"""
     
-    sql = """-- ===============================================
+    yield """-- ===============================================
 -- CREACIÓN: 6 ENGINES BÁSICOS PRIORITARIOS EDU21
 -- Fecha: {timestamp}
 -- Versión: 1.0
@@ -265,12 +275,15 @@ CREATE TABLE IF NOT EXISTS game_engine (
     technical_config jsonb, -- Configuración técnica
     learning_objectives text[], -- Array de códigos OA
     difficulty_scaling jsonb, -- Configuración de dificultad
-    status varchar(20) DEFAULT 'development',
+    status varchar(30) DEFAULT 'development',
     created_at timestamp DEFAULT now(),
     updated_at timestamp DEFAULT now(),
     created_by varchar(50) DEFAULT 'system'
 );
 
+-- 'ready_for_development' no cabe en varchar(20) (tablas creadas con la versión anterior)
+ALTER TABLE game_engine ALTER COLUMN status TYPE varchar(30);
+
 -- Índices para optimización
 CREATE INDEX IF NOT EXISTS idx_game_engine_subject ON game_engine USING GIN (subject_affinity);
 CREATE INDEX IF NOT EXISTS idx_game_engine_grades ON game_engine USING GIN (recommended_grades);
@@ -281,40 +294,16 @@ CREATE INDEX IF NOT EXISTS idx_game_engine_status ON game_engine(status);
 
 """.format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
     
-    for engine in engines:
-        sql += f"""
-INSERT INTO game_engine (
-    engine_id, code, name, version, description,
-    subject_affinity, recommended_grades, bloom_levels, cognitive_skills,
-    game_mechanics, technical_config, learning_objectives, difficulty_scaling,
-    status
-) VALUES (
-    '{engine['engine_id']}',
-    '{engine['code']}',
-    '{engine['name']}',
-    '{engine['version']}',
-    {repr(engine['description'])},
-    ARRAY{engine['subject_affinity']},
-    ARRAY{engine['recommended_grades']},
-    ARRAY{engine['bloom_levels']},
-    ARRAY{engine['cognitive_skills']},
-    '{json.dumps(engine['game_mechanics'], ensure_ascii=False)}'::jsonb,
-    '{json.dumps(engine['technical_config'], ensure_ascii=False)}'::jsonb,
-    ARRAY{engine['learning_objectives']},
-    '{json.dumps(engine['difficulty_scaling'], ensure_ascii=False)}'::jsonb,
-    'ready_for_development'
-)
-ON CONFLICT (engine_id) DO UPDATE SET
+    rows = (ENGINE_ENCODER.literals(dict(engine, status='ready_for_development')) for engine in engines)
+    yield from insert_statements('game_engine', ENGINE_ENCODER.columns, rows, on_conflict="""ON CONFLICT (engine_id) DO UPDATE SET
     description = EXCLUDED.description,
     game_mechanics = EXCLUDED.game_mechanics,
     technical_config = EXCLUDED.technical_config,
     learning_objectives = EXCLUDED.learning_objectives,
     difficulty_scaling = EXCLUDED.difficulty_scaling,
-    updated_at = now();
-
-"""
+    updated_at = now()""")
     
-    sql += """
+    yield """
 -- Verificaciones y estadísticas
 SELECT 
     '🎮 ENGINES CREADOS' as status,
@@ -350,8 +339,13 @@ CREATE TABLE IF NOT EXISTS engine_learning_objective (
     estimated_playtime_minutes integer DEFAULT 15,
     created_at timestamp DEFAULT now()
 );
+-- Migración: los seeds anteriores insertaban sin clave y pueden haber duplicado filas; se conserva la más reciente
+DELETE FROM engine_learning_objective older USING engine_learning_objective newer
+WHERE older.engine_id = newer.engine_id AND older.oa_code = newer.oa_code
+  AND (COALESCE(older.created_at, '-infinity'), older.id) < (COALESCE(newer.created_at, '-infinity'), newer.id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_engine_learning_objective_pair ON engine_learning_objective(engine_id, oa_code);
 
--- Poblar relaciones engine-OA
+-- Poblar relaciones engine-OA (idempotente: una relación por engine y OA)
 INSERT INTO engine_learning_objective (engine_id, oa_code, compatibility_score, recommended_difficulty)
 SELECT 
     e.engine_id,
@@ -372,8 +366,6 @@ FROM game_engine e
 LEFT JOIN engine_learning_objective elo ON e.engine_id = elo.engine_id
 WHERE e.status = 'ready_for_development';
 """
-    
-    return sql
 
 def generate_implementation_roadmap():
     """Genera el roadmap de implementación de los engines"""
@@ -463,11 +455,10 @@ def main():
     
     # 2. GENERAR SQL
     print("📤 Generando SQL para Supabase...")
-    sql_content = generate_engine_sql(engines)
     sql_file = "engines_6_basicos_supabase.sql"
     
     with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write(sql_content)
+        write_sql(f, generate_engine_sql(engines))
     print(f"✅ SQL guardado: {sql_file}")
     print()
     
@@ -3,483 +3,27 @@
 DESARROLLO: 90 SKINS COMPLETOS PARA MAT Y LEN
 Script para crear catálogo completo de skins con especificaciones técnicas
 45 skins MAT + 45 skins LEN con variaciones temáticas y de dificultad
+Las skins se declaran como familias temática × engine × dificultad × variante
+(skin_spec.py) con una plantilla por engine; generate_skin_catalog.py reutiliza
+temáticas y plantillas para el catálogo completo de todos los grados
 """
 
 import json
-import uuid
 from datetime import datetime
 
-def create_math_skins():
-    """Crea las 45 skins para matemáticas"""
-    
-    # Temáticas base para matemáticas
-    themes = {
-        "animales": {
-            "name": "Reino Animal",
-            "colors": ["#FF6B6B", "#4ECDC4", "#45B7D1"],
-            "elements": ["perros", "gatos", "pájaros", "peces", "insectos"],
-            "appeal": "high"
-        },
-        "espacio": {
-            "name": "Aventura Espacial", 
-            "colors": ["#1A1A2E", "#16213E", "#E94560"],
-            "elements": ["planetas", "cohetes", "estrellas", "aliens", "meteoritos"],
-            "appeal": "high"
-        },
-        "deportes": {
-            "name": "Mundo Deportivo",
-            "colors": ["#FF9500", "#00B894", "#0984E3"],
-            "elements": ["pelotas", "uniformes", "medallas", "campos", "equipos"],
-            "appeal": "medium"
-        },
-        "naturaleza": {
-            "name": "Naturaleza Viva",
-            "colors": ["#00B894", "#FDCB6E", "#6C5CE7"],
-            "elements": ["árboles", "flores", "montañas", "ríos", "jardines"],
-            "appeal": "medium"
-        },
-        "fantasia": {
-            "name": "Mundo Fantástico",
-            "colors": ["#A29BFE", "#FD79A8", "#FDCB6E"],
-            "elements": ["dragones", "castillos", "magos", "princesas", "tesoros"],
-            "appeal": "high"
-        },
-        "vehiculos": {
-            "name": "Medios de Transporte",
-            "colors": ["#74B9FF", "#00CEC9", "#FD79A8"],
-            "elements": ["autos", "aviones", "barcos", "trenes", "bicicletas"],
-            "appeal": "high"
-        },
-        "cocina": {
-            "name": "Chef en Acción",
-            "colors": ["#E17055", "#FDCB6E", "#00B894"],
-            "elements": ["frutas", "verduras", "pasteles", "utensilios", "recetas"],
-            "appeal": "medium"
-        },
-        "piratas": {
-            "name": "Aventura Pirata",
-            "colors": ["#8B4513", "#FFD700", "#000080"],
-            "elements": ["barcos", "tesoros", "mapas", "loros", "islas"],
-            "appeal": "high"
-        },
-        "circo": {
-            "name": "Gran Circo",
-            "colors": ["#FF0000", "#FFD700", "#FF1493"],
-            "elements": ["payasos", "leones", "trapecistas", "malabares", "carpa"],
-            "appeal": "high"
-        }
-    }
-    
-    math_skins = []
-    
-    # ENG01-COUNTER: 15 skins (5 por cada theme principal)
-    counter_themes = ["animales", "espacio", "naturaleza"]
-    for i, theme_key in enumerate(counter_themes):
-        theme = themes[theme_key]
-        for difficulty in ["easy", "medium", "hard"]:
-            for variant in range(5):
-                skin_id = f"SKIN_MAT_{str(len(math_skins) + 1).zfill(3)}"
-                
-                skin = {
-                    "skin_id": skin_id,
-                    "engine_id": "ENG01",
-                    "engine_code": "COUNTER",
-                    "name": f"{theme['name']} - Contador {difficulty.title()} {variant + 1}",
-                    "description": f"Conteo con {theme['elements'][variant % len(theme['elements'])]} del {theme['name'].lower()}",
-                    "theme": theme_key,
-                    "subject": "MAT",
-                    "recommended_grades": ["1B", "2B", "3B"],
-                    "bloom_level": ["Recordar", "Comprender"][difficulty != "easy"],
-                    "difficulty": difficulty,
-                    "visual_config": {
-                        "primary_color": theme["colors"][0],
-                        "secondary_color": theme["colors"][1],
-                        "accent_color": theme["colors"][2],
-                        "background_style": "gradient" if variant % 2 == 0 else "pattern",
-                        "animation_style": "bounce" if theme_key == "animales" else "slide",
-                        "element_style": theme["elements"][variant % len(theme["elements"])],
-                        "ui_complexity": "simple" if difficulty == "easy" else "detailed"
-                    },
-                    "gameplay_config": {
-                        "max_count": 10 if difficulty == "easy" else (50 if difficulty == "medium" else 100),
-                        "counting_style": "visual_objects",
-                        "feedback_type": "immediate_positive",
-                        "sound_effects": True,
-                        "voice_narration": True,
-                        "hint_system": difficulty != "hard"
-                    },
-                    "learning_objectives": ["MA01OA01", "MA01OA02", "MA02OA01"],
-                    "appeal_rating": theme["appeal"],
-                    "estimated_dev_time": "3 days",
-                    "assets_needed": {
-                        "sprites": 15,
-                        "sounds": 8,
-                        "animations": 6,
-                        "backgrounds": 3
-                    }
-                }
-                
-                math_skins.append(skin)
-                if len(math_skins) >= 15:
-                    break
-            if len(math_skins) >= 15:
-                break
-        if len(math_skins) >= 15:
-            break
-    
-    # ENG02-DRAG_DROP_NUM: 15 skins
-    dragdrop_themes = ["deportes", "fantasia", "vehiculos"]
-    for i, theme_key in enumerate(dragdrop_themes):
-        theme = themes[theme_key]
-        for difficulty in ["easy", "medium", "hard"]:
-            for variant in range(5):
-                if len(math_skins) >= 30:
-                    break
-                    
-                skin_id = f"SKIN_MAT_{str(len(math_skins) + 1).zfill(3)}"
-                
-                skin = {
-                    "skin_id": skin_id,
-                    "engine_id": "ENG02",
-                    "engine_code": "DRAG_DROP_NUM",
-                    "name": f"{theme['name']} - Arrastrar {difficulty.title()} {variant + 1}",
-                    "description": f"Arrastrar y soltar {theme['elements'][variant % len(theme['elements'])]} ordenadamente",
-                    "theme": theme_key,
-                    "subject": "MAT",
-                    "recommended_grades": ["1B", "2B", "3B", "4B"],
-                    "bloom_level": ["Comprender", "Aplicar"][difficulty == "hard"],
-                    "difficulty": difficulty,
-                    "visual_config": {
-                        "primary_color": theme["colors"][0],
-                        "secondary_color": theme["colors"][1],
-                        "accent_color": theme["colors"][2],
-                        "background_style": "illustrated",
-                        "animation_style": "smooth_drag",
-                        "element_style": theme["elements"][variant % len(theme["elements"])],
-                        "drop_zone_style": "highlighted_areas"
-                    },
-                    "gameplay_config": {
-                        "max_items": 4 if difficulty == "easy" else (8 if difficulty == "medium" else 12),
-                        "drag_sensitivity": "child_friendly",
-                        "snap_assistance": difficulty != "hard",
-                        "operation_types": ["sort", "group", "match"],
-                        "feedback_type": "visual_audio_combined",
-                        "celebration_animation": True
-                    },
-                    "learning_objectives": ["MA01OA04", "MA01OA09", "MA02OA04"],
-                    "appeal_rating": theme["appeal"],
-                    "estimated_dev_time": "4 days",
-                    "assets_needed": {
-                        "sprites": 20,
-                        "sounds": 10,
-                        "animations": 8,
-                        "backgrounds": 2
-                    }
-                }
-                
-                math_skins.append(skin)
-            if len(math_skins) >= 30:
-                break
-        if len(math_skins) >= 30:
-            break
-    
-    # Rellenar hasta 45 con variaciones de engines híbridos
-    remaining_themes = ["cocina", "piratas", "circo"]
-    hybrid_engines = ["ENG01", "ENG02"] * 8  # Alternar engines
-    
-    for i in range(15):  # 45 - 30 = 15 skins adicionales
-        theme_key = remaining_themes[i % len(remaining_themes)]
-        theme = themes[theme_key]
-        engine_id = hybrid_engines[i % len(hybrid_engines)]
-        engine_code = "COUNTER" if engine_id == "ENG01" else "DRAG_DROP_NUM"
-        
-        skin_id = f"SKIN_MAT_{str(len(math_skins) + 1).zfill(3)}"
-        
-        skin = {
-            "skin_id": skin_id,
-            "engine_id": engine_id,
-            "engine_code": engine_code,
-            "name": f"{theme['name']} - Especial {i + 1}",
-            "description": f"Skin especial de {theme['name'].lower()} con elementos únicos",
-            "theme": theme_key,
-            "subject": "MAT",
-            "recommended_grades": ["1B", "2B", "3B"],
-            "bloom_level": "Aplicar",
-            "difficulty": "medium",
-            "visual_config": {
-                "primary_color": theme["colors"][0],
-                "secondary_color": theme["colors"][1],
-                "accent_color": theme["colors"][2],
-                "background_style": "immersive",
-                "animation_style": "theme_specific",
-                "element_style": theme["elements"][i % len(theme["elements"])],
-                "special_effects": True
-            },
-            "gameplay_config": {
-                "hybrid_mechanics": True,
-                "difficulty_adaptive": True,
-                "reward_system": "advanced",
-                "social_features": True,
-                "progression_tracking": True
-            },
-            "learning_objectives": ["MA01OA01", "MA01OA04", "MA02OA01"],
-            "appeal_rating": "high",
-            "estimated_dev_time": "5 days",
-            "assets_needed": {
-                "sprites": 25,
-                "sounds": 12,
-                "animations": 10,
-                "backgrounds": 4
-            }
-        }
-        
-        math_skins.append(skin)
-    
-    return math_skins
+from skin_spec import THEME_COLORS, By, SkinCatalog, SkinFamily, expand_skins
+from sql_literals import RowEncoder
+from sql_writer import DEFAULT_BATCH_SIZE, insert_statements, write_sql
 
-def create_language_skins():
-    """Crea las 45 skins para lenguaje"""
-    
-    # Temáticas base para lenguaje
-    themes = {
-        "cuentos": {
-            "name": "Mundo de Cuentos",
-            "colors": ["#FF6B9D", "#C44569", "#F8B500"],
-            "elements": ["princesas", "dragones", "castillos", "bosques", "hadas"],
-            "appeal": "high"
-        },
-        "biblioteca": {
-            "name": "Gran Biblioteca",
-            "colors": ["#8B4513", "#DAA520", "#2E8B57"],
-            "elements": ["libros", "estantes", "lámparas", "sillones", "mapas"],
-            "appeal": "medium"
-        },
-        "aventura": {
-            "name": "Aventura Literaria",
-            "colors": ["#FF6347", "#32CD32", "#4169E1"],
-            "elements": ["exploradores", "brújulas", "mapas", "tesoros", "cavernas"],
-            "appeal": "high"
-        },
-        "musicales": {
-            "name": "Letras Musicales",
-            "colors": ["#9370DB", "#FF69B4", "#FFD700"],
-            "elements": ["notas", "instrumentos", "partituras", "micrófonos", "escenarios"],
-            "appeal": "high"
-        },
-        "detectives": {
-            "name": "Detective de Palabras",
-            "colors": ["#2F4F4F", "#B8860B", "#DC143C"],
-            "elements": ["lupas", "pistas", "huellas", "sombreros", "documentos"],
-            "appeal": "high"
-        },
-        "jardin": {
-            "name": "Jardín de Letras",
-            "colors": ["#228B22", "#FFB6C1", "#87CEEB"],
-            "elements": ["flores", "mariposas", "árboles", "regaderas", "semillas"],
-            "appeal": "medium"
-        },
-        "cocina_letras": {
-            "name": "Cocina de Palabras",
-            "colors": ["#FF4500", "#FFFF00", "#32CD32"],
-            "elements": ["recetas", "ingredientes", "ollas", "cucharas", "hornos"],
-            "appeal": "medium"
-        },
-        "laboratorio": {
-            "name": "Laboratorio Lingüístico",
-            "colors": ["#4169E1", "#32CD32", "#FF6347"],
-            "elements": ["tubos", "fórmulas", "microscopios", "experimentos", "cristales"],
-            "appeal": "medium"
-        },
-        "teatro": {
-            "name": "Gran Teatro",
-            "colors": ["#8B0000", "#FFD700", "#4B0082"],
-            "elements": ["escenarios", "telones", "máscaras", "vestuarios", "luces"],
-            "appeal": "high"
-        }
-    }
-    
-    language_skins = []
-    
-    # ENG05-TEXT_RECOG: 15 skins
-    textrecog_themes = ["cuentos", "biblioteca", "aventura"]
-    for i, theme_key in enumerate(textrecog_themes):
-        theme = themes[theme_key]
-        for difficulty in ["easy", "medium", "hard"]:
-            for variant in range(5):
-                skin_id = f"SKIN_LEN_{str(len(language_skins) + 1).zfill(3)}"
-                
-                skin = {
-                    "skin_id": skin_id,
-                    "engine_id": "ENG05",
-                    "engine_code": "TEXT_RECOG",
-                    "name": f"{theme['name']} - Reconocer {difficulty.title()} {variant + 1}",
-                    "description": f"Reconocimiento de letras y palabras en el {theme['name'].lower()}",
-                    "theme": theme_key,
-                    "subject": "LEN",
-                    "recommended_grades": ["1B", "2B", "3B"],
-                    "bloom_level": ["Recordar", "Comprender"][difficulty != "easy"],
-                    "difficulty": difficulty,
-                    "visual_config": {
-                        "primary_color": theme["colors"][0],
-                        "secondary_color": theme["colors"][1],
-                        "accent_color": theme["colors"][2],
-                        "background_style": "storybook",
-                        "animation_style": "gentle_fade",
-                        "element_style": theme["elements"][variant % len(theme["elements"])],
-                        "typography": "child_friendly",
-                        "font_scaling": True
-                    },
-                    "gameplay_config": {
-                        "text_complexity": "letters" if difficulty == "easy" else ("words" if difficulty == "medium" else "sentences"),
-                        "recognition_type": "visual_matching",
-                        "hint_system": "progressive",
-                        "audio_support": True,
-                        "dyslexia_friendly": True,
-                        "feedback_type": "encouraging"
-                    },
-                    "learning_objectives": ["LE01OA01", "LE01OA02", "LE02OA03"],
-                    "appeal_rating": theme["appeal"],
-                    "estimated_dev_time": "4 days",
-                    "assets_needed": {
-                        "sprites": 18,
-                        "sounds": 15,
-                        "animations": 8,
-                        "fonts": 3,
-                        "backgrounds": 3
-                    }
-                }
-                
-                language_skins.append(skin)
-                if len(language_skins) >= 15:
-                    break
-            if len(language_skins) >= 15:
-                break
-        if len(language_skins) >= 15:
-            break
-    
-    # ENG06-LETTER_SOUND: 15 skins
-    lettersound_themes = ["musicales", "detectives", "jardin"]
-    for i, theme_key in enumerate(lettersound_themes):
-        theme = themes[theme_key]
-        for difficulty in ["easy", "medium", "hard"]:
-            for variant in range(5):
-                if len(language_skins) >= 30:
-                    break
-                    
-                skin_id = f"SKIN_LEN_{str(len(language_skins) + 1).zfill(3)}"
-                
-                skin = {
-                    "skin_id": skin_id,
-                    "engine_id": "ENG06",
-                    "engine_code": "LETTER_SOUND",
-                    "name": f"{theme['name']} - Sonidos {difficulty.title()} {variant + 1}",
-                    "description": f"Asociación letra-sonido en el contexto de {theme['name'].lower()}",
-                    "theme": theme_key,
-                    "subject": "LEN",
-                    "recommended_grades": ["1B", "2B"],
-                    "bloom_level": ["Recordar", "Comprender", "Aplicar"][min(difficulty == "hard", 2)],
-                    "difficulty": difficulty,
-                    "visual_config": {
-                        "primary_color": theme["colors"][0],
-                        "secondary_color": theme["colors"][1],
-                        "accent_color": theme["colors"][2],
-                        "background_style": "interactive",
-                        "animation_style": "sound_waves",
-                        "element_style": theme["elements"][variant % len(theme["elements"])],
-                        "phonetic_visualization": True
-                    },
-                    "gameplay_config": {
-                        "phoneme_complexity": "vowels" if difficulty == "easy" else ("consonants" if difficulty == "medium" else "combinations"),
-                        "audio_quality": "crystal_clear",
-                        "voice_variety": True,
-                        "recording_capability": True,
-                        "pronunciation_feedback": "real_time",
-                        "hearing_impaired_support": True
-                    },
-                    "learning_objectives": ["LE01OA03", "LE01OA04", "LE02OA04"],
-                    "appeal_rating": theme["appeal"],
-                    "estimated_dev_time": "5 days",
-                    "assets_needed": {
-                        "sprites": 20,
-                        "sounds": 25,
-                        "animations": 12,
-                        "voice_clips": 50,
-                        "backgrounds": 2
-                    }
-                }
-                
-                language_skins.append(skin)
-            if len(language_skins) >= 30:
-                break
-        if len(language_skins) >= 30:
-            break
-    
-    # ENG07-READING_FLUENCY: 15 skins adicionales
-    fluency_themes = ["cocina_letras", "laboratorio", "teatro"]
-    for i in range(15):
-        theme_key = fluency_themes[i % len(fluency_themes)]
-        theme = themes[theme_key]
-        
-        skin_id = f"SKIN_LEN_{str(len(language_skins) + 1).zfill(3)}"
-        
-        difficulty_cycle = ["easy", "medium", "hard"][i % 3]
-        
-        skin = {
-            "skin_id": skin_id,
-            "engine_id": "ENG07",
-            "engine_code": "READING_FLUENCY",
-            "name": f"{theme['name']} - Fluidez {difficulty_cycle.title()} {(i // 3) + 1}",
-            "description": f"Desarrollo de fluidez lectora en el ambiente de {theme['name'].lower()}",
-            "theme": theme_key,
-            "subject": "LEN",
-            "recommended_grades": ["2B", "3B", "4B"],
-            "bloom_level": ["Comprender", "Aplicar"][difficulty_cycle != "easy"],
-            "difficulty": difficulty_cycle,
-            "visual_config": {
-                "primary_color": theme["colors"][0],
-                "secondary_color": theme["colors"][1],
-                "accent_color": theme["colors"][2],
-                "background_style": "immersive_environment",
-                "animation_style": "text_highlighting",
-                "element_style": theme["elements"][i % len(theme["elements"])],
-                "reading_aids": True
-            },
-            "gameplay_config": {
-                "text_length": "sentences" if difficulty_cycle == "easy" else ("paragraphs" if difficulty_cycle == "medium" else "stories"),
-                "wpm_target": 30 if difficulty_cycle == "easy" else (60 if difficulty_cycle == "medium" else 90),
-                "comprehension_checks": True,
-                "adaptive_difficulty": True,
-                "progress_visualization": "detailed",
-                "social_reading": True
-            },
-            "learning_objectives": ["LE02OA05", "LE03OA01", "LE04OA01"],
-            "appeal_rating": theme["appeal"],
-            "estimated_dev_time": "6 days",
-            "assets_needed": {
-                "sprites": 22,
-                "sounds": 18,
-                "animations": 15,
-                "text_content": 100,
-                "backgrounds": 4
-            }
-        }
-        
-        language_skins.append(skin)
-    
-    return language_skins
-
-def generate_skins_database_sql(math_skins, language_skins):
-    """Genera SQL para insertar todas las skins en Supabase"""
-    
-    all_skins = math_skins + language_skins
-    
-    sql = f"""-- ===============================================
--- CATÁLOGO: 90 SKINS COMPLETOS MAT + LEN
--- Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
--- Total: {len(math_skins)} MAT + {len(language_skins)} LEN = {len(all_skins)} skins
--- ===============================================
+SKIN_ENCODER = RowEncoder([
+    ('skin_id', 'text'), ('engine_id', 'text'), ('engine_code', 'text'), ('name', 'text'),
+    ('description', 'text'), ('theme', 'text'), ('subject', 'text'), ('recommended_grades', 'text[]'),
+    ('bloom_level', 'text'), ('difficulty', 'text'), ('visual_config', 'jsonb'), ('gameplay_config', 'jsonb'),
+    ('learning_objectives', 'text[]'), ('appeal_rating', 'text'), ('estimated_dev_time', 'text'),
+    ('assets_needed', 'jsonb'), ('status', 'text')
+])
 
--- Crear tabla de skins si no existe
+GAME_SKIN_DDL = """-- Crear tabla de skins si no existe
 CREATE TABLE IF NOT EXISTS game_skin (
     skin_id varchar(20) PRIMARY KEY,
     engine_id varchar(10) REFERENCES game_engine(engine_id),
@@ -510,46 +54,370 @@ CREATE INDEX IF NOT EXISTS idx_game_skin_theme ON game_skin(theme);
 CREATE INDEX IF NOT EXISTS idx_game_skin_difficulty ON game_skin(difficulty);
 CREATE INDEX IF NOT EXISTS idx_game_skin_grades ON game_skin USING GIN (recommended_grades);
 CREATE INDEX IF NOT EXISTS idx_game_skin_appeal ON game_skin(appeal_rating);
-
--- Insertar 90 skins completos
-
 """
-    
-    for skin in all_skins:
-        sql += f"""
-INSERT INTO game_skin (
-    skin_id, engine_id, engine_code, name, description, theme, subject,
-    recommended_grades, bloom_level, difficulty, visual_config, gameplay_config,
-    learning_objectives, appeal_rating, estimated_dev_time, assets_needed, status
-) VALUES (
-    '{skin['skin_id']}',
-    '{skin['engine_id']}',
-    '{skin['engine_code']}',
-    {repr(skin['name'])},
-    {repr(skin['description'])},
-    '{skin['theme']}',
-    '{skin['subject']}',
-    ARRAY{skin['recommended_grades']},
-    '{skin['bloom_level']}',
-    '{skin['difficulty']}',
-    '{json.dumps(skin['visual_config'], ensure_ascii=False)}'::jsonb,
-    '{json.dumps(skin['gameplay_config'], ensure_ascii=False)}'::jsonb,
-    ARRAY{skin['learning_objectives']},
-    '{skin['appeal_rating']}',
-    '{skin['estimated_dev_time']}',
-    '{json.dumps(skin['assets_needed'], ensure_ascii=False)}'::jsonb,
-    'ready_for_design'
-)
-ON CONFLICT (skin_id) DO UPDATE SET
+
+SKIN_UPSERT = """ON CONFLICT (skin_id) DO UPDATE SET
     name = EXCLUDED.name,
     description = EXCLUDED.description,
     visual_config = EXCLUDED.visual_config,
     gameplay_config = EXCLUDED.gameplay_config,
-    updated_at = now();
+    updated_at = now()"""
+
+# Temáticas base para matemáticas
+MATH_THEMES = {
+    "animales": {
+        "name": "Reino Animal",
+        "colors": ["#FF6B6B", "#4ECDC4", "#45B7D1"],
+        "elements": ["perros", "gatos", "pájaros", "peces", "insectos"],
+        "appeal": "high"
+    },
+    "espacio": {
+        "name": "Aventura Espacial",
+        "colors": ["#1A1A2E", "#16213E", "#E94560"],
+        "elements": ["planetas", "cohetes", "estrellas", "aliens", "meteoritos"],
+        "appeal": "high"
+    },
+    "deportes": {
+        "name": "Mundo Deportivo",
+        "colors": ["#FF9500", "#00B894", "#0984E3"],
+        "elements": ["pelotas", "uniformes", "medallas", "campos", "equipos"],
+        "appeal": "medium"
+    },
+    "naturaleza": {
+        "name": "Naturaleza Viva",
+        "colors": ["#00B894", "#FDCB6E", "#6C5CE7"],
+        "elements": ["árboles", "flores", "montañas", "ríos", "jardines"],
+        "appeal": "medium"
+    },
+    "fantasia": {
+        "name": "Mundo Fantástico",
+        "colors": ["#A29BFE", "#FD79A8", "#FDCB6E"],
+        "elements": ["dragones", "castillos", "magos", "princesas", "tesoros"],
+        "appeal": "high"
+    },
+    "vehiculos": {
+        "name": "Medios de Transporte",
+        "colors": ["#74B9FF", "#00CEC9", "#FD79A8"],
+        "elements": ["autos", "aviones", "barcos", "trenes", "bicicletas"],
+        "appeal": "high"
+    },
+    "cocina": {
+        "name": "Chef en Acción",
+        "colors": ["#E17055", "#FDCB6E", "#00B894"],
+        "elements": ["frutas", "verduras", "pasteles", "utensilios", "recetas"],
+        "appeal": "medium"
+    },
+    "piratas": {
+        "name": "Aventura Pirata",
+        "colors": ["#8B4513", "#FFD700", "#000080"],
+        "elements": ["barcos", "tesoros", "mapas", "loros", "islas"],
+        "appeal": "high"
+    },
+    "circo": {
+        "name": "Gran Circo",
+        "colors": ["#FF0000", "#FFD700", "#FF1493"],
+        "elements": ["payasos", "leones", "trapecistas", "malabares", "carpa"],
+        "appeal": "high"
+    }
+}
+
+# Temáticas base para lenguaje
+LANGUAGE_THEMES = {
+    "cuentos": {
+        "name": "Mundo de Cuentos",
+        "colors": ["#FF6B9D", "#C44569", "#F8B500"],
+        "elements": ["princesas", "dragones", "castillos", "bosques", "hadas"],
+        "appeal": "high"
+    },
+    "biblioteca": {
+        "name": "Gran Biblioteca",
+        "colors": ["#8B4513", "#DAA520", "#2E8B57"],
+        "elements": ["libros", "estantes", "lámparas", "sillones", "mapas"],
+        "appeal": "medium"
+    },
+    "aventura": {
+        "name": "Aventura Literaria",
+        "colors": ["#FF6347", "#32CD32", "#4169E1"],
+        "elements": ["exploradores", "brújulas", "mapas", "tesoros", "cavernas"],
+        "appeal": "high"
+    },
+    "musicales": {
+        "name": "Letras Musicales",
+        "colors": ["#9370DB", "#FF69B4", "#FFD700"],
+        "elements": ["notas", "instrumentos", "partituras", "micrófonos", "escenarios"],
+        "appeal": "high"
+    },
+    "detectives": {
+        "name": "Detective de Palabras",
+        "colors": ["#2F4F4F", "#B8860B", "#DC143C"],
+        "elements": ["lupas", "pistas", "huellas", "sombreros", "documentos"],
+        "appeal": "high"
+    },
+    "jardin": {
+        "name": "Jardín de Letras",
+        "colors": ["#228B22", "#FFB6C1", "#87CEEB"],
+        "elements": ["flores", "mariposas", "árboles", "regaderas", "semillas"],
+        "appeal": "medium"
+    },
+    "cocina_letras": {
+        "name": "Cocina de Palabras",
+        "colors": ["#FF4500", "#FFFF00", "#32CD32"],
+        "elements": ["recetas", "ingredientes", "ollas", "cucharas", "hornos"],
+        "appeal": "medium"
+    },
+    "laboratorio": {
+        "name": "Laboratorio Lingüístico",
+        "colors": ["#4169E1", "#32CD32", "#FF6347"],
+        "elements": ["tubos", "fórmulas", "microscopios", "experimentos", "cristales"],
+        "appeal": "medium"
+    },
+    "teatro": {
+        "name": "Gran Teatro",
+        "colors": ["#8B0000", "#FFD700", "#4B0082"],
+        "elements": ["escenarios", "telones", "máscaras", "vestuarios", "luces"],
+        "appeal": "high"
+    }
+}
+
+COUNTER = ("ENG01", "COUNTER")
+DRAG_DROP_NUM = ("ENG02", "DRAG_DROP_NUM")
+TEXT_RECOG = ("ENG05", "TEXT_RECOG")
+LETTER_SOUND = ("ENG06", "LETTER_SOUND")
+READING_FLUENCY = ("ENG07", "READING_FLUENCY")
+
+# Plantillas por engine (ver skin_spec.render). recommended_grades es lista de
+# plantillas: el catálogo completo la reemplaza por ['{grade}']
+COUNTER_TEMPLATE = {
+    "name": "{theme_name} - Contador {Difficulty} {variant_number}",
+    "description": "Conteo con {element} del {theme_name_lower}",
+    "recommended_grades": ["1B", "2B", "3B"],
+    "bloom_level": By("difficulty", easy="Recordar", default="Comprender"),
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": By("variant_parity", even="gradient", odd="pattern"),
+        "animation_style": By("theme", animales="bounce", default="slide"),
+        "element_style": "{element}",
+        "ui_complexity": By("difficulty", easy="simple", default="detailed")
+    },
+    "gameplay_config": {
+        "max_count": By("difficulty", easy=10, medium=50, hard=100),
+        "counting_style": "visual_objects",
+        "feedback_type": "immediate_positive",
+        "sound_effects": True,
+        "voice_narration": True,
+        "hint_system": By("difficulty", hard=False, default=True)
+    },
+    "learning_objectives": ["MA01OA01", "MA01OA02", "MA02OA01"],
+    "appeal_rating": "{appeal}",
+    "estimated_dev_time": "3 days",
+    "assets_needed": {"sprites": 15, "sounds": 8, "animations": 6, "backgrounds": 3}
+}
+
+DRAG_DROP_TEMPLATE = {
+    "name": "{theme_name} - Arrastrar {Difficulty} {variant_number}",
+    "description": "Arrastrar y soltar {element} ordenadamente",
+    "recommended_grades": ["1B", "2B", "3B", "4B"],
+    "bloom_level": By("difficulty", hard="Aplicar", default="Comprender"),
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": "illustrated",
+        "animation_style": "smooth_drag",
+        "element_style": "{element}",
+        "drop_zone_style": "highlighted_areas"
+    },
+    "gameplay_config": {
+        "max_items": By("difficulty", easy=4, medium=8, hard=12),
+        "drag_sensitivity": "child_friendly",
+        "snap_assistance": By("difficulty", hard=False, default=True),
+        "operation_types": ["sort", "group", "match"],
+        "feedback_type": "visual_audio_combined",
+        "celebration_animation": True
+    },
+    "learning_objectives": ["MA01OA04", "MA01OA09", "MA02OA04"],
+    "appeal_rating": "{appeal}",
+    "estimated_dev_time": "4 days",
+    "assets_needed": {"sprites": 20, "sounds": 10, "animations": 8, "backgrounds": 2}
+}
+
+# Skins especiales: mecánicas híbridas sobre COUNTER y DRAG_DROP_NUM
+MATH_SPECIAL_TEMPLATE = {
+    "name": "{theme_name} - Especial {variant_number}",
+    "description": "Skin especial de {theme_name_lower} con elementos únicos",
+    "recommended_grades": ["1B", "2B", "3B"],
+    "bloom_level": "Aplicar",
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": "immersive",
+        "animation_style": "theme_specific",
+        "element_style": "{element}",
+        "special_effects": True
+    },
+    "gameplay_config": {
+        "hybrid_mechanics": True,
+        "difficulty_adaptive": True,
+        "reward_system": "advanced",
+        "social_features": True,
+        "progression_tracking": True
+    },
+    "learning_objectives": ["MA01OA01", "MA01OA04", "MA02OA01"],
+    "appeal_rating": "high",
+    "estimated_dev_time": "5 days",
+    "assets_needed": {"sprites": 25, "sounds": 12, "animations": 10, "backgrounds": 4}
+}
+
+TEXT_RECOG_TEMPLATE = {
+    "name": "{theme_name} - Reconocer {Difficulty} {variant_number}",
+    "description": "Reconocimiento de letras y palabras en el {theme_name_lower}",
+    "recommended_grades": ["1B", "2B", "3B"],
+    "bloom_level": By("difficulty", easy="Recordar", default="Comprender"),
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": "storybook",
+        "animation_style": "gentle_fade",
+        "element_style": "{element}",
+        "typography": "child_friendly",
+        "font_scaling": True
+    },
+    "gameplay_config": {
+        "text_complexity": By("difficulty", easy="letters", medium="words", hard="sentences"),
+        "recognition_type": "visual_matching",
+        "hint_system": "progressive",
+        "audio_support": True,
+        "dyslexia_friendly": True,
+        "feedback_type": "encouraging"
+    },
+    "learning_objectives": ["LE01OA01", "LE01OA02", "LE02OA03"],
+    "appeal_rating": "{appeal}",
+    "estimated_dev_time": "4 days",
+    "assets_needed": {"sprites": 18, "sounds": 15, "animations": 8, "fonts": 3, "backgrounds": 3}
+}
+
+LETTER_SOUND_TEMPLATE = {
+    "name": "{theme_name} - Sonidos {Difficulty} {variant_number}",
+    "description": "Asociación letra-sonido en el contexto de {theme_name_lower}",
+    "recommended_grades": ["1B", "2B"],
+    "bloom_level": By("difficulty", hard="Comprender", default="Recordar"),
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": "interactive",
+        "animation_style": "sound_waves",
+        "element_style": "{element}",
+        "phonetic_visualization": True
+    },
+    "gameplay_config": {
+        "phoneme_complexity": By("difficulty", easy="vowels", medium="consonants", hard="combinations"),
+        "audio_quality": "crystal_clear",
+        "voice_variety": True,
+        "recording_capability": True,
+        "pronunciation_feedback": "real_time",
+        "hearing_impaired_support": True
+    },
+    "learning_objectives": ["LE01OA03", "LE01OA04", "LE02OA04"],
+    "appeal_rating": "{appeal}",
+    "estimated_dev_time": "5 days",
+    "assets_needed": {"sprites": 20, "sounds": 25, "animations": 12, "voice_clips": 50, "backgrounds": 2}
+}
+
+# Las skins de fluidez se numeran por vuelta de temáticas ('{round}')
+READING_FLUENCY_TEMPLATE = {
+    "name": "{theme_name} - Fluidez {Difficulty} {round}",
+    "description": "Desarrollo de fluidez lectora en el ambiente de {theme_name_lower}",
+    "recommended_grades": ["2B", "3B", "4B"],
+    "bloom_level": By("difficulty", easy="Comprender", default="Aplicar"),
+    "visual_config": {
+        **THEME_COLORS,
+        "background_style": "immersive_environment",
+        "animation_style": "text_highlighting",
+        "element_style": "{element}",
+        "reading_aids": True
+    },
+    "gameplay_config": {
+        "text_length": By("difficulty", easy="sentences", medium="paragraphs", hard="stories"),
+        "wpm_target": By("difficulty", easy=30, medium=60, hard=90),
+        "comprehension_checks": True,
+        "adaptive_difficulty": True,
+        "progress_visualization": "detailed",
+        "social_reading": True
+    },
+    "learning_objectives": ["LE02OA05", "LE03OA01", "LE04OA01"],
+    "appeal_rating": "{appeal}",
+    "estimated_dev_time": "6 days",
+    "assets_needed": {"sprites": 22, "sounds": 18, "animations": 15, "text_content": 100, "backgrounds": 4}
+}
+
+# Catálogo de 90 skins: 15 por familia. Las familias de producto se cortan en 15
+# combinaciones, así que solo usan su primera temática (5 variantes × 3 dificultades)
+MATH_CATALOG = SkinCatalog("MAT", "SKIN_MAT_", MATH_THEMES, [
+    SkinFamily([COUNTER], ["animales", "espacio", "naturaleza"], COUNTER_TEMPLATE, variants=5, limit=15),
+    SkinFamily([DRAG_DROP_NUM], ["deportes", "fantasia", "vehiculos"], DRAG_DROP_TEMPLATE, variants=5, limit=15),
+    SkinFamily([COUNTER, DRAG_DROP_NUM], ["cocina", "piratas", "circo"], MATH_SPECIAL_TEMPLATE,
+               difficulties=["medium"], mode="cycle", count=15),
+])
+
+LANGUAGE_CATALOG = SkinCatalog("LEN", "SKIN_LEN_", LANGUAGE_THEMES, [
+    SkinFamily([TEXT_RECOG], ["cuentos", "biblioteca", "aventura"], TEXT_RECOG_TEMPLATE, variants=5, limit=15),
+    SkinFamily([LETTER_SOUND], ["musicales", "detectives", "jardin"], LETTER_SOUND_TEMPLATE, variants=5, limit=15),
+    SkinFamily([READING_FLUENCY], ["cocina_letras", "laboratorio", "teatro"], READING_FLUENCY_TEMPLATE,
+               mode="cycle", count=15),
+])
+
+def create_math_skins():
+    """Crea las 45 skins para matemáticas"""
+    return list(expand_skins(MATH_CATALOG))
+
+def create_language_skins():
+    """Crea las 45 skins para lenguaje"""
+    return list(expand_skins(LANGUAGE_CATALOG))
+
+def skin_insert_statements(skins, batch_size=DEFAULT_BATCH_SIZE):
+    """INSERT multi-fila por lote de skins (cualquier iterable, se consume en streaming)"""
+    rows = (SKIN_ENCODER.literals(dict(skin, status='ready_for_design')) for skin in skins)
+    yield from insert_statements('game_skin', SKIN_ENCODER.columns, rows, batch_size=batch_size, on_conflict=SKIN_UPSERT)
+
+def copy_game_skins(conn, skins):
+    """
+    Carga skins con COPY FROM STDIN a una tabla staging temporal y un único
+    INSERT ... SELECT con el mismo upsert que el SQL generado. `skins` se consume
+    en streaming; requiere game_engine (FOREIGN KEY). Retorna (insertadas, actualizadas)
+    """
+    columns = ", ".join(SKIN_ENCODER.columns)
+    with conn.cursor() as cur:
+        cur.execute(GAME_SKIN_DDL)
+        cur.execute("CREATE TEMP TABLE game_skin_staging (LIKE game_skin INCLUDING DEFAULTS) ON COMMIT DROP")
+        with cur.copy(f"COPY game_skin_staging ({columns}) FROM STDIN") as copy:
+            for skin in skins:
+                copy.write(SKIN_ENCODER.copy_line(dict(skin, status='ready_for_design')))
+        cur.execute(f"""
+            WITH upserted AS (
+                INSERT INTO game_skin ({columns})
+                SELECT {columns} FROM game_skin_staging
+                {SKIN_UPSERT}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+            FROM upserted
+        """)
+        return cur.fetchone()
+
+def generate_skins_database_sql(math_skins, language_skins, batch_size=DEFAULT_BATCH_SIZE):
+    """Genera SQL para insertar todas las skins en Supabase, fragmento a fragmento (ver sql_writer)"""
+    
+    all_skins = math_skins + language_skins
+    
+    yield f"""-- ===============================================
+-- CATÁLOGO: 90 SKINS COMPLETOS MAT + LEN
+-- Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+-- Total: {len(math_skins)} MAT + {len(language_skins)} LEN = {len(all_skins)} skins
+-- ===============================================
+
+{GAME_SKIN_DDL}
+-- Insertar 90 skins completos
 
 """
     
-    sql += f"""
+    yield from skin_insert_statements(all_skins, batch_size)
+    
+    yield """
 -- Estadísticas y verificaciones
 SELECT 
     '🎨 SKINS CREADOS' as status,
@@ -669,8 +537,6 @@ SELECT
 FROM game_skin 
 WHERE status = 'ready_for_design';
 """
-    
-    return sql
 
 def main():
     """Función principal para crear el catálogo de 90 skins"""
@@ -716,11 +582,10 @@ def main():
     print("📝 Generando archivos de salida...")
     
     # SQL para Supabase
-    sql_content = generate_skins_database_sql(math_skins, language_skins)
     sql_file = "skins_90_completos_supabase.sql"
     
     with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write(sql_content)
+        write_sql(f, generate_skins_database_sql(math_skins, language_skins))
     print(f"✅ SQL guardado: {sql_file}")
     
     # JSON completo
@@ -788,8 +788,14 @@ CREATE TABLE IF NOT EXISTS continuous_improvement_config (
     created_at timestamp DEFAULT now(),
     updated_at timestamp DEFAULT now()
 );
+-- Migración: los seeds anteriores insertaban sin clave y pueden haber duplicado filas; se conserva la más reciente
+DELETE FROM continuous_improvement_config older USING continuous_improvement_config newer
+WHERE older.config_category = newer.config_category AND older.config_name = newer.config_name
+  AND (COALESCE(older.updated_at, older.created_at, '-infinity'), older.config_id)
+    < (COALESCE(newer.updated_at, newer.created_at, '-infinity'), newer.config_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_continuous_improvement_config_name ON continuous_improvement_config(config_category, config_name);
 
--- Insertar configuraciones iniciales
+-- Insertar configuraciones iniciales (re-ejecutable: actualiza por categoría y nombre)
 INSERT INTO continuous_improvement_config (config_category, config_name, config_value, description) VALUES
 ('feedback_collection', 'student_survey_frequency', '"weekly"', 'Frecuencia de encuestas a estudiantes'),
 ('feedback_collection', 'teacher_interview_frequency', '"monthly"', 'Frecuencia de entrevistas docentes'),
@@ -797,7 +803,11 @@ INSERT INTO continuous_improvement_config (config_category, config_name, config_
 ('alerts', 'engagement_threshold', '3.0', 'Umbral mínimo de engagement antes de alerta'),
 ('prioritization', 'impact_weight_learning', '0.4', 'Peso del impacto en aprendizaje'),
 ('prioritization', 'impact_weight_ux', '0.25', 'Peso del impacto en experiencia de usuario'),
-('implementation', 'quick_win_threshold_days', '14', 'Máximo días para considerar quick win');
+('implementation', 'quick_win_threshold_days', '14', 'Máximo días para considerar quick win')
+ON CONFLICT (config_category, config_name) DO UPDATE SET
+    config_value = EXCLUDED.config_value,
+    description = EXCLUDED.description,
+    updated_at = now();
 
 -- Resumen de configuración del sistema
 SELECT 
@@ -577,28 +577,51 @@ CREATE TABLE IF NOT EXISTS pilot_content_assignment (
     special_adaptations text[],
     created_at timestamp DEFAULT now()
 );
+-- Migración: los seeds anteriores insertaban sin clave y pueden haber duplicado filas; se conserva la más reciente
+DELETE FROM pilot_content_assignment older USING pilot_content_assignment newer
+WHERE older.school_id = newer.school_id AND older.oa_code = newer.oa_code
+  AND (COALESCE(older.created_at, '-infinity'), older.assignment_id) < (COALESCE(newer.created_at, '-infinity'), newer.assignment_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pilot_content_assignment_oa ON pilot_content_assignment(school_id, oa_code);
 
--- Insertar asignaciones de contenido para cada colegio
+-- Insertar asignaciones de contenido para cada colegio (re-ejecutable: actualiza por colegio y OA)
 -- PILOT_001 - Público Santiago (Accesibilidad)
 INSERT INTO pilot_content_assignment (school_id, subject, oa_code, engine_id, recommended_skins, priority, usage_percentage, special_adaptations) VALUES
 ('PILOT_001', 'MAT', 'MA01OA01', 'ENG01', ARRAY['Reino Animal', 'Naturaleza Viva'], 'alta', 40, ARRAY['alto_contraste', 'tts_default', 'tiempo_extendido']),
 ('PILOT_001', 'MAT', 'MA01OA02', 'ENG01', ARRAY['Reino Animal', 'Chef en Acción'], 'alta', 30, ARRAY['navegacion_teclado', 'tts_default']),
 ('PILOT_001', 'LEN', 'LE01OA01', 'ENG05', ARRAY['Mundo de Cuentos', 'Jardín de Letras'], 'alta', 60, ARRAY['fuente_dislexia', 'tts_default']),
-('PILOT_001', 'LEN', 'LE01OA03', 'ENG05', ARRAY['Gran Biblioteca', 'Jardín de Letras'], 'alta', 40, ARRAY['audio_mejorado', 'contraste_alto']);
+('PILOT_001', 'LEN', 'LE01OA03', 'ENG05', ARRAY['Gran Biblioteca', 'Jardín de Letras'], 'alta', 40, ARRAY['audio_mejorado', 'contraste_alto'])
+ON CONFLICT (school_id, oa_code) DO UPDATE SET
+    engine_id = EXCLUDED.engine_id,
+    recommended_skins = EXCLUDED.recommended_skins,
+    priority = EXCLUDED.priority,
+    usage_percentage = EXCLUDED.usage_percentage,
+    special_adaptations = EXCLUDED.special_adaptations;
 
 -- PILOT_002 - Particular Las Condes (Rendimiento)
 INSERT INTO pilot_content_assignment (school_id, subject, oa_code, engine_id, recommended_skins, priority, usage_percentage, special_adaptations) VALUES
 ('PILOT_002', 'MAT', 'MA02OA04', 'ENG02', ARRAY['Aventura Espacial', 'Mundo Fantástico'], 'alta', 30, ARRAY['modo_competitivo', 'progresion_acelerada']),
 ('PILOT_002', 'MAT', 'MA03OA09', 'ENG02', ARRAY['Aventura Pirata', 'Mundo Fantástico'], 'alta', 25, ARRAY['retos_adicionales', 'analytics_avanzados']),
 ('PILOT_002', 'LEN', 'LE03OA01', 'ENG05', ARRAY['Detective de Palabras', 'Gran Teatro'], 'media', 25, ARRAY['evaluacion_continua']),
-('PILOT_002', 'CN', 'CN01OA01', 'ENG09', ARRAY['Laboratorio Lingüístico'], 'alta', 20, ARRAY['simulacion_avanzada']);
+('PILOT_002', 'CN', 'CN01OA01', 'ENG09', ARRAY['Laboratorio Lingüístico'], 'alta', 20, ARRAY['simulacion_avanzada'])
+ON CONFLICT (school_id, oa_code) DO UPDATE SET
+    engine_id = EXCLUDED.engine_id,
+    recommended_skins = EXCLUDED.recommended_skins,
+    priority = EXCLUDED.priority,
+    usage_percentage = EXCLUDED.usage_percentage,
+    special_adaptations = EXCLUDED.special_adaptations;
 
 -- PILOT_003 - Rural Melipilla (Equidad Digital)
 INSERT INTO pilot_content_assignment (school_id, subject, oa_code, engine_id, recommended_skins, priority, usage_percentage, special_adaptations) VALUES
 ('PILOT_003', 'MAT', 'MA01OA01', 'ENG01', ARRAY['Reino Animal', 'Naturaleza Viva'], 'alta', 60, ARRAY['modo_offline', 'sync_automatica', 'bajo_consumo_datos']),
 ('PILOT_003', 'MAT', 'MA01OA04', 'ENG01', ARRAY['Cocina de Palabras', 'Naturaleza Viva'], 'alta', 40, ARRAY['contexto_rural', 'modo_offline']),
 ('PILOT_003', 'LEN', 'LE01OA01', 'ENG05', ARRAY['Jardín de Letras', 'Mundo de Cuentos'], 'alta', 40, ARRAY['contexto_rural', 'sync_automatica']),
-('PILOT_003', 'LEN', 'LE01OA03', 'ENG05', ARRAY['Gran Biblioteca', 'Jardín de Letras'], 'alta', 35, ARRAY['modo_offline', 'contenido_local']);
+('PILOT_003', 'LEN', 'LE01OA03', 'ENG05', ARRAY['Gran Biblioteca', 'Jardín de Letras'], 'alta', 35, ARRAY['modo_offline', 'contenido_local'])
+ON CONFLICT (school_id, oa_code) DO UPDATE SET
+    engine_id = EXCLUDED.engine_id,
+    recommended_skins = EXCLUDED.recommended_skins,
+    priority = EXCLUDED.priority,
+    usage_percentage = EXCLUDED.usage_percentage,
+    special_adaptations = EXCLUDED.special_adaptations;
 
 -- Configurar métricas de evaluación
 CREATE TABLE IF NOT EXISTS pilot_evaluation_framework (
@@ -611,6 +634,11 @@ CREATE TABLE IF NOT EXISTS pilot_evaluation_framework (
     responsible_team varchar(100),
     created_at timestamp DEFAULT now()
 );
+-- Migración: conservar solo la métrica más reciente por categoría y nombre antes del índice único
+DELETE FROM pilot_evaluation_framework older USING pilot_evaluation_framework newer
+WHERE older.category = newer.category AND older.metric_name = newer.metric_name
+  AND (COALESCE(older.created_at, '-infinity'), older.framework_id) < (COALESCE(newer.created_at, '-infinity'), newer.framework_id);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_pilot_evaluation_metric ON pilot_evaluation_framework(category, metric_name);
 
 -- Insertar framework de evaluación
 INSERT INTO pilot_evaluation_framework (category, metric_name, target_value, measurement_method, measurement_frequency, responsible_team) VALUES
@@ -622,7 +650,12 @@ INSERT INTO pilot_evaluation_framework (category, metric_name, target_value, mea
 ('teacher', 'ease_of_use', '> 4.0/5.0', 'Encuestas docentes', 'Quincenal', 'Equipo UX'),
 ('teacher', 'time_saving', '> 30% reducción prep', 'Time tracking', 'Semanal', 'Equipo Pedagógico'),
 ('technical', 'system_uptime', '> 99% disponibilidad', 'Monitoring automático', 'Continuo', 'Equipo DevOps'),
-('technical', 'load_times', '< 3 seg carga', 'Performance monitoring', 'Continuo', 'Equipo DevOps');
+('technical', 'load_times', '< 3 seg carga', 'Performance monitoring', 'Continuo', 'Equipo DevOps')
+ON CONFLICT (category, metric_name) DO UPDATE SET
+    target_value = EXCLUDED.target_value,
+    measurement_method = EXCLUDED.measurement_method,
+    measurement_frequency = EXCLUDED.measurement_frequency,
+    responsible_team = EXCLUDED.responsible_team;
 
 -- Vista resumen para monitoring del piloto
 CREATE OR REPLACE VIEW pilot_dashboard AS
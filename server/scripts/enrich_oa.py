@@ -4,17 +4,36 @@ Script de enriquecimiento OA con Bloom y Cognitive Skills
 Implementa el pipeline especificado en MODULO II - Planificación EDU21
 
 Uso:
-    python enrich_oa.py --input oa_raw.csv --output oa_enriched.csv
+    python enrich_oa.py --input oa_raw.parquet --output oa_enriched.parquet
+
+    # Solo el delta de oa_diff.py (agregados/modificados se enriquecen, eliminados pasan tal cual)
+    python enrich_oa.py --input oa_delta.parquet --output oa_delta_enriched.parquet
+
+    # Export CSV para COPY (entrada y salida aceptan dataset Parquet o .csv, ver oa_dataset.py)
+    python enrich_oa.py --input oa_raw.parquet --output oa_enriched.csv
+
+    # Corpus grandes: descripciones únicas en trozos de 2000, un proceso por núcleo
+    python enrich_oa.py --input oa_raw.parquet --output oa_enriched.parquet --workers 0
 """
 
-import pandas as pd
 import argparse
 import logging
 import re
 import sys
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 
+from lazy_imports import lazy_import
+from oa_dataset import read_oa, write_oa
+from parallel_chunks import DEFAULT_CHUNK_SIZE, map_chunks, resolve_workers
+from oa_reference import (BLOOM_FALLBACK_KEYWORDS, BLOOM_LEVELS, DEFAULT_ARTIFACT, build_bloom_lemmas,
+                          build_skill_keyword_index, load_reference)
+from spanish_verbs import TOKEN_RE, normalize_text, tokenize
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,10 +41,162 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Solo los verbos entre las primeras palabras puntúan; las 3 primeras pesan triple
+BLOOM_VERB_WINDOW = 10
+BLOOM_LEADING_WORDS = 3
+
+BLOOM_COMPLEXITY = {
+    'Recordar': 1,
+    'Comprender': 2, 
+    'Aplicar': 3,
+    'Analizar': 4,
+    'Evaluar': 5,
+    'Crear': 5
+}
+
+# Palabras que indican mayor / menor complejidad
+COMPLEX_WORDS = ['múltiple', 'diversos', 'variados', 'complejos', 
+                 'diferentes', 'simultáneo', 'integrar', 'síntesis']
+SIMPLE_WORDS = ['simple', 'básico', 'elemental', 'inicial', 'fácil']
+
+# Palabras que marcan prioridad ministerial alta
+PRIORITY_WORDS = ['fundamental', 'básico', 'esencial', 'importante']
+
+# Heurística por asignatura si ninguna habilidad tiene puntaje
+SUBJECT_SKILL_FALLBACK = {
+    'MAT': 'razonamiento_logico',
+    'LEN': 'comp_verbal', 
+    'CN': 'razonamiento_logico',
+    'HIS': 'comp_verbal',
+    'ING': 'comp_verbal',
+    'EDF': 'coord_motora',
+    'ART': 'creatividad'
+}
+
+# --verify: mapa sintético de keywords (del propio corpus) para medir cómo escala
+# el puntaje columnar; no puede tardar más que el autómata por descripción (+ holgura)
+STRESS_SKILLS = 400
+STRESS_KEYWORDS_PER_SKILL = 9
+STRESS_SLACK_SECONDS = 0.25
+
+# Separador de la columna concatenada: no es \w, así que también corta tokens
+COLUMN_SEPARATOR = '\x1f'
+TOKEN_OR_SEPARATOR_RE = re.compile(f'{TOKEN_RE.pattern}|{COLUMN_SEPARATOR}')
+
+def gather_lists(lists, keys):
+    """
+    Elementos de lists[clave] para cada clave, sin bucle por clave: retorna
+    (posición en keys de cada elemento, elementos) concatenados en orden
+    """
+    counts = np.array([len(items) for items in lists], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    flat = np.fromiter((item for items in lists for item in items), dtype=np.int64, count=int(offsets[-1]))
+    per_key = counts[keys]
+    first = np.repeat(offsets[keys] - np.cumsum(per_key) + per_key, per_key)
+    return np.repeat(np.arange(len(keys)), per_key), flat[first + np.arange(len(first))]
+
+class JoinedColumn:
+    """
+    Descripciones concatenadas en un solo string: cada búsqueda recorre la
+    columna entera con str.find (en C) y salta a la fila siguiente apenas
+    encuentra una coincidencia, en vez de un `in` por descripción
+    """
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+        self.text = COLUMN_SEPARATOR.join(self.texts)
+        # Inicio de cada fila; el centinela final permite saltar desde la última
+        self.starts = np.cumsum([0] + [len(text) + 1 for text in self.texts]).tolist()
+
+    def __len__(self):
+        return len(self.texts)
+
+    def contains(self, word):
+        """Máscara de filas que contienen `word` (como `word in texto`)"""
+        hit = np.zeros(len(self), dtype=bool)
+        if not word:
+            hit[:] = True
+            return hit
+        find = self.text.find
+        position = find(word)
+        while position != -1:
+            row = bisect_right(self.starts, position) - 1
+            hit[row] = True
+            position = find(word, self.starts[row + 1])
+        return hit
+
+    def separated_text(self, replacement=' '):
+        """self.text con el separador solo entre filas (dentro de una descripción pasa a `replacement`)"""
+        if self.text.count(COLUMN_SEPARATOR) == len(self) - 1:
+            return self.text
+        return COLUMN_SEPARATOR.join(text.replace(COLUMN_SEPARATOR, replacement) for text in self.texts)
+
+    def keyword_hits(self, automaton):
+        """
+        Pares (fila, keyword) sin repetir de las keywords del autómata contenidas
+        en cada fila (como `keyword in texto`). Ninguna coincidencia cruza un
+        carácter que no aparece en las keywords (comas, paréntesis, dígitos...):
+        la columna se corta en esos fragmentos y el autómata recorre una sola vez
+        cada fragmento único. El costo depende del texto único de la columna, no
+        de cuántas keywords haya
+        """
+        if not automaton.keywords:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        rows, keyword_ids = [], []
+        for keyword_id, keyword in enumerate(automaton.keywords):
+            if not keyword or COLUMN_SEPARATOR in keyword:
+                row = np.flatnonzero([keyword in text for text in self.texts])
+                rows.append(row)
+                keyword_ids.append(np.full(len(row), keyword_id, dtype=np.int64))
+        
+        alphabet = {char for keyword in automaton.keywords for char in keyword} - {COLUMN_SEPARATOR}
+        if alphabet:
+            fragment_re = re.compile(f"[{''.join(map(re.escape, sorted(alphabet)))}]+|{COLUMN_SEPARATOR}")
+            # Un separador dentro de una descripción pasa a un carácter que no está en ninguna keyword
+            text = self.separated_text(chr(max(map(ord, alphabet)) + 1))
+            codes, uniques = pd.factorize(np.array(fragment_re.findall(text), dtype=object))
+            separator = (uniques == COLUMN_SEPARATOR)[codes]
+            found = [[keyword_id for keyword_id in automaton.find(fragment) if automaton.keywords[keyword_id]]
+                     if fragment != COLUMN_SEPARATOR else [] for fragment in uniques]
+            # Cada aparición de un fragmento aporta sus keywords a la fila donde está
+            fragment_row = np.cumsum(separator)
+            occurrence, keyword_id = gather_lists(found, codes)
+            rows.append(fragment_row[occurrence])
+            keyword_ids.append(keyword_id)
+        
+        keywords = len(automaton.keywords)
+        pairs = np.unique(np.concatenate(rows).astype(np.int64) * keywords + np.concatenate(keyword_ids))
+        return pairs // keywords, pairs % keywords
+
+    def count_contained(self, words):
+        """Cuántas de `words` contiene cada fila"""
+        count = np.zeros(len(self), dtype=np.int64)
+        for word in words:
+            count += self.contains(word)
+        return count
+
+    def tokens(self):
+        """
+        Tokens normalizados de todas las filas, como en tokenize(), con una sola
+        normalización y búsqueda para la columna. Retorna (códigos, tokens únicos,
+        fila, posición en la fila): un elemento por token salvo los únicos
+        """
+        # El separador dentro de una descripción no es \w: equivale a un espacio
+        tokens = np.array(TOKEN_OR_SEPARATOR_RE.findall(normalize_text(self.separated_text())), dtype=object)
+        codes, uniques = pd.factorize(tokens)
+        separator = (uniques == COLUMN_SEPARATOR)[codes]
+        row = np.cumsum(separator)
+        index = np.arange(len(codes))
+        row_start = np.maximum.accumulate(np.where(separator, index + 1, 0))
+        keep = ~separator
+        return codes[keep], uniques, row[keep], (index - row_start)[keep]
+
 class OAEnricher:
     def __init__(self):
         self.verb_bloom_map = {}
         self.cognitive_skills_map = {}
+        self.skill_keyword_index = None
+        self.bloom_lemmas = None
         self.subject_mapping = {
             'MAT': 'Matemática',
             'LEN': 'Lenguaje y Comunicación', 
@@ -39,101 +210,59 @@ class OAEnricher:
             'REL': 'Religión'
         }
         
-    def load_reference_data(self):
+    def load_reference_data(self, artifact=DEFAULT_ARTIFACT):
         """
-        Carga los archivos de referencia para mapeo Bloom y cognitive skills
+        Carga las tablas Bloom y cognitive skills compiladas por oa_reference.py
+        (artefacto binario; si falta o está desactualizado se compilan desde los CSV)
         """
         logger.info("Cargando datos de referencia...")
-        
-        # Buscar archivos CSV en el directorio actual y subdirectorios
-        current_dir = Path(__file__).parent
-        datasets_dir = current_dir / '../datasets'
-        
-        try:
-            # Cargar verb_bloom.csv
-            verb_bloom_file = None
-            for path in [datasets_dir / 'verb_bloom.csv', current_dir / 'verb_bloom.csv']:
-                if path.exists():
-                    verb_bloom_file = path
-                    break
-            
-            if verb_bloom_file:
-                verb_df = pd.read_csv(verb_bloom_file)
-                self.verb_bloom_map = dict(zip(
-                    verb_df['verbo'].str.lower(),
-                    verb_df['bloom_level']
-                ))
-                logger.info(f"Cargados {len(self.verb_bloom_map)} verbos → Bloom")
-            else:
-                logger.warning("No se encontró verb_bloom.csv, usando mapeo por defecto")
-                self._load_default_verb_bloom()
-            
-            # Cargar cognitive_skills.csv
-            skills_file = None
-            for path in [datasets_dir / 'cognitive_skills.csv', current_dir / 'cognitive_skills.csv']:
-                if path.exists():
-                    skills_file = path
-                    break
-            
-            if skills_file:
-                skills_df = pd.read_csv(skills_file)
-                for _, row in skills_df.iterrows():
-                    keywords = row['keywords'].strip('"').split(',')
-                    subjects = row['subject_affinity'].split(';') if pd.notna(row['subject_affinity']) else []
-                    
-                    self.cognitive_skills_map[row['skill_code']] = {
-                        'name': row['skill_name'],
-                        'keywords': [k.strip() for k in keywords],
-                        'subjects': subjects,
-                        'description': row['description']
-                    }
-                logger.info(f"Cargadas {len(self.cognitive_skills_map)} habilidades cognitivas")
-            else:
-                logger.warning("No se encontró cognitive_skills.csv, usando mapeo por defecto")
-                self._load_default_cognitive_skills()
-                
-        except Exception as e:
-            logger.error(f"Error cargando datos de referencia: {e}")
-            logger.info("Usando mapeos por defecto...")
-            self._load_default_verb_bloom()
-            self._load_default_cognitive_skills()
+        reference = load_reference(artifact)
+        self.set_reference_tables({
+            'verb_bloom': reference['verb_bloom'],
+            'cognitive_skills': reference['cognitive_skills'],
+            'bloom_lemmas': reference['bloom_lemmas'],
+            'skill_keyword_index': reference['skill_keyword_index'],
+        })
+        logger.info(f"{len(self.verb_bloom_map)} verbos → Bloom, {len(self.cognitive_skills_map)} habilidades cognitivas")
     
-    def _load_default_verb_bloom(self):
-        """Mapeo por defecto de verbos a Bloom"""
-        self.verb_bloom_map = {
-            'recordar': 'Recordar', 'identificar': 'Recordar', 'nombrar': 'Recordar',
-            'listar': 'Recordar', 'reconocer': 'Recordar', 'mencionar': 'Recordar',
-            'describir': 'Comprender', 'explicar': 'Comprender', 'interpretar': 'Comprender',
-            'resumir': 'Comprender', 'clasificar': 'Comprender', 'comparar': 'Comprender',
-            'aplicar': 'Aplicar', 'usar': 'Aplicar', 'utilizar': 'Aplicar',
-            'ejecutar': 'Aplicar', 'calcular': 'Aplicar', 'resolver': 'Aplicar',
-            'analizar': 'Analizar', 'examinar': 'Analizar', 'diferenciar': 'Analizar',
-            'organizar': 'Analizar', 'estructurar': 'Analizar', 'integrar': 'Analizar',
-            'evaluar': 'Evaluar', 'criticar': 'Evaluar', 'juzgar': 'Evaluar',
-            'verificar': 'Evaluar', 'validar': 'Evaluar', 'argumentar': 'Evaluar',
-            'crear': 'Crear', 'generar': 'Crear', 'planificar': 'Crear',
-            'producir': 'Crear', 'diseñar': 'Crear', 'elaborar': 'Crear'
+    def reference_tables(self):
+        """Tablas compiladas que usa el enriquecimiento (las que recibe cada worker del pool)"""
+        if self.bloom_lemmas is None:
+            self._build_bloom_lemmas()
+        if self.skill_keyword_index is None:
+            self._build_skill_keyword_index()
+        return {
+            'verb_bloom': self.verb_bloom_map,
+            'cognitive_skills': self.cognitive_skills_map,
+            'bloom_lemmas': self.bloom_lemmas,
+            'skill_keyword_index': self.skill_keyword_index,
         }
+    
+    def set_reference_tables(self, tables):
+        self.verb_bloom_map = tables['verb_bloom']
+        self.cognitive_skills_map = tables['cognitive_skills']
+        self.bloom_lemmas = tables['bloom_lemmas']
+        self.skill_keyword_index = tables['skill_keyword_index']
+    
+    def _build_bloom_lemmas(self):
+        """Tabla de lemas para un verb_bloom_map asignado a mano (sin artefacto)"""
+        self.bloom_lemmas, _ = build_bloom_lemmas(self.verb_bloom_map)
+    
+    def _build_skill_keyword_index(self):
+        """Índice de keywords para un cognitive_skills_map asignado a mano (sin artefacto)"""
+        self.skill_keyword_index = build_skill_keyword_index(self.cognitive_skills_map)
+    
+    def skill_keyword_scores(self, desc_lower):
+        """Puntaje por keywords de cada habilidad (2 por keyword contenida), en el orden de cognitive_skills_map"""
+        if self.skill_keyword_index is None:
+            self._build_skill_keyword_index()
+        automaton, skill_ids = self.skill_keyword_index
         
-    def _load_default_cognitive_skills(self):
-        """Habilidades cognitivas por defecto"""
-        self.cognitive_skills_map = {
-            'memoria_trabajo': {
-                'name': 'Memoria de Trabajo',
-                'keywords': ['retener', 'mantener', 'recordar'],
-                'subjects': ['MAT', 'LEN']
-            },
-            'razonamiento_logico': {
-                'name': 'Razonamiento Lógico', 
-                'keywords': ['inferir', 'deducir', 'concluir', 'razonar'],
-                'subjects': ['MAT', 'CN']
-            },
-            'comp_verbal': {
-                'name': 'Comprensión Verbal',
-                'keywords': ['comprender', 'interpretar', 'entender', 'leer'],
-                'subjects': ['LEN', 'HIS']
-            }
-        }
+        scores = [0] * len(self.cognitive_skills_map)
+        for keyword_id in automaton.find(desc_lower):
+            for skill_id in skill_ids[keyword_id]:
+                scores[skill_id] += 2
+        return scores
     
     def extract_bloom_level(self, oa_desc):
         """
@@ -141,44 +270,33 @@ class OAEnricher:
         """
         if not oa_desc:
             return 'Comprender'  # Default
-            
-        # Convertir a minúsculas y extraer verbos
-        desc_lower = oa_desc.lower()
+        if self.bloom_lemmas is None:
+            self._build_bloom_lemmas()
         
-        # Buscar verbos al inicio de la descripción (más peso)
-        words = desc_lower.split()[:10]  # Primeras 10 palabras
+        bloom_scores = {level: 0 for level in BLOOM_LEVELS}
+        fallback_rank = None
         
-        bloom_scores = {
-            'Recordar': 0, 'Comprender': 0, 'Aplicar': 0,
-            'Analizar': 0, 'Evaluar': 0, 'Crear': 0
-        }
-        
-        for word in words:
-            # Limpiar signos de puntuación
-            clean_word = re.sub(r'[^\w]', '', word)
+        # Una pasada por los tokens normalizados: verbos conjugados → infinitivo
+        for position, token in enumerate(tokenize(oa_desc)):
+            entry = self.bloom_lemmas.get(token)
+            if entry is None:
+                continue
+            level, rank = entry
             
-            if clean_word in self.verb_bloom_map:
-                bloom_level = self.verb_bloom_map[clean_word]
-                weight = 3 if words.index(word) < 3 else 1  # Más peso a primeras palabras
-                bloom_scores[bloom_level] += weight
+            # Buscar verbos al inicio de la descripción (más peso)
+            if level and position < BLOOM_VERB_WINDOW:
+                bloom_scores[level] += 3 if position < BLOOM_LEADING_WORDS else 1
+            if rank is not None and (fallback_rank is None or rank < fallback_rank):
+                fallback_rank = rank
         
         # Retornar el nivel con mayor puntaje
         max_level = max(bloom_scores, key=bloom_scores.get)
         
-        # Si no hay match, usar heurística
+        # Si no hay match, usar heurística (verbos de referencia en cualquier posición)
         if bloom_scores[max_level] == 0:
-            if any(w in desc_lower for w in ['crear', 'diseñar', 'elaborar', 'construir']):
-                return 'Crear'
-            elif any(w in desc_lower for w in ['evaluar', 'juzgar', 'criticar', 'argumentar']):
-                return 'Evaluar'
-            elif any(w in desc_lower for w in ['analizar', 'examinar', 'comparar']):
-                return 'Analizar'
-            elif any(w in desc_lower for w in ['aplicar', 'usar', 'resolver', 'calcular']):
-                return 'Aplicar'
-            elif any(w in desc_lower for w in ['explicar', 'interpretar', 'comprender']):
-                return 'Comprender'
-            else:
-                return 'Recordar'
+            if fallback_rank is not None:
+                return BLOOM_FALLBACK_KEYWORDS[fallback_rank][0]
+            return 'Recordar'
         
         return max_level
     
@@ -191,15 +309,9 @@ class OAEnricher:
             
         desc_lower = oa_desc.lower()
         skill_scores = {}
+        keyword_scores = self.skill_keyword_scores(desc_lower)
         
-        for skill_code, skill_data in self.cognitive_skills_map.items():
-            score = 0
-            
-            # Puntuación por keywords
-            for keyword in skill_data['keywords']:
-                if keyword.lower() in desc_lower:
-                    score += 2
-            
+        for (skill_code, skill_data), score in zip(self.cognitive_skills_map.items(), keyword_scores):
             # Bonificación por afinidad de asignatura
             if subject_code in skill_data.get('subjects', []):
                 score += 1
@@ -213,58 +325,34 @@ class OAEnricher:
                 return best_skill
         
         # Heurística por asignatura si no hay match
-        subject_skill_map = {
-            'MAT': 'razonamiento_logico',
-            'LEN': 'comp_verbal', 
-            'CN': 'razonamiento_logico',
-            'HIS': 'comp_verbal',
-            'ING': 'comp_verbal',
-            'EDF': 'coord_motora',
-            'ART': 'creatividad'
-        }
-        
-        return subject_skill_map.get(subject_code, 'memoria_trabajo')
+        return SUBJECT_SKILL_FALLBACK.get(subject_code, 'memoria_trabajo')
     
-    def determine_oa_version(self, oa_desc):
+    def determine_oa_version(self, oa_desc, delta_version=None):
         """
         Determina la versión del OA (2023 default, 2026 si es nueva)
         """
-        # Por ahora, todo es 2023. En el futuro se puede detectar
-        # contenido nuevo comparando con base existente
+        # El contenido nuevo o modificado se detecta en oa_diff.py comparando
+        # contra el snapshot anterior; el delta ya trae su oa_version
+        if delta_version is not None and pd.notna(delta_version):
+            return str(delta_version)
         return '2023'
         
     def estimate_complexity_level(self, bloom_level, oa_desc):
         """
         Estima el nivel de complejidad (1-5) basado en Bloom y contenido
         """
-        bloom_complexity = {
-            'Recordar': 1,
-            'Comprender': 2, 
-            'Aplicar': 3,
-            'Analizar': 4,
-            'Evaluar': 5,
-            'Crear': 5
-        }
-        
-        base_complexity = bloom_complexity.get(bloom_level, 3)
+        base_complexity = BLOOM_COMPLEXITY.get(bloom_level, 3)
         
         # Ajustar por contenido
         if oa_desc:
             desc_lower = oa_desc.lower()
             
-            # Palabras que indican mayor complejidad
-            complex_words = ['múltiple', 'diversos', 'variados', 'complejos', 
-                           'diferentes', 'simultáneo', 'integrar', 'síntesis']
-            
-            # Palabras que indican menor complejidad  
-            simple_words = ['simple', 'básico', 'elemental', 'inicial', 'fácil']
-            
             complexity_adjust = 0
-            for word in complex_words:
+            for word in COMPLEX_WORDS:
                 if word in desc_lower:
                     complexity_adjust += 0.5
                     
-            for word in simple_words:
+            for word in SIMPLE_WORDS:
                 if word in desc_lower:
                     complexity_adjust -= 0.5
         
@@ -273,71 +361,346 @@ class OAEnricher:
         # Mantener en rango 1-5
         return max(1, min(5, round(base_complexity)))
     
-    def enrich_oa_data(self, input_file, output_file):
+    def load_input(self, input_file):
+        """Carga el dataset (o CSV) de entrada y verifica las columnas requeridas"""
+        df = read_oa(input_file)
+        logger.info(f"Cargados {len(df)} OA para enriquecer")
+        
+        required_cols = ['oa_code', 'oa_desc', 'grade', 'subject']
+        missing_cols = [col for col in required_cols if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Columnas faltantes en {input_file}: {missing_cols}")
+        return df
+    
+    def verify_columnar(self, input_file, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
         """
-        Procesa el archivo OA raw y genera el archivo enriquecido
+        Prueba de equivalencia: compara el CSV producido por enrich_dataframe
+        (también en paralelo si workers != 1) y por enrich_rows (sin
+        enriched_at), y el índice de keywords contra la búsqueda directa.
+        Retorna True si todo coincide
         """
-        logger.info(f"Procesando {input_file}...")
+        df = self.load_input(input_file)
+        enrichers = [('enrich_rows', self.enrich_rows), ('enrich_dataframe', self.enrich_dataframe)]
+        if workers != 1:
+            enrichers.append(('enrich_dataframe (paralelo)', lambda df: self.enrich_dataframe(df, workers, chunk_size)))
+        outputs = []
+        for name, enrich in enrichers:
+            start = datetime.now()
+            enriched = enrich(df)
+            logger.info(f"⏱️  {name}: {(datetime.now() - start).total_seconds():.2f}s")
+            outputs.append(enriched.drop(columns=['enriched_at'], errors='ignore').to_csv(index=False))
         
-        try:
-            # Cargar datos raw
-            df = pd.read_csv(input_file)
-            logger.info(f"Cargados {len(df)} OA para enriquecer")
-            
-            # Verificar columnas requeridas
-            required_cols = ['oa_code', 'oa_desc', 'grade', 'subject']
-            missing_cols = [col for col in required_cols if col not in df.columns]
-            if missing_cols:
-                raise ValueError(f"Columnas faltantes en CSV: {missing_cols}")
-            
-            enriched_data = []
-            
-            for idx, row in df.iterrows():
-                try:
-                    # Enriquecimiento principal
-                    bloom_level = self.extract_bloom_level(row['oa_desc'])
-                    cog_skill = self.extract_cognitive_skill(row['oa_desc'], row['subject'])
-                    oa_version = self.determine_oa_version(row['oa_desc'])
-                    complexity = self.estimate_complexity_level(bloom_level, row['oa_desc'])
-                    
-                    # Campos adicionales
-                    estimated_hours = 4  # Default según spec
-                    semester = 1  # Default, se puede mejorar con análisis temporal
-                    ministerial_priority = 'normal'  # Default
-                    
-                    # Detectar prioridad alta por palabras clave
-                    if row['oa_desc'] and any(word in row['oa_desc'].lower() 
-                                            for word in ['fundamental', 'básico', 'esencial', 'importante']):
-                        ministerial_priority = 'high'
-                    
-                    enriched_oa = {
+        # El autómata de keywords debe coincidir con `keyword in desc` en cada descripción
+        automaton, _ = self.skill_keyword_index
+        keyword_mismatches = 0
+        for desc in df['oa_desc'].dropna().astype(str).str.lower().unique():
+            expected = {keyword_id for keyword_id, keyword in enumerate(automaton.keywords) if keyword in desc}
+            keyword_mismatches += automaton.find(desc) != expected
+        if keyword_mismatches:
+            logger.error(f"Índice de keywords difiere de la búsqueda directa en {keyword_mismatches} descripciones")
+        
+        scaling_ok = self.verify_keyword_scaling(df['oa_desc'].dropna().astype(str).unique())
+        return all(output == outputs[0] for output in outputs) and not keyword_mismatches and scaling_ok
+    
+    def verify_keyword_scaling(self, unique_desc, skills=STRESS_SKILLS, keywords_per_skill=STRESS_KEYWORDS_PER_SKILL):
+        """
+        Puntaje por keywords con un mapa sintético grande (palabras y pares de
+        palabras del corpus): el columnar debe coincidir con skill_keyword_scores
+        por descripción y no tardar más que él. Un costo keywords × corpus (una
+        búsqueda por keyword) no pasa esta prueba
+        """
+        column = JoinedColumn(desc.lower() for desc in unique_desc)
+        candidates = sorted(set(re.findall(r'\w{4,}(?: \w{2,})?', column.text)))
+        if not candidates:
+            return True
+        rng = np.random.default_rng(0)
+        keywords = rng.choice(np.array(candidates, dtype=object), skills * keywords_per_skill).tolist()
+        stress = OAEnricher()
+        stress.cognitive_skills_map = {
+            f'stress_{skill:03d}': {'keywords': keywords[skill * keywords_per_skill:(skill + 1) * keywords_per_skill]}
+            for skill in range(skills)
+        }
+        stress._build_skill_keyword_index()
+        
+        start = datetime.now()
+        columnar = stress._skill_scores_columnar(column)
+        columnar_seconds = (datetime.now() - start).total_seconds()
+        start = datetime.now()
+        rows = np.array([stress.skill_keyword_scores(text) for text in column.texts], dtype=np.int64)
+        rows_seconds = (datetime.now() - start).total_seconds()
+        logger.info(f"⏱️  keywords ({skills}×{keywords_per_skill}, {len(column)} descripciones): "
+                    f"columnar {columnar_seconds:.2f}s, por descripción {rows_seconds:.2f}s")
+        
+        if not np.array_equal(columnar, rows.reshape(columnar.shape)):
+            logger.error("Puntaje columnar por keywords difiere del autómata por descripción")
+            return False
+        if columnar_seconds > rows_seconds + STRESS_SLACK_SECONDS:
+            logger.error("Puntaje columnar por keywords más lento que el autómata por descripción")
+            return False
+        return True
+    
+    def enrich_rows(self, df):
+        """
+        Enriquecimiento fila a fila (implementación de referencia).
+        enrich_dataframe produce la misma salida en forma columnar; ver --verify
+        """
+        # Delta de oa_diff.py: columnas de cambio que se conservan en la salida
+        is_delta = 'change_type' in df.columns
+        if is_delta:
+            logger.info(f"Delta detectado: {df['change_type'].value_counts().to_dict()}")
+
+        enriched_data = []
+
+        for idx, row in df.iterrows():
+            try:
+                # Los OA eliminados no se enriquecen: solo se marcan como deprecados
+                if is_delta and row['change_type'] == 'removed':
+                    enriched_data.append({
                         'oa_code': row['oa_code'],
-                        'oa_desc': row['oa_desc'],
-                        'oa_short_desc': row['oa_desc'][:100] + '...' if len(str(row['oa_desc'])) > 100 else row['oa_desc'],
                         'grade_code': row['grade'],
-                        'subject_code': row['subject'], 
-                        'bloom_level': bloom_level,
-                        'cog_skill': cog_skill,
-                        'oa_version': oa_version,
-                        'semester': semester,
-                        'complexity_level': complexity,
-                        'estimated_hours': estimated_hours,
-                        'ministerial_priority': ministerial_priority,
-                        'is_transversal': False,  # Se puede detectar por keywords
-                        'enriched_at': datetime.now().isoformat()
-                    }
-                    
-                    enriched_data.append(enriched_oa)
-                    
-                    if (idx + 1) % 50 == 0:
-                        logger.info(f"Procesados {idx + 1}/{len(df)} OA...")
-                        
-                except Exception as e:
-                    logger.warning(f"Error procesando OA {row.get('oa_code', idx)}: {e}")
+                        'subject_code': row['subject'],
+                        'oa_version': self.determine_oa_version(None, row.get('oa_version')),
+                        'change_type': row['change_type'],
+                        'deprecated_at': row['deprecated_at']
+                    })
                     continue
+
+                # Enriquecimiento principal
+                bloom_level = self.extract_bloom_level(row['oa_desc'])
+                cog_skill = self.extract_cognitive_skill(row['oa_desc'], row['subject'])
+                oa_version = self.determine_oa_version(row['oa_desc'], row.get('oa_version'))
+                complexity = self.estimate_complexity_level(bloom_level, row['oa_desc'])
+
+                # Campos adicionales
+                estimated_hours = 4  # Default según spec
+                semester = 1  # Default, se puede mejorar con análisis temporal
+                ministerial_priority = 'normal'  # Default
+
+                # Detectar prioridad alta por palabras clave
+                if row['oa_desc'] and any(word in row['oa_desc'].lower() 
+                                        for word in PRIORITY_WORDS):
+                    ministerial_priority = 'high'
+
+                enriched_oa = {
+                    'oa_code': row['oa_code'],
+                    'oa_desc': row['oa_desc'],
+                    'oa_short_desc': row['oa_desc'][:100] + '...' if len(str(row['oa_desc'])) > 100 else row['oa_desc'],
+                    'grade_code': row['grade'],
+                    'subject_code': row['subject'], 
+                    'bloom_level': bloom_level,
+                    'cog_skill': cog_skill,
+                    'oa_version': oa_version,
+                    'semester': semester,
+                    'complexity_level': complexity,
+                    'estimated_hours': estimated_hours,
+                    'ministerial_priority': ministerial_priority,
+                    'is_transversal': False,  # Se puede detectar por keywords
+                    'enriched_at': datetime.now().isoformat()
+                }
+                if is_delta:
+                    enriched_oa['change_type'] = row['change_type']
+                    enriched_oa['deprecated_at'] = None
+
+                enriched_data.append(enriched_oa)
+
+                if (idx + 1) % 50 == 0:
+                    logger.info(f"Procesados {idx + 1}/{len(df)} OA...")
+
+            except Exception as e:
+                logger.warning(f"Error procesando OA {row.get('oa_code', idx)}: {e}")
+                continue
+
+        # Crear DataFrame enriquecido
+        return pd.DataFrame(enriched_data)
+    
+    def _skill_scores_columnar(self, column):
+        """Puntaje por keywords (2 por keyword presente) de cada habilidad: matriz filas × habilidades"""
+        if self.skill_keyword_index is None:
+            self._build_skill_keyword_index()
+        automaton, skill_ids = self.skill_keyword_index
+        scores = np.zeros((len(column), len(self.cognitive_skills_map)), dtype=np.int64)
+        row, keyword_id = column.keyword_hits(automaton)
+        
+        hit, skill_id = gather_lists(skill_ids, keyword_id)
+        np.add.at(scores, (row[hit], skill_id), 2)
+        return scores
+    
+    def _bloom_levels_columnar(self, column):
+        """extract_bloom_level para toda la columna: un solo tokenizado y sumas por fila"""
+        if self.bloom_lemmas is None:
+            self._build_bloom_lemmas()
+        codes, uniques, row, position = column.tokens()
+        
+        # Nivel y rango de heurística de cada token único (-1 / len(...) = sin entrada)
+        no_rank = len(BLOOM_FALLBACK_KEYWORDS)
+        level_ids = {level: i for i, level in enumerate(BLOOM_LEVELS)}
+        entries = [self.bloom_lemmas.get(token, (None, None)) for token in uniques]
+        token_level = np.array([level_ids.get(level, -1) for level, _ in entries], dtype=np.int64)[codes]
+        token_rank = np.array([no_rank if rank is None else rank for _, rank in entries], dtype=np.int64)[codes]
+        
+        scored = (token_level >= 0) & (position < BLOOM_VERB_WINDOW)
+        scores = np.zeros((len(column), len(BLOOM_LEVELS)), dtype=np.int64)
+        np.add.at(scores, (row[scored], token_level[scored]),
+                  np.where(position[scored] < BLOOM_LEADING_WORDS, 3, 1))
+        fallback_rank = np.full(len(column), no_rank, dtype=np.int64)
+        np.minimum.at(fallback_rank, row, token_rank)
+        
+        # argmax retorna el primer máximo, igual que max() sobre bloom_scores
+        levels = np.array(BLOOM_LEVELS, dtype=object)[scores.argmax(axis=1)]
+        fallback_levels = np.array([level for level, _ in BLOOM_FALLBACK_KEYWORDS] + ['Recordar'], dtype=object)
+        unscored = scores.max(axis=1) == 0
+        levels[unscored] = fallback_levels[fallback_rank[unscored]]
+        levels[np.array([not text for text in column.texts], dtype=bool)] = 'Comprender'
+        return levels
+    
+    def _cognitive_skills_columnar(self, keyword_scores, subjects):
+        """extract_cognitive_skill a partir de los puntajes por keyword y la asignatura de cada fila"""
+        skills = list(self.cognitive_skills_map.items())
+        # Pocas asignaturas distintas: fallback y afinidad se calculan por asignatura única
+        subject_codes, unique_subjects = pd.factorize(np.asarray(subjects, dtype=object), use_na_sentinel=False)
+        fallback = np.array([SUBJECT_SKILL_FALLBACK.get(subject, 'memoria_trabajo') for subject in unique_subjects],
+                            dtype=object)[subject_codes]
+        if not skills:
+            return fallback
+        
+        affinity = np.array([[subject in skill_data.get('subjects', []) for _, skill_data in skills]
+                             for subject in unique_subjects], dtype=np.int64).reshape(len(unique_subjects), len(skills))
+        scores = keyword_scores + affinity[subject_codes]
+        
+        # argmax retorna el primer máximo, igual que max() sobre el dict de puntajes
+        best = scores.argmax(axis=1)
+        codes = np.array([code for code, _ in skills], dtype=object)
+        return np.where(scores[np.arange(len(best)), best] > 0, codes[best], fallback)
+    
+    def description_features(self, unique_desc):
+        """
+        Features que dependen solo de la descripción, para descripciones únicas:
+        (nivel Bloom, puntajes por keyword, ajuste de complejidad, prioridad alta)
+        """
+        column = JoinedColumn(desc.lower() for desc in unique_desc)
+        bloom = self._bloom_levels_columnar(column)
+        keyword_scores = self._skill_scores_columnar(column)
+        adjust = 0.5 * (column.count_contained(COMPLEX_WORDS) - column.count_contained(SIMPLE_WORDS))
+        priority = column.count_contained(PRIORITY_WORDS) > 0
+        return bloom, keyword_scores, adjust, priority
+    
+    def _description_features_parallel(self, unique_desc, workers, chunk_size):
+        """
+        description_features por trozos en un pool de procesos; cada worker recibe
+        las tablas de referencia una sola vez y los trozos vuelven en orden
+        """
+        logger.info(f"Enriquecimiento en {resolve_workers(workers)} procesos: "
+                    f"{len(unique_desc)} descripciones únicas en trozos de {chunk_size}")
+        parts = map_chunks(_description_features_chunk, unique_desc, workers, chunk_size,
+                           initializer=_init_enrich_worker, initargs=(self.reference_tables(),))
+        return tuple(np.concatenate(arrays) for arrays in zip(*parts))
+    
+    def enrich_dataframe(self, df, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Enriquecimiento columnar: mismo resultado que enrich_rows, pero calculado
+        sobre columnas y sobre las descripciones únicas (versiones históricas y
+        variantes repetidas se calculan una sola vez). Con workers != 1 (0 = un
+        proceso por núcleo) las descripciones únicas se reparten en un pool de
+        procesos por trozos de chunk_size; el resultado es el mismo
+        """
+        is_delta = 'change_type' in df.columns
+        if is_delta:
+            logger.info(f"Delta detectado: {df['change_type'].value_counts().to_dict()}")
+        
+        df = df.reset_index(drop=True)
+        removed_mask = df['change_type'].eq('removed').to_numpy() if is_delta else np.zeros(len(df), dtype=bool)
+        
+        # Las descripciones que no son texto (NaN) fallan en la versión fila a fila
+        if isinstance(df['oa_desc'].dtype, pd.StringDtype):
+            is_text = df['oa_desc'].notna().to_numpy(dtype=bool)
+        else:
+            is_text = df['oa_desc'].map(lambda desc: isinstance(desc, str)).to_numpy(dtype=bool)
+        for code in df.loc[~removed_mask & ~is_text, 'oa_code']:
+            logger.warning(f"Error procesando OA {code}: descripción vacía o inválida")
+        
+        active = df[~removed_mask & is_text]
+        desc = active['oa_desc']
+        
+        # Features que dependen solo de la descripción: una vez por descripción única
+        desc_codes, unique_desc = pd.factorize(desc)
+        unique_desc = np.asarray(unique_desc, dtype=object)
+        unique_empty = unique_desc == ''
+        
+        if resolve_workers(workers) > 1 and len(unique_desc) > chunk_size:
+            features = self._description_features_parallel(unique_desc, workers, chunk_size)
+        else:
+            features = self.description_features(unique_desc)
+        bloom_u, keyword_scores_u, adjust_u, priority_u = features
+        
+        bloom = bloom_u[desc_codes]
+        cog_skill = self._cognitive_skills_columnar(keyword_scores_u[desc_codes], active['subject'].to_numpy(dtype=object))
+        cog_skill[unique_empty[desc_codes]] = 'memoria_trabajo'
+        base_complexity = np.array([BLOOM_COMPLEXITY.get(level, 3) for level in bloom_u], dtype=np.float64)
+        complexity = np.clip(np.round(base_complexity + adjust_u), 1, 5).astype(np.int64)[desc_codes]
+        
+        if 'oa_version' in active.columns:
+            oa_version = [self.determine_oa_version(None, version) for version in active['oa_version']]
+        else:
+            oa_version = '2023'
+        
+        enriched = pd.DataFrame({
+            'oa_code': active['oa_code'],
+            'oa_desc': desc,
+            'oa_short_desc': desc.where(desc.str.len() <= 100, desc.str[:100] + '...'),
+            'grade_code': active['grade'],
+            'subject_code': active['subject'],
+            'bloom_level': bloom,
+            'cog_skill': cog_skill,
+            'oa_version': oa_version,
+            'semester': 1,  # Default, se puede mejorar con análisis temporal
+            'complexity_level': complexity,
+            'estimated_hours': 4,  # Default según spec
+            'ministerial_priority': np.where(priority_u[desc_codes], 'high', 'normal'),
+            'is_transversal': False,  # Se puede detectar por keywords
+            'enriched_at': datetime.now().isoformat()
+        }, index=active.index)
+        
+        if not is_delta:
+            return enriched.reset_index(drop=True)
+        
+        # Los OA eliminados no se enriquecen: solo se marcan como deprecados
+        enriched['change_type'] = active['change_type']
+        enriched['deprecated_at'] = None
+        removed = df[removed_mask]
+        removed_rows = pd.DataFrame({
+            'oa_code': removed['oa_code'],
+            'grade_code': removed['grade'],
+            'subject_code': removed['subject'],
+            'oa_version': [self.determine_oa_version(None, version) for version in removed['oa_version']]
+                          if 'oa_version' in removed.columns else '2023',
+            'change_type': removed['change_type'],
+            'deprecated_at': removed['deprecated_at']
+        }, index=removed.index)
+        
+        # Orden original de filas; columnas en el orden en que aparecen (como DataFrame(list_of_dicts))
+        frames = [enriched, removed_rows]
+        if len(removed_rows) and (enriched.empty or removed_rows.index[0] < enriched.index[0]):
+            frames.reverse()
+        columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+        combined = pd.concat(frames)
+        return combined.sort_index(kind='stable')[columns].reset_index(drop=True)
+    
+    def enrich_oa_data(self, input_file, output_file, columnar=True, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Procesa el archivo OA raw y genera el archivo enriquecido
+        """
+        logger.info(f"Procesando {input_file}...")
+        
+        try:
+            df = self.load_input(input_file)
             
-            # Crear DataFrame enriquecido
-            enriched_df = pd.DataFrame(enriched_data)
+            start = datetime.now()
+            if not columnar:
+                enriched_df = self.enrich_rows(df)
+            else:
+                enriched_df = self.enrich_dataframe(df, workers, chunk_size)
+            elapsed = (datetime.now() - start).total_seconds()
+            logger.info(f"Enriquecimiento {'columnar' if columnar else 'fila a fila'}: {elapsed:.2f}s")
             
             # Estadísticas
             bloom_stats = enriched_df['bloom_level'].value_counts()
@@ -346,9 +709,9 @@ class OAEnricher:
                 logger.info(f"  {level}: {count}")
                 
             # Guardar archivo enriquecido
-            enriched_df.to_csv(output_file, index=False, encoding='utf-8')
+            write_oa(enriched_df, output_file)
             logger.info(f"✅ Datos enriquecidos guardados en {output_file}")
-            logger.info(f"📊 Total procesados: {len(enriched_data)} OA")
+            logger.info(f"📊 Total procesados: {len(enriched_df)} OA")
             logger.info("🚀 Listo para carga en Supabase con COPY command")
             
             return True
@@ -357,10 +720,29 @@ class OAEnricher:
             logger.error(f"Error en enriquecimiento: {e}")
             return False
 
+# Estado de cada proceso del pool de _description_features_parallel
+_worker_enricher = None
+
+def _init_enrich_worker(tables):
+    global _worker_enricher
+    _worker_enricher = OAEnricher()
+    _worker_enricher.set_reference_tables(tables)
+
+def _description_features_chunk(unique_desc):
+    return _worker_enricher.description_features(unique_desc)
+
 def main():
     parser = argparse.ArgumentParser(description='Enriquecimiento de OA con Bloom y Cognitive Skills')
-    parser.add_argument('--input', default='oa_raw.csv', help='Archivo CSV de entrada')
-    parser.add_argument('--output', default='oa_enriched.csv', help='Archivo CSV de salida')
+    parser.add_argument('--input', default='oa_raw.parquet', help='Dataset de entrada (o archivo .csv)')
+    parser.add_argument('--output', default='oa_enriched.parquet', help='Dataset de salida (o archivo .csv)')
+    parser.add_argument('--row-by-row', action='store_true',
+                        help='Usar el enriquecimiento fila a fila (referencia) en vez del columnar')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para el enriquecimiento columnar (default: 1; 0 = uno por núcleo)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Descripciones únicas por trozo con --workers (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--verify', action='store_true',
+                        help='Comparar la salida columnar (y la paralela con --workers) con la fila a fila sobre --input y salir')
     parser.add_argument('--verbose', '-v', action='store_true', help='Logging detallado')
     
     args = parser.parse_args()
@@ -371,7 +753,7 @@ def main():
     # Verificar archivo de entrada
     if not Path(args.input).exists():
         logger.error(f"❌ Archivo de entrada no encontrado: {args.input}")
-        logger.info("💡 Ejecuta primero: python scrape_oa.py --out oa_raw.csv")
+        logger.info("💡 Ejecuta primero: python scrape_oa.py --out oa_raw.parquet")
         sys.exit(1)
     
     # Inicializar enriquecedor
@@ -381,8 +763,16 @@ def main():
         # Cargar datos de referencia
         enricher.load_reference_data()
         
+        if args.verify:
+            if enricher.verify_columnar(args.input, args.workers, args.chunk_size):
+                logger.info("✅ Enriquecimiento columnar idéntico al fila a fila")
+                sys.exit(0)
+            logger.error("❌ El enriquecimiento columnar difiere del fila a fila")
+            sys.exit(1)
+        
         # Ejecutar enriquecimiento
-        success = enricher.enrich_oa_data(args.input, args.output)
+        success = enricher.enrich_oa_data(args.input, args.output, columnar=not args.row_by_row,
+                                          workers=args.workers, chunk_size=args.chunk_size)
         
         if success:
             logger.info("✅ Pipeline de enriquecimiento completado exitosamente")
@@ -5,9 +5,19 @@ Versión: 1.1.0
 """
 
 import pandas as pd
-import uuid
 from datetime import datetime
 
+from sql_literals import RowEncoder
+from sql_writer import insert_statements, write_sql
+from stable_ids import oa_uuid
+
+OA_ENCODER = RowEncoder([
+    ('oa_id', 'uuid'), ('oa_code', 'text'), ('oa_desc', 'text'), ('oa_short_desc', 'text'),
+    ('grade_code', 'text'), ('subject_code', 'text'), ('bloom_level', 'text'), ('cog_skill', 'text'),
+    ('oa_version', 'text'), ('semester', 'int'), ('complexity_level', 'int'), ('estimated_hours', 'int'),
+    ('ministerial_priority', 'text'), ('is_transversal', 'bool'), ('enriched_at', 'timestamp')
+])
+
 def generate_final_files():
     """Genera archivos finales CSV y SQL para Supabase con datos de 2°-6° básico"""
     
@@ -21,18 +31,11 @@ def generate_final_files():
         df = pd.read_csv(input_file)
         print(f"📊 Cargados {len(df)} OA del archivo: {input_file}")
         
-        # Agregar UUIDs únicos
-        df['oa_id'] = [str(uuid.uuid4()) for _ in range(len(df))]
+        # UUID estable por oa_code (stable_ids.py): se repite entre corridas
+        df['oa_id'] = df['oa_code'].map(oa_uuid)
         
         # Reorganizar columnas para Supabase
-        columns_order = [
-            'oa_id', 'oa_code', 'oa_desc', 'oa_short_desc', 'grade_code', 
-            'subject_code', 'bloom_level', 'cog_skill', 'oa_version', 
-            'semester', 'complexity_level', 'estimated_hours', 
-            'ministerial_priority', 'is_transversal', 'enriched_at'
-        ]
-        
-        df_final = df[columns_order]
+        df_final = df[OA_ENCODER.columns]
         
         # Estadísticas
         print(f"\n📚 DISTRIBUCIÓN POR GRADO:")
@@ -89,11 +92,13 @@ def generate_final_files():
             
             f.write("-- Insert Learning Objectives\n")
             
-            for _, row in df_final.iterrows():
-                oa_desc_clean = str(row['oa_desc']).replace("'", "''").replace('\n', ' ')
-                oa_short_desc_clean = str(row['oa_short_desc']).replace("'", "''").replace('\n', ' ')
-                
-                f.write(f"INSERT INTO learning_objective (oa_id, oa_code, oa_desc, oa_short_desc, grade_code, subject_code, bloom_level, cog_skill, oa_version, semester, complexity_level, estimated_hours, ministerial_priority, is_transversal, enriched_at) VALUES ('{row['oa_id']}', '{row['oa_code']}', '{oa_desc_clean}', '{oa_short_desc_clean}', '{row['grade_code']}', '{row['subject_code']}', '{row['bloom_level']}', '{row['cog_skill']}', '{row['oa_version']}', {row['semester']}, {row['complexity_level']}, {row['estimated_hours']}, '{row['ministerial_priority']}', {str(row['is_transversal']).lower()}, '{row['enriched_at']}');\n")
+            # Descripciones en una sola línea en el SQL
+            sql_df = df_final.assign(
+                oa_desc=df_final['oa_desc'].astype(str).str.replace('\n', ' '),
+                oa_short_desc=df_final['oa_short_desc'].astype(str).str.replace('\n', ' ')
+            )
+            rows = map(OA_ENCODER.literals, sql_df.itertuples(index=False))
+            write_sql(f, insert_statements('learning_objective', OA_ENCODER.columns, rows))
             
             f.write(f"\n-- Verification queries\n")
             f.write(f"SELECT COUNT(*) as total_oa FROM learning_objective WHERE grade_code IN ('2B', '3B', '4B', '5B', '6B');\n")
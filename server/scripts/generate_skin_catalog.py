@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Catálogo combinatorio de skins en streaming: JSON, SQL o COPY directo
+Expande las familias declaradas con skin_spec.py (temática × engine × grado ×
+dificultad × variante) y escribe cada skin apenas se genera, sin armar la lista
+completa: el catálogo 'completo' (todas las temáticas de MAT y LEN, cada engine
+en cada uno de sus grados) tiene miles de skins y la memoria no crece con él.
+Las configuraciones repetidas se descartan por hash de contenido.
+
+Cada salida vuelve a expandir el catálogo (es determinista y barato), así que
+JSON, SQL y COPY traen los mismos skin_id.
+
+Uso:
+    python generate_skin_catalog.py --json-out skins_catalogo_completo.json --sql-out skins_catalogo_completo.sql
+    python generate_skin_catalog.py --variants 10 --db-url "$SUPABASE_DB_URL"   # COPY (requiere game_engine)
+    python generate_skin_catalog.py --catalog 90 --json-out /tmp/skins_90.json  # catálogo de create_90_skins_mat_len.py
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from itertools import chain
+
+from create_6_engines_basicos import create_engine_specifications
+from create_90_skins_mat_len import (
+    COUNTER, COUNTER_TEMPLATE, DRAG_DROP_NUM, DRAG_DROP_TEMPLATE, GAME_SKIN_DDL, LANGUAGE_CATALOG,
+    LANGUAGE_THEMES, LETTER_SOUND, LETTER_SOUND_TEMPLATE, MATH_CATALOG, MATH_THEMES, READING_FLUENCY,
+    READING_FLUENCY_TEMPLATE, TEXT_RECOG, TEXT_RECOG_TEMPLATE, copy_game_skins, skin_insert_statements,
+)
+from lazy_imports import lazy_import, module_available
+from skin_spec import SkinCatalog, SkinFamily, expand_skins
+from sql_writer import DEFAULT_BATCH_SIZE, write_sql
+
+psycopg = lazy_import('psycopg')
+PSYCOPG_AVAILABLE = module_available('psycopg')
+
+DEFAULT_VARIANTS = 5
+
+# (engine, plantilla, nombre corto) por asignatura del catálogo completo
+FULL_FAMILIES = {
+    'MAT': (MATH_THEMES, [(COUNTER, COUNTER_TEMPLATE, 'Contador'),
+                          (DRAG_DROP_NUM, DRAG_DROP_TEMPLATE, 'Arrastrar')]),
+    'LEN': (LANGUAGE_THEMES, [(TEXT_RECOG, TEXT_RECOG_TEMPLATE, 'Reconocer'),
+                              (LETTER_SOUND, LETTER_SOUND_TEMPLATE, 'Sonidos'),
+                              (READING_FLUENCY, READING_FLUENCY_TEMPLATE, 'Fluidez')]),
+}
+
+def full_catalogs(variants=DEFAULT_VARIANTS):
+    """
+    Todas las temáticas de cada asignatura × dificultad × `variants`, una skin por
+    grado recomendado del engine (recommended_grades = [grado])
+    """
+    engine_grades = {engine['engine_id']: engine['recommended_grades'] for engine in create_engine_specifications()}
+    catalogs = []
+    for subject, (themes, families) in FULL_FAMILIES.items():
+        catalog_families = []
+        for engine, template, label in families:
+            template = dict(template,
+                            name=f"{{theme_name}} - {label} {{Difficulty}} {{variant_number}} ({{grade}})",
+                            recommended_grades=['{grade}'])
+            catalog_families.append(SkinFamily([engine], list(themes), template, variants=variants,
+                                               grades=engine_grades[engine[0]]))
+        catalogs.append(SkinCatalog(subject, f"SKIN_{subject}_C", themes, catalog_families, id_width=4))
+    return catalogs
+
+def build_catalogs(name, variants=DEFAULT_VARIANTS):
+    if name == '90':
+        return [MATH_CATALOG, LANGUAGE_CATALOG]
+    return full_catalogs(variants)
+
+def iter_skins(catalogs, stats=None):
+    """Skins de todos los catálogos, en streaming"""
+    return chain.from_iterable(expand_skins(catalog, stats) for catalog in catalogs)
+
+def write_skins_json(f, skins, metadata):
+    """
+    Escribe {"skins": [...], "metadata": {...}} skin a skin. `metadata` es una
+    función: se llama al final, cuando ya se conocen los conteos
+    """
+    f.write('{\n  "skins": [')
+    count = 0
+    for skin in skins:
+        f.write(',\n    ' if count else '\n    ')
+        f.write(json.dumps(skin, ensure_ascii=False))
+        count += 1
+    f.write('\n  ],\n  "metadata": ')
+    f.write(json.dumps(metadata(), ensure_ascii=False))
+    f.write('\n}\n')
+    return count
+
+def generate_catalog_sql(skins, catalog_name, batch_size=DEFAULT_BATCH_SIZE):
+    """DDL de game_skin + upserts por lote, fragmento a fragmento (ver sql_writer)"""
+    yield f"""-- ===============================================
+-- CATÁLOGO DE SKINS: {catalog_name}
+-- Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+-- Generado por generate_skin_catalog.py (requiere game_engine)
+-- ===============================================
+
+{GAME_SKIN_DDL}
+"""
+    yield from skin_insert_statements(skins, batch_size)
+    yield """
+SELECT subject, engine_code, COUNT(*) as skin_count
+FROM game_skin
+GROUP BY subject, engine_code
+ORDER BY subject, engine_code;
+"""
+
+def main():
+    """Expande el catálogo y lo escribe a las salidas pedidas"""
+
+    parser = argparse.ArgumentParser(description='Genera un catálogo de skins en streaming (JSON, SQL o COPY)')
+    parser.add_argument('--catalog', choices=['completo', '90'], default='completo',
+                        help="Catálogo a expandir (default: completo; '90' = create_90_skins_mat_len.py)")
+    parser.add_argument('--variants', type=int, default=DEFAULT_VARIANTS,
+                        help=f'Variantes por temática, dificultad y grado en el catálogo completo (default: {DEFAULT_VARIANTS})')
+    parser.add_argument('--json-out', help='Catálogo JSON de salida')
+    parser.add_argument('--sql-out', help='SQL de salida para el SQL Editor de Supabase')
+    parser.add_argument('--db-url', help='Cargar directo a Postgres con COPY (p. ej. $SUPABASE_DB_URL)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Skins por INSERT multi-fila en --sql-out (default: {DEFAULT_BATCH_SIZE})')
+    args = parser.parse_args()
+
+    if not (args.json_out or args.sql_out or args.db_url):
+        parser.error('indicar al menos una salida: --json-out, --sql-out o --db-url')
+    if args.db_url and not PSYCOPG_AVAILABLE:
+        print("❌ Error: --db-url requiere psycopg (pip install -r requirements.txt)")
+        return False
+
+    print(f"🎨 Catálogo de skins '{args.catalog}'")
+    catalogs = build_catalogs(args.catalog, args.variants)
+    stats = {}
+
+    def metadata():
+        return {'catalog': args.catalog, 'total_skins': stats['generated'], 'duplicates_skipped': stats['duplicates'],
+                'subjects': [catalog.subject for catalog in catalogs], 'created_at': datetime.now().isoformat()}
+
+    # La primera salida cuenta las skins; las siguientes re-expanden sin contar
+    def skins():
+        counting = not stats
+        return iter_skins(catalogs, stats if counting else None)
+
+    start = time.perf_counter()
+    if args.json_out:
+        with open(args.json_out, 'w', encoding='utf-8') as f:
+            count = write_skins_json(f, skins(), metadata)
+        print(f"✅ JSON guardado: {args.json_out} ({count} skins)")
+    if args.sql_out:
+        with open(args.sql_out, 'w', encoding='utf-8') as f:
+            write_sql(f, generate_catalog_sql(skins(), args.catalog, batch_size=args.batch_size))
+        print(f"✅ SQL guardado: {args.sql_out}")
+    if args.db_url:
+        with psycopg.connect(args.db_url) as conn:
+            inserted, updated = copy_game_skins(conn, skins())
+        print(f"✅ Carga directa (COPY): {inserted} insertadas, {updated} actualizadas")
+    elapsed = time.perf_counter() - start
+
+    print(f"📊 {stats['generated']} skins ({stats['duplicates']} configuraciones repetidas descartadas) en {elapsed:.2f}s")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,76 @@
+"""
+Autómata Aho–Corasick para buscar muchas keywords en una sola pasada
+Se construye una vez con todas las keywords (p. ej. las de cognitive_skills.csv)
+y luego recorre cada descripción carácter a carácter: el costo por descripción
+depende de su largo, no de cuántas habilidades o keywords haya.
+
+Semántica idéntica a `keyword in texto` para cada keyword (búsqueda de
+subcadenas, con solapamientos); la keyword vacía está en cualquier texto.
+La normalización (p. ej. minúsculas) la aplica quien construye y consulta.
+
+Uso desde enrich_oa.py:
+    automaton = KeywordAutomaton(['razonar', 'figuras', 'información'])
+    automaton.find('resolver problemas con figuras')   # {1} (índices en automaton.keywords)
+"""
+
+from collections import deque
+
+class KeywordAutomaton:
+    def __init__(self, keywords):
+        # Keywords únicas en orden de primera aparición; find() retorna sus índices
+        self.keywords = list(dict.fromkeys(keywords))
+
+        # Trie: goto[estado] = {carácter: estado hijo}, outputs[estado] = keywords que terminan ahí
+        goto = [{}]
+        outputs = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Links de falla por BFS y tabla de transiciones completa (DFA): en find()
+        # cada carácter es un solo lookup, sin recorrer la cadena de fallas
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = goto[0]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # El estado de falla es menos profundo: ya tiene su fila y sus outputs completos
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            if fail[state]:
+                outputs[state] = outputs[state] + outputs[fail[state]]
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [tuple(keyword_ids) for keyword_ids in outputs]
+        self._terminal = frozenset(state for state, keyword_ids in enumerate(outputs) if keyword_ids and state)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def find(self, text):
+        """Índices (en self.keywords) de las keywords contenidas en `text`"""
+        delta = self._delta
+        terminal = self._terminal
+        state = 0
+        hits = set()
+        for char in text:
+            state = delta[state].get(char, 0)
+            if state in terminal:
+                hits.add(state)
+
+        # La raíz solo tiene output para la keyword vacía, que siempre está contenida
+        found = set(self._outputs[0])
+        for state in hits:
+            found.update(self._outputs[state])
+        return found
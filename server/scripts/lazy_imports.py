@@ -0,0 +1,77 @@
+"""
+Imports diferidos para las dependencias pesadas de los scripts del pipeline
+pandas, numpy, pyarrow, requests, bs4, lxml y psycopg suman cerca de un segundo
+de arranque, y cada script los importaba al inicio aunque el camino ejecutado no
+los usara (`--help`, validación de argumentos, `--plan`). Con los drivers que
+lanzan un subproceso por etapa o por asignatura, ese costo se paga muchas veces.
+
+`lazy_import` retorna un módulo proxy: el import real ocurre en el primer acceso
+a un atributo (`pd.read_csv`, `psycopg.connect`), y desde ahí el proxy se
+comporta como el módulo. `module_available` reemplaza el patrón
+try/except ImportError de las dependencias opcionales sin importarlas.
+
+check_import_budget.py verifica que `--help` de cada CLI no cargue ninguno de
+los módulos de HEAVY_MODULES.
+
+Uso:
+    from lazy_imports import lazy_import, module_available
+
+    pd = lazy_import('pandas')
+    PYARROW_AVAILABLE = module_available('pyarrow')
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+
+# Dependencias que ningún CLI debería cargar solo para mostrar --help
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow', 'requests', 'bs4', 'lxml', 'psycopg', 'psycopg_pool', 'PIL')
+
+_lock = threading.RLock()
+
+class LazyModule(types.ModuleType):
+    """Proxy de un módulo que se importa en el primer acceso a un atributo"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_loaded'] = False
+
+    def _load(self):
+        # Los workers de scrape_oa/load_to_supabase pueden tocar el proxy a la vez
+        with _lock:
+            if not self.__dict__['_lazy_loaded']:
+                module = importlib.import_module(self.__name__)
+                self.__dict__.update(module.__dict__)
+                self.__dict__['_lazy_loaded'] = True
+        return self
+
+    def __getattr__(self, attr):
+        # Solo se llama si el atributo no está en __dict__, es decir, antes de cargar
+        if self.__dict__['_lazy_loaded']:
+            raise AttributeError(f"module '{self.__name__}' has no attribute '{attr}'")
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'cargado' if self.__dict__['_lazy_loaded'] else 'diferido'
+        return f"<lazy module '{self.__name__}' ({state})>"
+
+def lazy_import(name):
+    """Módulo `name` sin importarlo todavía (si ya estaba importado, lo retorna tal cual)"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+def module_available(name):
+    """True si `name` se puede importar, sin ejecutar el módulo (solo busca el paquete)"""
+    if name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # find_spec de un submódulo importa el paquete padre; si ese falta, no está
+        return False
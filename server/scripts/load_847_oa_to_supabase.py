@@ -3,43 +3,92 @@
 CARGA MASIVA: 847 OA COMPLETOS A SUPABASE
 Script final para cargar todos los OA de 1°-6° básico a producción
 Incluye enriquecimiento automático con Bloom y habilidades cognitivas
+
+Uso:
+    python load_847_oa_to_supabase.py                          # dataset completo
+    python load_847_oa_to_supabase.py --input oa_delta.parquet # solo el delta de oa_diff.py
+
+    # Carga directa a Postgres (COPY + upsert), sin pasar por el SQL Editor
+    python load_847_oa_to_supabase.py --db-url "$SUPABASE_DB_URL"
+
+    # Corpus grandes (1B-4M, versiones históricas): enriquecimiento en un proceso por núcleo
+    python load_847_oa_to_supabase.py --input oa_corpus.parquet --workers 0
 """
 
-import pandas as pd
-import uuid
+import argparse
 import re
 from datetime import datetime
 import json
 import os
 
+from lazy_imports import lazy_import, module_available
+from oa_dataset import read_oa, write_oa
+from oa_reference import load_reference
+from parallel_chunks import DEFAULT_CHUNK_SIZE, map_chunks, resolve_workers
+from spanish_verbs import normalize_text
+from stable_ids import oa_uuid
+from sql_literals import RowEncoder, sql_text, sql_timestamp
+from sql_writer import DEFAULT_BATCH_SIZE, insert_statements, write_sql
+
+pd = lazy_import('pandas')
+psycopg = lazy_import('psycopg')
+# Sin psycopg solo se genera el archivo SQL
+PSYCOPG_AVAILABLE = module_available('psycopg')
+
+# Columnas que carga el pipeline (en el orden del INSERT y del COPY) y su tipo SQL
+LEARNING_OBJECTIVE_ENCODER = RowEncoder([
+    ('oa_id', 'uuid'), ('oa_code', 'text'), ('oa_desc', 'text'), ('oa_short_desc', 'text'),
+    ('grade_code', 'text'), ('subject_code', 'text'), ('bloom_level', 'text'), ('cog_skill', 'text'),
+    ('oa_version', 'text'), ('semester', 'int'), ('complexity_level', 'int'), ('estimated_hours', 'int'),
+    ('ministerial_priority', 'text'), ('is_transversal', 'bool'), ('enriched_at', 'timestamp'),
+    ('source_url', 'text'), ('scraped_at', 'timestamp')
+])
+LEARNING_OBJECTIVE_COLUMNS = LEARNING_OBJECTIVE_ENCODER.columns
+
+# Columnas que se actualizan cuando el OA ya existe (ON CONFLICT)
+LEARNING_OBJECTIVE_UPSERT_COLUMNS = [
+    'oa_desc', 'oa_short_desc', 'bloom_level', 'cog_skill',
+    'complexity_level', 'estimated_hours', 'enriched_at'
+]
+
+LEARNING_OBJECTIVE_DDL = """-- Crear tabla si no existe
+CREATE TABLE IF NOT EXISTS learning_objective (
+    oa_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    oa_code text UNIQUE NOT NULL,
+    oa_desc text NOT NULL,
+    oa_short_desc text,
+    grade_code varchar(5) NOT NULL,
+    subject_code varchar(10) NOT NULL,
+    bloom_level text NOT NULL,
+    cog_skill text,
+    oa_version text DEFAULT '2023',
+    semester integer DEFAULT 1,
+    complexity_level integer DEFAULT 1,
+    estimated_hours integer DEFAULT 4,
+    ministerial_priority text DEFAULT 'normal',
+    is_transversal boolean DEFAULT false,
+    created_at timestamp DEFAULT now(),
+    enriched_at timestamp,
+    deprecated_at timestamp,
+    source_url text,
+    scraped_at timestamp
+);
+
+-- Crear índices para optimización
+CREATE INDEX IF NOT EXISTS idx_learning_objective_grade ON learning_objective(grade_code);
+CREATE INDEX IF NOT EXISTS idx_learning_objective_subject ON learning_objective(subject_code);
+CREATE INDEX IF NOT EXISTS idx_learning_objective_bloom ON learning_objective(bloom_level);
+CREATE INDEX IF NOT EXISTS idx_learning_objective_active ON learning_objective(deprecated_at) WHERE deprecated_at IS NULL;
+"""
+
 def load_enrichment_datasets():
-    """Carga los datasets de referencia para enriquecimiento"""
-    
-    # Dataset de verbos → Bloom
-    verb_bloom_data = {
-        'recordar': ('Recordar', 0.95), 'identificar': ('Recordar', 0.90), 'nombrar': ('Recordar', 0.85),
-        'reconocer': ('Recordar', 0.90), 'listar': ('Recordar', 0.85), 'describir': ('Comprender', 0.90),
-        'explicar': ('Comprender', 0.85), 'comparar': ('Comprender', 0.80), 'comprender': ('Comprender', 0.95),
-        'interpretar': ('Comprender', 0.85), 'aplicar': ('Aplicar', 0.95), 'usar': ('Aplicar', 0.80),
-        'resolver': ('Aplicar', 0.85), 'demostrar': ('Aplicar', 0.80), 'analizar': ('Analizar', 0.95),
-        'examinar': ('Analizar', 0.85), 'distinguir': ('Analizar', 0.80), 'clasificar': ('Analizar', 0.80),
-        'evaluar': ('Evaluar', 0.95), 'criticar': ('Evaluar', 0.85), 'juzgar': ('Evaluar', 0.80),
-        'crear': ('Crear', 0.95), 'diseñar': ('Crear', 0.90), 'construir': ('Crear', 0.85),
-        'desarrollar': ('Crear', 0.80), 'generar': ('Crear', 0.85)
-    }
-    
-    # Dataset de habilidades cognitivas
-    cognitive_skills = {
-        'memoria_trabajo': ['recordar', 'mantener', 'retener', 'memorizar'],
-        'razonamiento_logico': ['analizar', 'inferir', 'deducir', 'razonar'],
-        'atencion_selectiva': ['enfocar', 'concentrar', 'seleccionar', 'priorizar'],
-        'flexibilidad_mental': ['adaptar', 'cambiar', 'ajustar', 'modificar'],
-        'procesamiento_visual': ['observar', 'visualizar', 'percibir', 'distinguir'],
-        'comprension_verbal': ['entender', 'comprender', 'interpretar', 'comunicar'],
-        'coordinacion_motora': ['ejecutar', 'realizar', 'practicar', 'coordinar'],
-        'creatividad': ['crear', 'innovar', 'imaginar', 'inventar']
-    }
-    
+    """
+    Tablas de enriquecimiento compiladas por oa_reference.py (las mismas de enrich_oa.py):
+    forma verbal normalizada → (nivel Bloom, confianza) y habilidad → keywords
+    """
+    reference = load_reference()
+    verb_bloom_data = reference['verb_table']
+    cognitive_skills = {code: skill['keywords'] for code, skill in reference['cognitive_skills'].items()}
     return verb_bloom_data, cognitive_skills
 
 def extract_primary_verb(description):
@@ -64,8 +113,17 @@ def extract_primary_verb(description):
     
     return None
 
-def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills):
-    """Enriquece los OA con niveles de Bloom y habilidades cognitivas"""
+def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Enriquece los OA con niveles de Bloom y habilidades cognitivas. Con
+    workers != 1 (0 = un proceso por núcleo) las filas se reparten por trozos
+    en un pool de procesos; los registros quedan en el orden de entrada
+    """
+    
+    if resolve_workers(workers) > 1 and len(df) > chunk_size:
+        parts = map_chunks(_enrich_chunk, df, workers, chunk_size,
+                           initializer=_init_enrich_worker, initargs=(verb_bloom_data, cognitive_skills))
+        return [record for part in parts for record in part]
     
     enriched_data = []
     
@@ -77,11 +135,13 @@ def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills):
         bloom_level = 'Comprender'  # Default
         confidence = 0.5
         
-        if primary_verb and primary_verb in verb_bloom_data:
-            bloom_level, confidence = verb_bloom_data[primary_verb]
+        # Formas conjugadas ('identifican', 'reconociendo') → su infinitivo en la tabla
+        verb_form = normalize_text(primary_verb) if primary_verb else None
+        if verb_form in verb_bloom_data:
+            bloom_level, confidence = verb_bloom_data[verb_form]
         
         # Determinar habilidad cognitiva
-        cog_skill = 'comprension_verbal'  # Default
+        cog_skill = 'comp_verbal'  # Default
         
         for skill, keywords in cognitive_skills.items():
             if primary_verb and primary_verb in keywords:
@@ -110,7 +170,7 @@ def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills):
         
         # Crear registro enriquecido
         enriched_record = {
-            'oa_id': str(uuid.uuid4()),
+            'oa_id': oa_uuid(row['oa_code']),
             'oa_code': row['oa_code'],
             'oa_desc': row['oa_desc'],
             'oa_short_desc': row['oa_desc'][:100] + '...' if len(row['oa_desc']) > 100 else row['oa_desc'],
@@ -118,7 +178,7 @@ def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills):
             'subject_code': row['subject'],
             'bloom_level': bloom_level,
             'cog_skill': cog_skill,
-            'oa_version': '2023',
+            'oa_version': str(row['oa_version']) if pd.notna(row.get('oa_version')) else '2023',
             'semester': semester,
             'complexity_level': complexity_level,
             'estimated_hours': estimated_hours,
@@ -133,8 +193,59 @@ def enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills):
     
     return enriched_data
 
-def generate_sql_insert(enriched_data):
-    """Genera el SQL de inserción para Supabase"""
+# Tablas de referencia de cada proceso del pool de enrich_oa_with_bloom_and_cognitive
+_worker_tables = None
+
+def _init_enrich_worker(verb_bloom_data, cognitive_skills):
+    global _worker_tables
+    _worker_tables = (verb_bloom_data, cognitive_skills)
+
+def _enrich_chunk(chunk):
+    return enrich_oa_with_bloom_and_cognitive(chunk, *_worker_tables)
+
+def generate_deprecation_sql(removed_df):
+    """Marca como deprecados los OA que desaparecieron del portal (delta de oa_diff.py)"""
+    
+    if removed_df.empty:
+        return ""
+    
+    sql = "-- OA eliminados del portal: se deprecan, no se borran\n"
+    for deprecated_at, group in removed_df.groupby('deprecated_at', sort=True):
+        codes = ", ".join(sql_text(code) for code in group['oa_code'])
+        sql += f"""UPDATE learning_objective SET deprecated_at = {sql_timestamp(deprecated_at)}
+WHERE deprecated_at IS NULL AND oa_code IN ({codes});
+
+"""
+    return sql
+
+def upsert_assignments(delta_mode):
+    """SET del ON CONFLICT (oa_code); en modo delta un OA modificado cambia de versión y uno que reaparece se reactiva"""
+    assignments = [f"{col} = EXCLUDED.{col}" for col in LEARNING_OBJECTIVE_UPSERT_COLUMNS]
+    if delta_mode:
+        assignments += ["oa_version = EXCLUDED.oa_version", "deprecated_at = NULL"]
+    return assignments
+
+def upsert_condition(delta_mode):
+    """
+    WHERE del ON CONFLICT: solo se reescriben los OA que cambiaron. enriched_at
+    cambia en cada corrida y no cuenta; con ids estables (stable_ids.py) un OA
+    sin cambios no genera escritura ni toca índices
+    """
+    columns = [col for col in LEARNING_OBJECTIVE_UPSERT_COLUMNS if col != 'enriched_at']
+    current = [f"learning_objective.{col}" for col in columns]
+    incoming = [f"EXCLUDED.{col}" for col in columns]
+    if delta_mode:
+        current += ["learning_objective.oa_version", "learning_objective.deprecated_at"]
+        incoming += ["EXCLUDED.oa_version", "NULL"]
+    return f"WHERE ({', '.join(current)}) IS DISTINCT FROM ({', '.join(incoming)})"
+
+def generate_sql_insert(enriched_data, removed_df=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Genera el SQL de inserción para Supabase, fragmento a fragmento (ver sql_writer).
+    Con `removed_df` (modo delta) el upsert también actualiza oa_version,
+    reactiva OA deprecados y agrega los UPDATE de deprecación.
+    """
+    delta_mode = removed_df is not None
     
     sql_header = """-- ===============================================
 -- CARGA MASIVA: 847 OA COMPLETOS EDU21
@@ -142,75 +253,17 @@ def generate_sql_insert(enriched_data):
 -- Fecha: {timestamp}
 -- ===============================================
 
--- Crear tabla si no existe
-CREATE TABLE IF NOT EXISTS learning_objective (
-    oa_id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-    oa_code text UNIQUE NOT NULL,
-    oa_desc text NOT NULL,
-    oa_short_desc text,
-    grade_code varchar(5) NOT NULL,
-    subject_code varchar(10) NOT NULL,
-    bloom_level text NOT NULL,
-    cog_skill text,
-    oa_version text DEFAULT '2023',
-    semester integer DEFAULT 1,
-    complexity_level integer DEFAULT 1,
-    estimated_hours integer DEFAULT 4,
-    ministerial_priority text DEFAULT 'normal',
-    is_transversal boolean DEFAULT false,
-    created_at timestamp DEFAULT now(),
-    enriched_at timestamp,
-    deprecated_at timestamp,
-    source_url text,
-    scraped_at timestamp
-);
-
--- Crear índices para optimización
-CREATE INDEX IF NOT EXISTS idx_learning_objective_grade ON learning_objective(grade_code);
-CREATE INDEX IF NOT EXISTS idx_learning_objective_subject ON learning_objective(subject_code);
-CREATE INDEX IF NOT EXISTS idx_learning_objective_bloom ON learning_objective(bloom_level);
-CREATE INDEX IF NOT EXISTS idx_learning_objective_active ON learning_objective(deprecated_at) WHERE deprecated_at IS NULL;
-
+{ddl}
 -- Insertar 847 OA completos
 
-""".format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-    
-    sql_inserts = ""
-    
-    for record in enriched_data:
-        sql_inserts += f"""INSERT INTO learning_objective (
-    oa_id, oa_code, oa_desc, oa_short_desc, grade_code, subject_code,
-    bloom_level, cog_skill, oa_version, semester, complexity_level,
-    estimated_hours, ministerial_priority, is_transversal, enriched_at, source_url, scraped_at
-) VALUES (
-    '{record['oa_id']}',
-    '{record['oa_code']}',
-    {repr(record['oa_desc'])},
-    {repr(record['oa_short_desc'])},
-    '{record['grade_code']}',
-    '{record['subject_code']}',
-    '{record['bloom_level']}',
-    '{record['cog_skill']}',
-    '{record['oa_version']}',
-    {record['semester']},
-    {record['complexity_level']},
-    {record['estimated_hours']},
-    '{record['ministerial_priority']}',
-    {str(record['is_transversal']).lower()},
-    '{record['enriched_at']}',
-    {repr(record['source_url'])},
-    '{record['scraped_at']}'
-)
-ON CONFLICT (oa_code) DO UPDATE SET
-    oa_desc = EXCLUDED.oa_desc,
-    oa_short_desc = EXCLUDED.oa_short_desc,
-    bloom_level = EXCLUDED.bloom_level,
-    cog_skill = EXCLUDED.cog_skill,
-    complexity_level = EXCLUDED.complexity_level,
-    estimated_hours = EXCLUDED.estimated_hours,
-    enriched_at = EXCLUDED.enriched_at;
-
-"""
+""".format(timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), ddl=LEARNING_OBJECTIVE_DDL)
+    
+    # Un INSERT multi-fila por lote: ante oa_code repetido el último registro gana
+    # (dentro de un mismo INSERT ... ON CONFLICT DO UPDATE no puede repetirse)
+    records = {record['oa_code']: record for record in enriched_data}.values()
+    rows = map(LEARNING_OBJECTIVE_ENCODER.literals, records)
+    on_conflict = ("ON CONFLICT (oa_code) DO UPDATE SET\n    " + ",\n    ".join(upsert_assignments(delta_mode))
+                   + "\n" + upsert_condition(delta_mode))
     
     sql_footer = """
 -- Verificaciones y estadísticas
@@ -274,24 +327,110 @@ SELECT
 FROM learning_objective;
 """
     
-    return sql_header + sql_inserts + sql_footer
+    yield sql_header
+    yield from insert_statements('learning_objective', LEARNING_OBJECTIVE_COLUMNS, rows,
+                                 batch_size=batch_size, on_conflict=on_conflict)
+    if delta_mode:
+        yield generate_deprecation_sql(removed_df)
+    yield sql_footer
+
+def copy_to_postgres(db_url, enriched_data, removed_df=None):
+    """
+    Carga directa a Postgres en una sola transacción:
+    COPY FROM STDIN a una tabla staging temporal y un único
+    INSERT ... SELECT ... ON CONFLICT hacia learning_objective.
+    Con `removed_df` (modo delta) aplica la misma lógica de versión y
+    deprecación que generate_sql_insert. Retorna (insertados, actualizados, deprecados);
+    los OA sin cambios no cuentan como actualizados (ver upsert_condition)
+    """
+    with psycopg.connect(db_url) as conn:
+        return copy_learning_objectives(conn, enriched_data, removed_df)
+
+def copy_learning_objectives(conn, enriched_data, removed_df=None):
+    """
+    Igual que copy_to_postgres sobre una conexión ya abierta (p. ej. del pool de
+    load_to_supabase.py); la transacción la maneja quien llama
+    """
+    delta_mode = removed_df is not None
+    columns = ", ".join(LEARNING_OBJECTIVE_COLUMNS)
+    
+    with conn.cursor() as cur:
+        cur.execute(LEARNING_OBJECTIVE_DDL)
+        
+        # load_seq conserva el orden de carga: ante oa_code repetido gana el último, como en el SQL
+        cur.execute("""
+            CREATE TEMP TABLE learning_objective_staging (
+                LIKE learning_objective INCLUDING DEFAULTS,
+                load_seq bigserial
+            ) ON COMMIT DROP
+        """)
+        
+        with cur.copy(f"COPY learning_objective_staging ({columns}) FROM STDIN") as copy:
+            for record in enriched_data:
+                copy.write(LEARNING_OBJECTIVE_ENCODER.copy_line(record))
+        
+        cur.execute(f"""
+            WITH upserted AS (
+                INSERT INTO learning_objective ({columns})
+                SELECT DISTINCT ON (oa_code) {columns}
+                FROM learning_objective_staging
+                ORDER BY oa_code, load_seq DESC
+                ON CONFLICT (oa_code) DO UPDATE SET
+                    {", ".join(upsert_assignments(delta_mode))}
+                {upsert_condition(delta_mode)}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted)
+            FROM upserted
+        """)
+        inserted, updated = cur.fetchone()
+        
+        deprecated = 0
+        if delta_mode and not removed_df.empty:
+            cur.execute("""
+                UPDATE learning_objective AS lo
+                SET deprecated_at = removed.deprecated_at::timestamp
+                FROM unnest(%s::text[], %s::text[]) AS removed(oa_code, deprecated_at)
+                WHERE lo.oa_code = removed.oa_code AND lo.deprecated_at IS NULL
+            """, (removed_df['oa_code'].astype(str).tolist(), removed_df['deprecated_at'].astype(str).tolist()))
+            deprecated = cur.rowcount
+    
+    return inserted, updated, deprecated
 
 def main():
     """Función principal de carga masiva"""
     
+    parser = argparse.ArgumentParser(description='Carga de OA a Supabase (dataset completo o delta de oa_diff.py)')
+    parser.add_argument('--input', default='oa_1b_6b_COMPLETO_FINAL_CORREGIDO.csv', help='OA completos o delta (dataset Parquet o .csv)')
+    parser.add_argument('--sql-out', default='oa_847_completos_supabase.sql', help='Archivo SQL de salida')
+    parser.add_argument('--enriched-out', '--csv-out', dest='enriched_out', default='oa_847_completos_enriquecidos.parquet',
+                        help='OA enriquecidos de salida: dataset Parquet (o .csv)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'OA por INSERT multi-fila en el SQL generado (default: {DEFAULT_BATCH_SIZE})')
+    parser.add_argument('--db-url', help='Cargar directo a Postgres con COPY en vez de generar el SQL (p. ej. $SUPABASE_DB_URL)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para el enriquecimiento (default: 1; 0 = uno por núcleo)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'OA por trozo con --workers (default: {DEFAULT_CHUNK_SIZE})')
+    args = parser.parse_args()
+    
+    if args.db_url and not PSYCOPG_AVAILABLE:
+        print("❌ Error: --db-url requiere psycopg (pip install -r requirements.txt)")
+        return False
+    
     print("🚀 === CARGA MASIVA: 847 OA COMPLETOS A SUPABASE ===")
     print("=" * 80)
     print(f"⏰ Inicio: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
     # 1. CARGAR DATASET COMPLETO
-    input_file = 'oa_1b_6b_COMPLETO_FINAL_CORREGIDO.csv'
+    input_file = args.input
     
     if not os.path.exists(input_file):
         print(f"❌ Error: No se encuentra el archivo {input_file}")
         return False
     
-    df = pd.read_csv(input_file)
+    df = read_oa(input_file)
     total_oa = len(df)
     
     print(f"📊 Dataset cargado: {total_oa} OA")
@@ -299,36 +438,55 @@ def main():
     print(f"📖 Asignaturas: {sorted(df['subject'].unique())}")
     print()
     
+    # Delta de oa_diff.py: solo se enriquecen agregados/modificados, los eliminados se deprecan
+    removed_df = None
+    if 'change_type' in df.columns:
+        removed_df = df[df['change_type'] == 'removed']
+        print(f"🔀 Modo delta: {df['change_type'].value_counts().to_dict()}")
+        df = df[df['change_type'] != 'removed']
+        total_oa = len(df)
+        print()
+        
+        if df.empty and removed_df.empty:
+            print("🎉 Delta vacío: no hay OA que cargar ni deprecar")
+            return True
+    
     # 2. CARGAR DATASETS DE ENRIQUECIMIENTO
     print("🧠 Cargando datasets de enriquecimiento...")
     verb_bloom_data, cognitive_skills = load_enrichment_datasets()
-    print(f"✅ {len(verb_bloom_data)} verbos → Bloom cargados")
+    print(f"✅ {len(verb_bloom_data)} formas verbales → Bloom cargadas")
     print(f"✅ {len(cognitive_skills)} habilidades cognitivas cargadas")
     print()
     
     # 3. ENRIQUECER DATOS
     print("⚡ Enriqueciendo OA con Bloom y habilidades cognitivas...")
-    enriched_data = enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills)
+    enriched_data = enrich_oa_with_bloom_and_cognitive(df, verb_bloom_data, cognitive_skills,
+                                                       workers=args.workers, chunk_size=args.chunk_size)
     print(f"✅ {len(enriched_data)} OA enriquecidos")
     print()
     
     # 4. GENERAR ARCHIVOS DE SALIDA
     print("📝 Generando archivos de salida...")
     
-    # SQL para Supabase
-    sql_content = generate_sql_insert(enriched_data)
-    sql_file = 'oa_847_completos_supabase.sql'
-    
-    with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write(sql_content)
+    # SQL para Supabase (o carga directa con COPY)
+    sql_file = args.sql_out
+    if args.db_url:
+        start = datetime.now()
+        inserted, updated, deprecated = copy_to_postgres(args.db_url, enriched_data, removed_df)
+        elapsed = (datetime.now() - start).total_seconds()
+        unchanged = len({record['oa_code'] for record in enriched_data}) - inserted - updated
+        print(f"✅ Carga directa (COPY): {inserted} insertados, {updated} actualizados, {unchanged} sin cambios, "
+              f"{deprecated} deprecados en {elapsed:.2f}s")
+    else:
+        with open(sql_file, 'w', encoding='utf-8') as f:
+            write_sql(f, generate_sql_insert(enriched_data, removed_df, batch_size=args.batch_size))
+        print(f"✅ SQL guardado: {sql_file}")
     
-    # CSV enriquecido
+    # OA enriquecidos (entrada de load_to_supabase.py)
     df_enriched = pd.DataFrame(enriched_data)
-    csv_file = 'oa_847_completos_enriquecidos.csv'
-    df_enriched.to_csv(csv_file, index=False, encoding='utf-8')
+    write_oa(df_enriched, args.enriched_out)
     
-    print(f"✅ SQL guardado: {sql_file}")
-    print(f"✅ CSV enriquecido: {csv_file}")
+    print(f"✅ OA enriquecidos: {args.enriched_out}")
     print()
     
     # 5. ESTADÍSTICAS FINALES
@@ -353,7 +511,7 @@ def main():
     
     # Por Bloom
     print("🧠 DISTRIBUCIÓN POR BLOOM:")
-    bloom_counts = df_enriched['bloom_level'].value_counts()
+    bloom_counts = df_enriched['bloom_level'].value_counts() if total_oa else {}
     for bloom, count in bloom_counts.items():
         percentage = (count / total_oa) * 100
         print(f"   {bloom}: {count:3d} OA ({percentage:5.1f}%)")
@@ -362,7 +520,10 @@ def main():
     # 6. PRÓXIMOS PASOS
     print("🚀 === PRÓXIMOS PASOS ===")
     print()
-    print(f"1. 📤 Ejecutar {sql_file} en Supabase SQL Editor")
+    if args.db_url:
+        print("1. ✅ OA cargados directamente en learning_objective")
+    else:
+        print(f"1. 📤 Ejecutar {sql_file} en Supabase SQL Editor (o usar --db-url)")
     print("2. 🎮 Desarrollar 6 engines básicos prioritarios:")
     print("   • ENG01-Counter (MAT)")
     print("   • ENG02-DragDrop (MAT)")
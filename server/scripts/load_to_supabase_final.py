@@ -5,9 +5,21 @@ Dataset completo: MAT, LEN, CN, MUS, TEC, ORI
 """
 
 import pandas as pd
-import uuid
 from datetime import datetime
 
+from sql_literals import RowEncoder
+from sql_writer import DEFAULT_BATCH_SIZE, insert_statements, write_sql
+from stable_ids import oa_uuid
+
+# Columnas del INSERT (mismo orden que el CSV limpio) y su tipo SQL
+OA_ENCODER = RowEncoder([
+    ('oa_id', 'uuid'), ('oa_code', 'text'), ('oa_desc', 'text'), ('oa_short_desc', 'text'),
+    ('grade_code', 'text'), ('subject_code', 'text'), ('bloom_level', 'text'), ('cog_skill', 'text'),
+    ('oa_version', 'text'), ('semester', 'int'), ('complexity_level', 'int'), ('estimated_hours', 'int'),
+    ('ministerial_priority', 'text'), ('is_transversal', 'bool'), ('enriched_at', 'timestamp')
+])
+OA_COLUMNS = OA_ENCODER.columns
+
 def main():
     print("🚀 === CARGA FINAL 1° BÁSICO COMPLETO A SUPABASE ===")
     
@@ -35,10 +47,8 @@ def main():
     
     # Generar SQL
     print("📝 Generando SQL para Supabase...")
-    sql_content = generate_sql(df)
-    
     with open(sql_file, 'w', encoding='utf-8') as f:
-        f.write(sql_content)
+        write_sql(f, generate_sql(df))
     
     # Preparar CSV limpio
     df_clean = prepare_csv(df)
@@ -59,10 +69,10 @@ def main():
     print("✅ Archivos listos para carga")
     print("🚀 ¡LISTO PARA PRODUCCIÓN!")
 
-def generate_sql(df):
-    """Genera SQL completo para insertar en Supabase"""
+def generate_sql(df, batch_size=DEFAULT_BATCH_SIZE):
+    """Genera SQL completo para insertar en Supabase, fragmento a fragmento (ver sql_writer)"""
     
-    sql = """-- === CARGA COMPLETA 1° BÁSICO - 79 OA ===
+    yield """-- === CARGA COMPLETA 1° BÁSICO - 79 OA ===
 -- Generado automáticamente desde pipeline EDU21
 -- Materias: MAT, LEN, CN, MUS, TEC, ORI
 
@@ -90,33 +100,10 @@ CREATE TABLE IF NOT EXISTS learning_objective (
 -- Insertar 79 OA de 1° Básico
 """
     
-    for _, row in df.iterrows():
-        oa_id = str(uuid.uuid4())
-        sql += f"""
-INSERT INTO learning_objective (
-    oa_id, oa_code, oa_desc, oa_short_desc, grade_code, subject_code,
-    bloom_level, cog_skill, oa_version, semester, complexity_level,
-    estimated_hours, ministerial_priority, is_transversal, enriched_at
-) VALUES (
-    '{oa_id}',
-    '{row['oa_code']}',
-    '{str(row['oa_desc']).replace("'", "''")}',
-    '{str(row['oa_short_desc']).replace("'", "''")}',
-    '{row['grade_code']}',
-    '{row['subject_code']}',
-    '{row['bloom_level']}',
-    '{row['cog_skill']}',
-    '{row['oa_version']}',
-    {row['semester']},
-    {row['complexity_level']},
-    {row['estimated_hours']},
-    '{row['ministerial_priority']}',
-    {str(row['is_transversal']).lower()},
-    '{row['enriched_at']}'
-);"""
-    
-    sql += """
-
+    rows = (OA_ENCODER.literals(dict(row, oa_id=oa_uuid(row['oa_code']))) for row in df.to_dict('records'))
+    yield from insert_statements('learning_objective', OA_COLUMNS, rows, batch_size=batch_size)
+    
+    yield """
 -- Verificación de inserción
 SELECT 
     subject_code,
@@ -135,26 +122,17 @@ SELECT
 FROM learning_objective 
 WHERE grade_code = '1B';
 """
-    
-    return sql
 
 def prepare_csv(df):
     """Prepara CSV limpio para importación directa"""
     
     df_clean = df.copy()
     
-    # Agregar UUID para cada registro
-    df_clean['oa_id'] = [str(uuid.uuid4()) for _ in range(len(df_clean))]
+    # UUID estable por oa_code: el mismo que en el SQL y en cada corrida
+    df_clean['oa_id'] = df_clean['oa_code'].map(oa_uuid)
     
     # Reordenar columnas para match con tabla Supabase
-    columns_order = [
-        'oa_id', 'oa_code', 'oa_desc', 'oa_short_desc', 
-        'grade_code', 'subject_code', 'bloom_level', 'cog_skill',
-        'oa_version', 'semester', 'complexity_level', 'estimated_hours',
-        'ministerial_priority', 'is_transversal', 'enriched_at'
-    ]
-    
-    df_clean = df_clean[columns_order]
+    df_clean = df_clean[OA_COLUMNS]
     return df_clean
 
 def generate_engine_recommendations(df):
@@ -0,0 +1,191 @@
+"""
+Formato intermedio del pipeline de OA: datasets Parquet tipados
+Las etapas (scrape_oa → oa_diff → enrich_oa → load_847 / load_to_supabase) se
+pasan los OA como datasets Parquet particionados por grado y asignatura
+(`oa_raw.parquet/grade=1B/subject=MAT/part-0.parquet`), con un esquema explícito
+en vez de re-inferir tipos con pd.read_csv en cada paso: oa_code y grade_code
+texto, bloom_level y demás columnas de categorías como diccionario (Categorical
+en pandas), enteros, booleanos y timestamps reales.
+
+El esquema completo (incluidas las columnas de partición) y el orden original de
+filas quedan en `_common_metadata`; al leer se restauran columnas y orden. Una
+ruta terminada en .csv se lee/escribe como CSV (export o entrada heredada), con
+el mismo esquema.
+
+Uso:
+    df = read_oa('oa_raw.parquet')                    # dataset o .csv
+    write_oa(enriched_df, 'oa_enriched.parquet')      # particionado por grado/asignatura
+    write_oa(enriched_df, 'oa_enriched.csv')          # export CSV
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+from lazy_imports import lazy_import, module_available
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+pa = lazy_import('pyarrow')
+pc = lazy_import('pyarrow.compute')
+pa_csv = lazy_import('pyarrow.csv')
+ds = lazy_import('pyarrow.dataset')
+pq = lazy_import('pyarrow.parquet')
+PYARROW_AVAILABLE = module_available('pyarrow')
+
+# Tipo de cada columna conocida del pipeline; las demás se infieren
+OA_SCHEMA = {
+    'oa_id': 'string',
+    'oa_code': 'string',
+    'oa_desc': 'string',
+    'oa_short_desc': 'string',
+    'grade': 'string',
+    'subject': 'string',
+    'grade_code': 'string',
+    'subject_code': 'string',
+    'bloom_level': 'category',
+    'cog_skill': 'category',
+    'oa_version': 'string',
+    'semester': 'int16',
+    'complexity_level': 'int16',
+    'estimated_hours': 'int16',
+    'ministerial_priority': 'category',
+    'is_transversal': 'bool',
+    'source_url': 'string',
+    'scraped_at': 'timestamp',
+    'page_complete': 'bool',
+    'enriched_at': 'timestamp',
+    'deprecated_at': 'timestamp',
+    'change_type': 'category',
+    'desc_hash': 'string',
+}
+
+# Columnas de partición, en orden de preferencia (enriquecido / raw)
+PARTITION_COLUMNS = [('grade_code', 'subject_code'), ('grade', 'subject')]
+
+METADATA_FILE = '_common_metadata'
+ROW_ORDER_COLUMN = '_row_order'
+CSV_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+def _arrow_type(type_name):
+    return {
+        'string': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'int16': pa.int16(),
+        'bool': pa.bool_(),
+        'timestamp': pa.timestamp('us'),
+    }[type_name]
+
+def is_csv(path):
+    return str(path).lower().endswith('.csv')
+
+def _require_pyarrow(path):
+    if not PYARROW_AVAILABLE:
+        raise ImportError(f"{path}: los datasets Parquet requieren pyarrow (pip install -r requirements.txt); "
+                          "usar una ruta .csv como alternativa")
+
+def partition_columns(columns):
+    """Par de columnas de partición presente en `columns`, o () si no hay"""
+    for pair in PARTITION_COLUMNS:
+        if all(col in columns for col in pair):
+            return pair
+    return ()
+
+def _column_array(series, type_name):
+    """Columna pandas → array Arrow con el tipo del esquema (NaN/None → null)"""
+    if type_name == 'timestamp':
+        series = pd.to_datetime(series, format='ISO8601')
+    elif type_name == 'category':
+        series = series.astype('category')
+    elif type_name == 'string' and not pd.api.types.is_string_dtype(series):
+        series = series.map(lambda value: value if pd.isna(value) else str(value), na_action='ignore')
+    return pa.array(series, type=_arrow_type(type_name) if type_name else None, from_pandas=True)
+
+def to_table(df):
+    """DataFrame → pyarrow.Table con el esquema de OA_SCHEMA para las columnas conocidas"""
+    _require_pyarrow('to_table')
+    arrays = [_column_array(df[col], OA_SCHEMA.get(col)) for col in df.columns]
+    return pa.table(arrays, names=[str(col) for col in df.columns])
+
+def write_oa(df, path):
+    """
+    Escribe el DataFrame como dataset Parquet particionado (o CSV si `path`
+    termina en .csv). Un dataset existente en `path` se reemplaza completo
+    """
+    path = Path(path)
+    if is_csv(path):
+        df.to_csv(path, index=False, encoding='utf-8', date_format=CSV_DATE_FORMAT)
+        return
+
+    _require_pyarrow(path)
+    table = to_table(df)
+    partitioning = partition_columns(table.column_names)
+
+    if path.exists():
+        if not (path / METADATA_FILE).exists():
+            raise FileExistsError(f"{path} existe y no es un dataset de OA: no se sobreescribe")
+        shutil.rmtree(path)
+
+    data = table.append_column(ROW_ORDER_COLUMN, pa.array(np.arange(len(table), dtype=np.int64)))
+    ds.write_dataset(
+        data, path, format='parquet',
+        partitioning=list(partitioning) or None, partitioning_flavor='hive' if partitioning else None,
+        basename_template='part-{i}.parquet', existing_data_behavior='overwrite_or_ignore',
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    metadata = {b'oa_partitioning': json.dumps(list(partitioning)).encode()}
+    pq.write_metadata(data.schema.with_metadata(metadata), path / METADATA_FILE)
+
+def read_oa_table(path, columns=None):
+    """Dataset Parquet (o CSV) → pyarrow.Table tipada, en el orden original de filas"""
+    _require_pyarrow(path)
+    path = Path(path)
+    if is_csv(path):
+        return _read_csv_table(path, columns)
+
+    schema = pq.read_schema(path / METADATA_FILE)
+    partitioning = json.loads(schema.metadata[b'oa_partitioning'])
+    dataset = ds.dataset(
+        path, schema=schema.remove_metadata(), format='parquet',
+        partitioning=ds.partitioning(pa.schema([schema.field(col) for col in partitioning]), flavor='hive')
+                     if partitioning else None,
+    )
+    wanted = None if columns is None else list(columns) + [ROW_ORDER_COLUMN]
+    table = dataset.to_table(columns=wanted)
+    order = table[ROW_ORDER_COLUMN]
+    if len(order) and not pc.all(pc.greater(order[1:], order[:-1])).as_py():
+        table = table.take(pc.sort_indices(order))
+    return table.drop_columns([ROW_ORDER_COLUMN])
+
+def _read_csv_table(path, columns):
+    # Los CSV heredados escriben enteros como '1.0' (columnas con NaN): se leen como
+    # float y se castean al entero del esquema (un valor con decimales es un error)
+    column_types = {col: pa.float64() if type_name == 'int16' else _arrow_type(type_name)
+                    for col, type_name in OA_SCHEMA.items()}
+    convert = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True,
+                                    include_columns=columns, timestamp_parsers=[pa_csv.ISO8601])
+    table = pa_csv.read_csv(path, convert_options=convert)
+    for i, name in enumerate(table.column_names):
+        if OA_SCHEMA.get(name) == 'int16':
+            table = table.set_column(i, name, table[name].cast(pa.int16()))
+    return table
+
+def read_oa(path, columns=None):
+    """
+    Lee un dataset de OA (o CSV) como DataFrame tipado. Con pyarrow la conversión
+    es columnar; sin pyarrow solo se aceptan CSV (leídos con el mismo esquema)
+    """
+    if PYARROW_AVAILABLE:
+        return read_oa_table(path, columns).to_pandas()
+    if not is_csv(path):
+        _require_pyarrow(path)
+
+    # Sin pyarrow: texto y categorías explícitos, timestamps parseados; números inferidos
+    present = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: {'string': str, 'category': 'category'}[OA_SCHEMA[col]]
+              for col in present if OA_SCHEMA.get(col) in ('string', 'category')}
+    df = pd.read_csv(path, dtype=dtypes, usecols=columns)
+    for col in df.columns:
+        if OA_SCHEMA.get(col) == 'timestamp':
+            df[col] = pd.to_datetime(df[col], format='ISO8601')
+    return df
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Detección incremental de cambios en los OA scrapeados
+Compara cada oa_desc (hash por oa_code) contra el snapshot de la corrida anterior
+y genera solo el delta: OA agregados, modificados y eliminados.
+
+El delta se pasa a enrich_oa.py y load_847_oa_to_supabase.py, que procesan
+solo esas filas en vez de los 847+ OA completos:
+    - added / changed: oa_version = versión de esta corrida (--version)
+    - removed:         deprecated_at = fecha de esta corrida
+
+El scrape suele ser parcial (scrape_oa.py usa el grado 1B por defecto y
+--max-oa lo acota): un OA se da por eliminado solo si falta dentro de un
+(grado, asignatura) presente en el input, salvo con --full-corpus. Las páginas
+recortadas por --max-oa (page_complete = False en el scrape) nunca generan
+eliminados, ni siquiera con --full-corpus: el OA puede estar más allá del
+límite. Los OA que no se pueden dar por eliminados pasan al snapshot nuevo sin
+cambios.
+
+Uso:
+    python oa_diff.py --input oa_raw.parquet --snapshot oa_snapshot.json --out oa_delta.parquet
+    python oa_diff.py --input oa_todos.parquet --full-corpus                  # scrape completo
+    python oa_diff.py --self-test                                             # reglas de eliminación
+    python enrich_oa.py --input oa_delta.parquet --output oa_delta_enriched.parquet
+    python load_847_oa_to_supabase.py --input oa_delta.parquet                 # SQL de carga
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from lazy_imports import lazy_import
+from oa_dataset import read_oa, write_oa
+
+pd = lazy_import('pandas')
+
+# Configurar logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Versión de la malla base: la que se asigna a todo en la primera corrida (sin snapshot)
+BASELINE_VERSION = '2023'
+
+CHANGE_TYPES = ('added', 'changed', 'removed')
+
+def hash_description(oa_desc):
+    """Hash estable de la descripción (espacios normalizados, NaN = vacío)"""
+    text = '' if pd.isna(oa_desc) else ' '.join(str(oa_desc).split())
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def load_snapshot(path):
+    """Carga el snapshot anterior como {oa_code: entrada}, o None si no existe"""
+    if not Path(path).exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['oa']
+
+def save_snapshot(path, entries, source):
+    """Escribe el snapshot de forma atómica (temporal + rename)"""
+    data = {
+        'created_at': datetime.now().isoformat(),
+        'source': str(source),
+        'total': len(entries),
+        'oa': entries
+    }
+    directory = Path(path).resolve().parent
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def scraped_pages(df):
+    """
+    (grado, asignatura) presentes en el scrape y los recortados por --max-oa.
+    Un input sin columna page_complete (CSV combinados, scrapes anteriores) se
+    toma como completo
+    """
+    scraped = set(zip(df['grade'], df['subject']))
+    if 'page_complete' not in df.columns:
+        return scraped, set()
+    capped = df[df['page_complete'].eq(False).fillna(False).astype(bool)]
+    return scraped, set(zip(capped['grade'], capped['subject']))
+
+def compute_delta(df, previous, version, run_at=None, full_corpus=False):
+    """
+    Compara el scrape actual con el snapshot anterior.
+    Retorna (delta_df, nuevo_snapshot). Con previous=None (primera corrida)
+    todos los OA son 'added' con la versión base de la malla. Sin full_corpus,
+    los eliminados se buscan solo en los (grado, asignatura) del input; las
+    páginas recortadas (page_complete False) nunca los generan. El resto del
+    snapshot anterior se copia tal cual.
+    """
+    run_at = run_at or datetime.now().isoformat()
+    first_run = previous is None
+    previous = previous or {}
+
+    # Mismo criterio que el resto del pipeline: el primer registro por oa_code gana
+    df = df.drop_duplicates(subset=['oa_code'], keep='first').reset_index(drop=True)
+    hashes = df['oa_desc'].map(hash_description)
+
+    delta_rows = []
+    snapshot = {}
+
+    for row, desc_hash in zip(df.to_dict('records'), hashes):
+        code = row['oa_code']
+        before = previous.get(code)
+
+        if before is None:
+            change_type = 'added'
+            oa_version = BASELINE_VERSION if first_run else version
+        elif before['hash'] != desc_hash:
+            change_type = 'changed'
+            oa_version = version
+        else:
+            change_type = None
+            oa_version = before.get('oa_version', BASELINE_VERSION)
+
+        snapshot[code] = {
+            'hash': desc_hash,
+            'grade': row.get('grade'),
+            'subject': row.get('subject'),
+            'oa_version': oa_version,
+            'updated_at': run_at if change_type else before.get('updated_at', run_at)
+        }
+
+        if change_type:
+            delta_rows.append(dict(row, change_type=change_type, oa_version=oa_version,
+                                   desc_hash=desc_hash, deprecated_at=None))
+
+    # OA que estaban en el snapshot anterior y ya no aparecen en el portal
+    scraped, truncated = scraped_pages(df)
+    for code in sorted(set(previous) - set(snapshot)):
+        before = previous[code]
+        page = (before.get('grade'), before.get('subject'))
+        if page in truncated or (not full_corpus and page not in scraped):
+            snapshot[code] = before
+            continue
+        delta_rows.append({
+            'oa_code': code,
+            'grade': before.get('grade'),
+            'subject': before.get('subject'),
+            'change_type': 'removed',
+            'oa_version': before.get('oa_version', BASELINE_VERSION),
+            'desc_hash': before['hash'],
+            'deprecated_at': run_at
+        })
+
+    columns = list(df.columns) + ['change_type', 'oa_version', 'desc_hash', 'deprecated_at']
+    delta_df = pd.DataFrame(delta_rows, columns=list(dict.fromkeys(columns)))
+    return delta_df, snapshot
+
+def self_test():
+    """
+    Reglas de eliminación sobre datos sintéticos: scrape parcial, scrape
+    recortado por --max-oa y corpus completo. Retorna True si todas se cumplen
+    """
+    def scrape(rows, page_complete=True):
+        return pd.DataFrame([{'oa_code': code, 'oa_desc': f'Descripción de {code}', 'grade': grade,
+                              'subject': subject, 'page_complete': page_complete}
+                             for code, grade, subject in rows])
+
+    corpus = [(f'MA01OA{i:02d}', '1B', 'MAT') for i in range(1, 6)] + [('LE01OA01', '1B', 'LEN')]
+    _, previous = compute_delta(scrape(corpus), None, '2026', run_at='2026-01-01')
+
+    def removed(df, full_corpus=False):
+        """Eliminados del delta; None si un OA no eliminado se perdió del snapshot"""
+        delta, snapshot = compute_delta(df, previous, '2026', run_at='2026-02-01', full_corpus=full_corpus)
+        codes = sorted(delta.loc[delta['change_type'] == 'removed', 'oa_code'])
+        return codes if set(snapshot) == set(previous) - set(codes) else None
+
+    cases = [
+        # MAT completo sin OA05: solo ese se elimina; LEN no se scrapeó y se conserva
+        ('scrape parcial', removed(scrape(corpus[:4])), ['MA01OA05']),
+        # --max-oa 2: los OA de MAT más allá del límite no se eliminan
+        ('scrape recortado', removed(scrape(corpus[:2], page_complete=False)), []),
+        ('scrape recortado + --full-corpus', removed(scrape(corpus[:2], page_complete=False), True), ['LE01OA01']),
+        ('corpus completo', removed(scrape(corpus[:4]), True), ['LE01OA01', 'MA01OA05']),
+        # Scrape sin columna page_complete (CSV combinado): se toma como completo
+        ('scrape sin page_complete', removed(scrape(corpus[:4]).drop(columns=['page_complete'])), ['MA01OA05']),
+    ]
+    ok = True
+    for name, got, expected in cases:
+        if got != expected:
+            logger.error(f"❌ {name}: eliminados {got}, esperado {expected}")
+            ok = False
+        else:
+            logger.info(f"✅ {name}: eliminados {got}")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description='Delta de OA (agregados/modificados/eliminados) contra el snapshot anterior')
+    parser.add_argument('--input', default='oa_raw.parquet', help='OA scrapeados de esta corrida (dataset o .csv)')
+    parser.add_argument('--snapshot', default='oa_snapshot.json', help='Snapshot de la corrida anterior (se actualiza)')
+    parser.add_argument('--out', default='oa_delta.parquet', help='Dataset de salida con solo el delta (o .csv)')
+    parser.add_argument('--version', default=str(datetime.now().year),
+                        help='oa_version para OA agregados o modificados (default: año actual)')
+    parser.add_argument('--full-corpus', action='store_true',
+                        help='El input es el portal completo: todo OA ausente se marca eliminado')
+    parser.add_argument('--dry-run', action='store_true', help='Mostrar el delta sin escribir archivos')
+    parser.add_argument('--self-test', action='store_true',
+                        help='Verificar las reglas de eliminación con datos sintéticos y salir (exit 1 si fallan)')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Logging detallado')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.self_test:
+        sys.exit(0 if self_test() else 1)
+
+    if not Path(args.input).exists():
+        logger.error(f"❌ Archivo de entrada no encontrado: {args.input}")
+        logger.info("💡 Ejecuta primero: python scrape_oa.py --out oa_raw.parquet")
+        sys.exit(1)
+
+    try:
+        df = read_oa(args.input)
+        missing_cols = [col for col in ('oa_code', 'oa_desc', 'grade', 'subject') if col not in df.columns]
+        if missing_cols:
+            raise ValueError(f"Columnas faltantes en {args.input}: {missing_cols}")
+
+        previous = load_snapshot(args.snapshot)
+        if previous is None:
+            logger.info(f"📸 Sin snapshot previo en {args.snapshot}: primera corrida, todo es 'added' ({BASELINE_VERSION})")
+        else:
+            logger.info(f"📸 Snapshot anterior: {len(previous)} OA")
+
+        delta_df, snapshot = compute_delta(df, previous, args.version, full_corpus=args.full_corpus)
+        if previous is not None:
+            scraped, truncated = scraped_pages(df)
+            if not args.full_corpus:
+                logger.info(f"🔎 Eliminados solo dentro de {len(scraped)} (grado, asignatura) scrapeados "
+                            f"(--full-corpus para el portal completo)")
+            if truncated:
+                logger.warning(f"⚠️  {len(truncated)} páginas recortadas por --max-oa: sin eliminados en "
+                               f"{', '.join(f'{grade}-{subject}' for grade, subject in sorted(truncated))}")
+
+        counts = delta_df['change_type'].value_counts()
+        logger.info(f"📊 Delta: {len(delta_df)} de {len(snapshot)} OA en el snapshot")
+        for change_type in CHANGE_TYPES:
+            logger.info(f"   {change_type}: {counts.get(change_type, 0)}")
+
+        if args.dry_run:
+            logger.info("🔍 Dry run: no se escribió el delta ni el snapshot")
+            sys.exit(0)
+
+        write_oa(delta_df, args.out)
+        save_snapshot(args.snapshot, snapshot, args.input)
+
+        logger.info(f"✅ Delta guardado en {args.out}")
+        logger.info(f"✅ Snapshot actualizado: {args.snapshot}")
+        if len(delta_df):
+            logger.info(f"🔄 Siguiente paso: python load_847_oa_to_supabase.py --input {args.out}")
+        else:
+            logger.info("🎉 Sin cambios en el portal: nada que enriquecer ni cargar")
+        sys.exit(0)
+
+    except Exception as e:
+        logger.error(f"❌ Error calculando delta: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
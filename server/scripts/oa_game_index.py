@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Índice invertido OA → engines → skins para recomendar juegos
+El vínculo entre OA y juegos estaba repartido en listas fijas: los
+learning_objectives de cada engine (create_6_engines_basicos.py) y de cada skin
+(create_90_skins_mat_len.py). Este script los compila en una sola pasada, junto
+con los OA enriquecidos, en ../datasets/oa_game_index.json:
+
+    engines / skins        catálogo mínimo, en orden fijo (bit i = elemento i),
+                           con su uuid estable (stable_ids.py)
+    bitsets                por grado, nivel Bloom, habilidad cognitiva, asignatura
+                           (y dificultad y engine para los skins)
+    oa                     oa_code → engines y skins candidatos (bitsets), grado,
+                           Bloom, habilidad y dificultad del OA, y su oa_id
+
+Un OA listado en algún engine o skin usa esos vínculos ('explicit'); el resto
+recibe los engines de su asignatura y grado ('affinity') y los skins de esos
+engines. La consulta es solo AND/OR de enteros: filtrar por grado y dificultad
+y ordenar por coincidencia de Bloom y habilidad toma microsegundos.
+
+Los bitsets se exportan como hex (sin 0x) para que el backend los lea con
+BigInt('0x' + hex). El JSON es determinista: si engines, skins y OA no
+cambiaron, el archivo queda idéntico (el pipeline no re-ejecuta lo siguiente).
+
+Uso:
+    python oa_game_index.py                                  # compilar con los OA de load_847_oa_to_supabase.py
+    python oa_game_index.py --check                          # exit 1 si el índice no está al día (CI)
+    python oa_game_index.py --query MA01OA01 --grade 1B --difficulty easy
+
+    index = GameIndex.load()
+    index.recommend('MA01OA01', grade='1B', difficulty='easy')   # {'engines': [...], 'skins': [...]}
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from create_6_engines_basicos import create_engine_specifications
+from create_90_skins_mat_len import create_language_skins, create_math_skins
+from oa_dataset import read_oa
+from stable_ids import engine_uuid, oa_uuid, skin_uuid
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT = 1
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX = SCRIPTS_DIR.parent / 'datasets' / 'oa_game_index.json'
+# Salida de load_847_oa_to_supabase.py; el CSV versionado sirve si no se ha corrido
+OA_DATASET_CANDIDATES = ['oa_847_completos_enriquecidos.parquet', 'oa_847_completos_enriquecidos.csv']
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+# Las specs de engines (y OA enriquecidos antiguos) usan nombres largos; el
+# enriquecimiento actual usa los códigos de cognitive_skills.csv
+SKILL_ALIASES = {
+    'procesamiento_visual': 'proc_visual',
+    'comprension_verbal': 'comp_verbal',
+    'coordinacion_motora': 'coord_motora',
+    'flexibilidad_mental': 'flexibilidad',
+    'procesamiento_auditivo': 'perc_auditiva',
+}
+
+APPEAL_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+def _present(value):
+    """False para None, NaN y NaT"""
+    return value is not None and value == value
+
+def difficulty_for_complexity(complexity):
+    """complexity_level del enriquecimiento (1-6) → dificultad de skin"""
+    if not _present(complexity):
+        return None
+    complexity = int(complexity)
+    return 'easy' if complexity <= 2 else ('medium' if complexity == 3 else 'hard')
+
+def default_oa_dataset():
+    for name in OA_DATASET_CANDIDATES:
+        if (SCRIPTS_DIR / name).exists():
+            return str(SCRIPTS_DIR / name)
+    return None
+
+def _as_list(value):
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+def _add_bit(bitsets, key, bit):
+    if key is not None:
+        bitsets[key] = bitsets.get(key, 0) | (1 << bit)
+
+def _bits(mask):
+    """Posiciones de los bits en 1, de menor a mayor"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def _oa_records(oa_df):
+    """OA enriquecidos (o crudos) → [{oa_code, grade, subject, bloom_level, cog_skill, difficulty}]"""
+    if oa_df is None:
+        return []
+    grade = 'grade_code' if 'grade_code' in oa_df else 'grade'
+    subject = 'subject_code' if 'subject_code' in oa_df else 'subject'
+    records = []
+    for row in oa_df.to_dict('records'):
+        if _present(row.get('deprecated_at')):
+            continue  # OA deprecados no se recomiendan
+        records.append({
+            'oa_code': row['oa_code'],
+            'grade': row.get(grade),
+            'subject': row.get(subject),
+            'bloom_level': row.get('bloom_level'),
+            'cog_skill': SKILL_ALIASES.get(row.get('cog_skill'), row.get('cog_skill')),
+            'difficulty': difficulty_for_complexity(row.get('complexity_level')),
+        })
+    return records
+
+def compile_index(engines, skins, oa_df=None):
+    """Una pasada por engines, skins y OA → índice listo para exportar (bitsets como enteros)"""
+    engine_bits = {'grade': {}, 'bloom': {}, 'skill': {}, 'subject': {}}
+    skin_bits = {'grade': {}, 'bloom': {}, 'skill': {}, 'subject': {}, 'difficulty': {}, 'engine': {}}
+    explicit = {}  # oa_code → [engines, skins]
+    engine_position = {}
+    engine_skills = {}
+
+    engine_list = []
+    for i, engine in enumerate(engines):
+        engine_position[engine['engine_id']] = i
+        skills = [SKILL_ALIASES.get(skill, skill) for skill in engine.get('cognitive_skills', [])]
+        engine_skills[engine['engine_id']] = skills
+        for grade in engine.get('recommended_grades', []):
+            _add_bit(engine_bits['grade'], grade, i)
+        for level in engine.get('bloom_levels', []):
+            _add_bit(engine_bits['bloom'], level, i)
+        for skill in skills:
+            _add_bit(engine_bits['skill'], skill, i)
+        for subject in engine.get('subject_affinity', []):
+            _add_bit(engine_bits['subject'], subject, i)
+        for oa_code in engine.get('learning_objectives', []):
+            explicit.setdefault(oa_code, [0, 0])[0] |= 1 << i
+        engine_list.append({
+            'engine_id': engine['engine_id'],
+            'uuid': engine_uuid(engine['engine_id']),
+            'code': engine['code'],
+            'name': engine['name'],
+        })
+
+    skin_list = []
+    for i, skin in enumerate(skins):
+        for grade in skin.get('recommended_grades', []):
+            _add_bit(skin_bits['grade'], grade, i)
+        for level in _as_list(skin.get('bloom_level')):
+            _add_bit(skin_bits['bloom'], level, i)
+        # Los skins heredan las habilidades de su engine
+        for skill in engine_skills.get(skin['engine_id'], []):
+            _add_bit(skin_bits['skill'], skill, i)
+        _add_bit(skin_bits['subject'], skin.get('subject'), i)
+        _add_bit(skin_bits['difficulty'], skin.get('difficulty'), i)
+        _add_bit(skin_bits['engine'], skin['engine_id'], i)
+        for oa_code in skin.get('learning_objectives', []):
+            links = explicit.setdefault(oa_code, [0, 0])
+            links[1] |= 1 << i
+            if skin['engine_id'] in engine_position:
+                links[0] |= 1 << engine_position[skin['engine_id']]
+        skin_list.append({
+            'skin_id': skin['skin_id'],
+            'uuid': skin_uuid(skin['skin_id']),
+            'engine_id': skin['engine_id'],
+            'name': skin['name'],
+            'theme': skin.get('theme'),
+            'difficulty': skin.get('difficulty'),
+            'appeal_rating': skin.get('appeal_rating'),
+        })
+
+    def skins_of(engine_mask):
+        mask = 0
+        for i in _bits(engine_mask):
+            mask |= skin_bits['engine'].get(engine_list[i]['engine_id'], 0)
+        return mask
+
+    oa_index = {}
+    for record in _oa_records(oa_df):
+        entry = {key: record[key] for key in ('grade', 'subject', 'bloom_level', 'cog_skill', 'difficulty')
+                 if isinstance(record[key], str)}
+        if record['oa_code'] in explicit:
+            engines_mask, skins_mask = explicit[record['oa_code']]
+            entry['match'] = 'explicit'
+            skins_mask = skins_mask or skins_of(engines_mask)
+        else:
+            engines_mask = (engine_bits['subject'].get(record['subject'], 0)
+                            & engine_bits['grade'].get(record['grade'], 0))
+            skins_mask = skins_of(engines_mask) & skin_bits['grade'].get(record['grade'], 0)
+            entry['match'] = 'affinity'
+        if engines_mask or skins_mask:
+            oa_index[record['oa_code']] = {'engines': engines_mask, 'skins': skins_mask,
+                                           'oa_id': oa_uuid(record['oa_code']), **entry}
+
+    # OA listados en engines/skins que no están en el dataset: solo los vínculos
+    for oa_code, (engines_mask, skins_mask) in explicit.items():
+        if oa_code not in oa_index:
+            oa_index[oa_code] = {'engines': engines_mask, 'skins': skins_mask or skins_of(engines_mask),
+                                 'oa_id': oa_uuid(oa_code), 'match': 'explicit'}
+
+    return {
+        'format': INDEX_FORMAT,
+        'engines': engine_list,
+        'skins': skin_list,
+        'bitsets': {'engines': engine_bits, 'skins': skin_bits},
+        'oa': dict(sorted(oa_index.items())),
+    }
+
+def _hex_bitsets(value):
+    if isinstance(value, dict):
+        return {key: _hex_bitsets(item) for key, item in sorted(value.items())}
+    return format(value, 'x')
+
+def export_index(index):
+    """Índice → JSON determinista, con bitsets en hex y el hash del contenido en 'version'"""
+    exported = dict(index)
+    exported['bitsets'] = _hex_bitsets(index['bitsets'])
+    exported['oa'] = {code: {**entry, 'engines': format(entry['engines'], 'x'), 'skins': format(entry['skins'], 'x')}
+                      for code, entry in index['oa'].items()}
+    body = json.dumps(exported, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    exported['version'] = hashlib.sha256(body.encode('utf-8')).hexdigest()[:16]
+    return json.dumps(exported, ensure_ascii=False, sort_keys=True, indent=1) + '\n'
+
+def build_index(oa_dataset=None):
+    """Compila el índice desde las specs de engines/skins y el dataset de OA (si existe)"""
+    oa_dataset = oa_dataset or default_oa_dataset()
+    oa_df = None
+    if oa_dataset and Path(oa_dataset).exists():
+        oa_df = read_oa(oa_dataset)
+        logger.info(f"OA: {len(oa_df)} desde {Path(oa_dataset).name}")
+    else:
+        logger.warning(f"No se encontró el dataset de OA ({oa_dataset}): solo OA listados en engines y skins")
+    return compile_index(create_engine_specifications(), create_math_skins() + create_language_skins(), oa_df)
+
+class GameIndex:
+    """Índice exportado cargado en memoria, con los bitsets como enteros"""
+
+    def __init__(self, exported):
+        if exported.get('format') != INDEX_FORMAT:
+            raise ValueError(f"Formato de índice {exported.get('format')} (se espera {INDEX_FORMAT})")
+        self.version = exported.get('version')
+        self.engines = exported['engines']
+        self.skins = exported['skins']
+        self.bitsets = {kind: {attr: {key: int(mask, 16) for key, mask in values.items()}
+                               for attr, values in attrs.items()}
+                        for kind, attrs in exported['bitsets'].items()}
+        self.oa = {code: {**entry, 'engines': int(entry['engines'], 16), 'skins': int(entry['skins'], 16)}
+                   for code, entry in exported['oa'].items()}
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _tiers(self, kind, candidates, bloom_level, cog_skill):
+        """Candidatos por nivel de coincidencia: Bloom y habilidad > solo Bloom > solo habilidad > resto"""
+        bloom = self.bitsets[kind]['bloom'].get(bloom_level, 0)
+        skill = self.bitsets[kind]['skill'].get(cog_skill, 0)
+        return [candidates & bloom & skill, candidates & bloom & ~skill,
+                candidates & skill & ~bloom, candidates & ~bloom & ~skill]
+
+    def recommend(self, oa_code, grade=None, difficulty=None, limit=3):
+        """
+        Mejores engines y skins para un OA. `grade` y `difficulty` filtran (por
+        defecto los del OA); retorna {'engines': [...], 'skins': [...], 'match': ...}
+        """
+        entry = self.oa.get(oa_code)
+        if entry is None:
+            return {'engines': [], 'skins': [], 'match': None}
+        grade = grade or entry.get('grade')
+        difficulty = difficulty or entry.get('difficulty')
+
+        engines = entry['engines']
+        skins = entry['skins']
+        if grade:
+            engines &= self.bitsets['engines']['grade'].get(grade, 0)
+            skins &= self.bitsets['skins']['grade'].get(grade, 0)
+        if difficulty:
+            skins &= self.bitsets['skins']['difficulty'].get(difficulty, 0)
+
+        bloom_level, cog_skill = entry.get('bloom_level'), entry.get('cog_skill')
+        ranked_engines = [i for tier in self._tiers('engines', engines, bloom_level, cog_skill)
+                          for i in _bits(tier)][:limit]
+        
+        # Skins: los de los engines recomendados primero; dentro de cada nivel, mayor appeal primero
+        preferred = 0
+        for i in ranked_engines:
+            preferred |= self.bitsets['skins']['engine'].get(self.engines[i]['engine_id'], 0)
+        tiers = (self._tiers('skins', skins & preferred, bloom_level, cog_skill)
+                 + self._tiers('skins', skins & ~preferred, bloom_level, cog_skill))
+        appeal = lambda i: APPEAL_ORDER.get(self.skins[i]['appeal_rating'], len(APPEAL_ORDER))
+        ranked_skins = []
+        for tier in tiers:
+            if len(ranked_skins) >= limit:
+                break
+            ranked_skins.extend(sorted(_bits(tier), key=appeal))
+        return {
+            'engines': [self.engines[i] for i in ranked_engines],
+            'skins': [self.skins[i] for i in ranked_skins[:limit]],
+            'match': entry['match'],
+        }
+
+def main():
+    """Compila, verifica o consulta el índice OA → engines → skins"""
+
+    parser = argparse.ArgumentParser(description='Índice invertido OA → engines → skins para el backend')
+    parser.add_argument('--oa-dataset',
+                        help=f'OA enriquecidos: dataset Parquet o .csv (default: {" o ".join(OA_DATASET_CANDIDATES)})')
+    parser.add_argument('--out', default=str(DEFAULT_INDEX), help='Índice JSON de salida')
+    parser.add_argument('--check', action='store_true', help='Solo verificar que --out esté al día (exit 1 si no)')
+    parser.add_argument('--query', metavar='OA_CODE', help='Consultar el índice de --out para un OA y salir')
+    parser.add_argument('--grade', help='Grado para --query (default: el del OA)')
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, help='Dificultad para --query (default: según complejidad del OA)')
+    parser.add_argument('--limit', type=int, default=3, help='Engines y skins por consulta (default: 3)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.query:
+        index = GameIndex.load(args.out)
+        start = time.perf_counter()
+        result = index.recommend(args.query, grade=args.grade, difficulty=args.difficulty, limit=args.limit)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+        if result['match'] is None:
+            print(f"❌ {args.query} no está en el índice")
+            return False
+        print(f"🎯 {args.query} ({result['match']}) en {elapsed_us:.0f} µs")
+        for engine in result['engines']:
+            print(f"   ⚡ {engine['engine_id']} {engine['code']}: {engine['name']}")
+        for skin in result['skins']:
+            print(f"   🎨 {skin['skin_id']} [{skin['difficulty']}, {skin['appeal_rating']}]: {skin['name']}")
+        return True
+
+    content = export_index(build_index(args.oa_dataset))
+    out = Path(args.out)
+
+    if args.check:
+        if not out.exists() or out.read_text(encoding='utf-8') != content:
+            logger.error(f"❌ {out} no está al día: ejecutar python oa_game_index.py")
+            return False
+        logger.info(f"✅ {out} al día")
+        return True
+
+    tmp = out.with_suffix('.tmp')
+    tmp.write_text(content, encoding='utf-8')
+    tmp.replace(out)
+    index = json.loads(content)
+    explicit = sum(entry['match'] == 'explicit' for entry in index['oa'].values())
+    logger.info(f"✅ Índice: {out} ({len(index['engines'])} engines, {len(index['skins'])} skins, "
+                f"{len(index['oa'])} OA, {explicit} con vínculo explícito, versión {index['version']})")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
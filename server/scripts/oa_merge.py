@@ -0,0 +1,138 @@
+"""
+Combinación de archivos parciales de OA con una regla explícita de duplicados
+Los scripts de combinación leían cada CSV en un loop y dejaban el primer oa_code
+que aparecía (drop_duplicates keep='first'), así que el orden de los archivos
+decidía en silencio qué versión quedaba. Aquí los CSV se leen en paralelo, se
+concatenan una sola vez y cada oa_code se resuelve con una regla declarada:
+
+    newest   → la versión con scraped_at más reciente
+    longest  → la descripción más larga (empate: la más reciente)
+    first    → la primera según el orden de los archivos (comportamiento anterior)
+
+Con cualquier regla, un empate se resuelve por orden de archivo y fila, así que
+el resultado es determinista. Los duplicados que difieren en algo más que
+scraped_at se reportan como conflictos (qué versión quedó, cuál se descartó y en
+qué columnas difieren).
+
+Uso:
+    frames, errors = read_partials(['oa_1b_6b_completo_todas_materias.csv', *sorted(glob('oa_completo_*.csv'))])
+    merged, conflicts, stats = merge_oa(frames, rule='newest')
+    write_conflict_report(conflicts, 'oa_merge_conflictos.csv')
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+KEY_COLUMN = 'oa_code'
+SOURCE_COLUMN = '_source'
+DEFAULT_RULE = 'newest'
+DEFAULT_WORKERS = 8
+
+# Columnas que no cuentan como conflicto: una re-extracción idéntica solo cambia la fecha
+CONFLICT_IGNORED_COLUMNS = ('scraped_at',)
+CONFLICT_REPORT_COLUMNS = [KEY_COLUMN, 'rule', 'kept_source', 'discarded_source', 'columns']
+
+def _scraped_at(df):
+    if 'scraped_at' not in df:
+        return pd.Series(pd.NaT, index=df.index)
+    return pd.to_datetime(df['scraped_at'], format='ISO8601', errors='coerce')
+
+def _desc_length(df):
+    if 'oa_desc' not in df:
+        return pd.Series(0, index=df.index)
+    return df['oa_desc'].fillna('').astype(str).str.len()
+
+# regla → columnas de prioridad (valor mayor gana), antes del orden de archivo y fila
+MERGE_RULES = {
+    'newest': lambda df: {'_newest': _scraped_at(df)},
+    'longest': lambda df: {'_longest': _desc_length(df), '_newest': _scraped_at(df)},
+    'first': lambda df: {},
+}
+
+def read_partials(paths, workers=DEFAULT_WORKERS):
+    """
+    Lee los CSV en paralelo (el parser de pandas libera el GIL). Retorna
+    ([(ruta, DataFrame)] en el orden de `paths`, sin los vacíos; [(ruta, error)])
+    """
+    def read(path):
+        try:
+            return path, pd.read_csv(path), None
+        except Exception as e:
+            return path, None, str(e)
+
+    frames, errors = [], []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for path, df, error in executor.map(read, paths):
+            if error is not None:
+                errors.append((path, error))
+            elif len(df) > 0:
+                frames.append((path, df))
+    return frames, errors
+
+def merge_oa(frames, rule=DEFAULT_RULE):
+    """
+    Combina [(fuente, DataFrame)] en un solo DataFrame con un oa_code por fila.
+    Retorna (combinado, conflictos, estadísticas); el combinado queda en el orden
+    de la primera aparición de cada oa_code
+    """
+    if rule not in MERGE_RULES:
+        raise ValueError(f"Regla de combinación desconocida: {rule} (disponibles: {', '.join(MERGE_RULES)})")
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame(columns=CONFLICT_REPORT_COLUMNS), \
+               {'rows': 0, 'unique': 0, 'duplicates': 0, 'conflicts': 0}
+
+    # Un solo concat: costo lineal en el total de filas, no en archivos × filas
+    combined = pd.concat([df.assign(**{SOURCE_COLUMN: source}) for source, df in frames], ignore_index=True)
+    columns = [col for col in combined.columns if col != SOURCE_COLUMN]
+
+    priority = MERGE_RULES[rule](combined)
+    first_seen = combined.groupby(KEY_COLUMN, sort=False, dropna=False).ngroup()
+    ranked = combined.assign(**priority)
+    if priority:
+        # sort estable: a igual prioridad conserva el orden de archivo y fila
+        ranked = ranked.sort_values(list(priority), ascending=False, kind='stable', na_position='last')
+
+    duplicated = ranked.duplicated(subset=[KEY_COLUMN], keep='first')
+    winners = ranked[~duplicated]
+    discarded = ranked[duplicated]
+    merged = winners.iloc[first_seen[winners.index].argsort(kind='stable')][columns].reset_index(drop=True)
+
+    conflicts = _conflicts(winners, discarded, columns, rule)
+    stats = {
+        'rows': len(combined),
+        'unique': len(merged),
+        'duplicates': len(discarded),
+        'conflicts': len(conflicts),
+    }
+    return merged, conflicts, stats
+
+def _conflicts(winners, discarded, columns, rule):
+    """Versiones descartadas que difieren de la elegida fuera de CONFLICT_IGNORED_COLUMNS"""
+    compared = [col for col in columns if col != KEY_COLUMN and col not in CONFLICT_IGNORED_COLUMNS]
+    kept = winners.set_index(KEY_COLUMN).loc[discarded[KEY_COLUMN]]
+
+    differs = pd.DataFrame(index=range(len(discarded)))
+    for col in compared:
+        a = discarded[col].reset_index(drop=True)
+        b = kept[col].reset_index(drop=True)
+        differs[col] = (a != b) & ~(a.isna() & b.isna())
+
+    mask = differs.any(axis=1).to_numpy() if compared else []
+    if not any(mask):
+        return pd.DataFrame(columns=CONFLICT_REPORT_COLUMNS)
+
+    rows = differs[mask]
+    return pd.DataFrame({
+        KEY_COLUMN: discarded[KEY_COLUMN].to_numpy()[mask],
+        'rule': rule,
+        'kept_source': kept[SOURCE_COLUMN].to_numpy()[mask],
+        'discarded_source': discarded[SOURCE_COLUMN].to_numpy()[mask],
+        'columns': [';'.join(col for col in compared if row[col]) for _, row in rows.iterrows()],
+    }).sort_values(KEY_COLUMN, kind='stable').reset_index(drop=True)
+
+def write_conflict_report(conflicts, path):
+    """Escribe el reporte de conflictos (vacío, solo encabezados, si no hubo)"""
+    conflicts.to_csv(path, index=False, encoding='utf-8')
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Tablas de referencia del enriquecimiento compiladas en un artefacto binario
+verb_bloom.csv y cognitive_skills.csv se compilan una vez (build) en
+../datasets/oa_reference.pkl: verbos → nivel Bloom y confianza, la tabla de
+lemas (formas conjugadas → nivel), las habilidades cognitivas y el autómata de
+keywords. enrich_oa.py y load_847_oa_to_supabase.py cargan ese artefacto en
+milisegundos en vez de parsear los CSV con pandas y reconstruir los índices, y
+así aplican exactamente las mismas tablas.
+
+El artefacto lleva un formato versionado, el SHA-256 de su contenido y el hash
+de sus fuentes (los dos CSV y el código que los compila). Si las fuentes
+cambiaron y no se re-compiló, load_reference avisa y compila en memoria: un
+artefacto desactualizado nunca se usa. Es un pickle: solo cargar artefactos
+generados por este script.
+
+Uso:
+    python oa_reference.py                     # compilar ../datasets/oa_reference.pkl
+    python oa_reference.py --check             # exit 1 si el artefacto no está al día (CI)
+
+    reference = load_reference()
+    reference['bloom_lemmas'].get('identifican')   # ('Recordar', None)
+"""
+
+import argparse
+import hashlib
+import logging
+import pickle
+import sys
+from pathlib import Path
+
+from keyword_automaton import KeywordAutomaton
+from lazy_imports import lazy_import
+from spanish_verbs import build_lemma_table, normalize_text, tokenize
+
+pd = lazy_import('pandas')
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FORMAT = 1
+SCRIPTS_DIR = Path(__file__).resolve().parent
+DATASETS_DIR = SCRIPTS_DIR.parent / 'datasets'
+DEFAULT_ARTIFACT = DATASETS_DIR / 'oa_reference.pkl'
+
+# Código que define cómo se compilan las tablas: si cambia, el artefacto queda desactualizado
+COMPILER_MODULES = ['oa_reference.py', 'spanish_verbs.py', 'keyword_automaton.py']
+
+# Niveles Bloom en orden de desempate (ante igual puntaje gana el primero)
+BLOOM_LEVELS = ['Recordar', 'Comprender', 'Aplicar', 'Analizar', 'Evaluar', 'Crear']
+
+# Heurística cuando ningún verbo de las primeras palabras está en el mapeo (en orden)
+BLOOM_FALLBACK_KEYWORDS = [
+    ('Crear', ['crear', 'diseñar', 'elaborar', 'construir']),
+    ('Evaluar', ['evaluar', 'juzgar', 'criticar', 'argumentar']),
+    ('Analizar', ['analizar', 'examinar', 'comparar']),
+    ('Aplicar', ['aplicar', 'usar', 'resolver', 'calcular']),
+    ('Comprender', ['explicar', 'interpretar', 'comprender']),
+]
+
+# Mapeos por defecto si no se encuentran los CSV
+DEFAULT_VERB_BLOOM = {
+    'recordar': 'Recordar', 'identificar': 'Recordar', 'nombrar': 'Recordar',
+    'listar': 'Recordar', 'reconocer': 'Recordar', 'mencionar': 'Recordar',
+    'describir': 'Comprender', 'explicar': 'Comprender', 'interpretar': 'Comprender',
+    'resumir': 'Comprender', 'clasificar': 'Comprender', 'comparar': 'Comprender',
+    'aplicar': 'Aplicar', 'usar': 'Aplicar', 'utilizar': 'Aplicar',
+    'ejecutar': 'Aplicar', 'calcular': 'Aplicar', 'resolver': 'Aplicar',
+    'analizar': 'Analizar', 'examinar': 'Analizar', 'diferenciar': 'Analizar',
+    'organizar': 'Analizar', 'estructurar': 'Analizar', 'integrar': 'Analizar',
+    'evaluar': 'Evaluar', 'criticar': 'Evaluar', 'juzgar': 'Evaluar',
+    'verificar': 'Evaluar', 'validar': 'Evaluar', 'argumentar': 'Evaluar',
+    'crear': 'Crear', 'generar': 'Crear', 'planificar': 'Crear',
+    'producir': 'Crear', 'diseñar': 'Crear', 'elaborar': 'Crear'
+}
+
+DEFAULT_COGNITIVE_SKILLS = {
+    'memoria_trabajo': {
+        'name': 'Memoria de Trabajo',
+        'keywords': ['retener', 'mantener', 'recordar'],
+        'subjects': ['MAT', 'LEN']
+    },
+    'razonamiento_logico': {
+        'name': 'Razonamiento Lógico',
+        'keywords': ['inferir', 'deducir', 'concluir', 'razonar'],
+        'subjects': ['MAT', 'CN']
+    },
+    'comp_verbal': {
+        'name': 'Comprensión Verbal',
+        'keywords': ['comprender', 'interpretar', 'entender', 'leer'],
+        'subjects': ['LEN', 'HIS']
+    }
+}
+
+# Confianza de un verbo sin columna confidence en verb_bloom.csv
+DEFAULT_CONFIDENCE = 0.5
+
+def find_source(filename):
+    """CSV de referencia en ../datasets o junto a los scripts (en ese orden), o None"""
+    for path in [DATASETS_DIR / filename, SCRIPTS_DIR / filename]:
+        if path.exists():
+            return path
+    return None
+
+def read_verb_bloom(path):
+    """verb_bloom.csv → ({verbo en minúsculas: nivel}, {verbo normalizado: confianza})"""
+    verb_df = pd.read_csv(path)
+    verbs = verb_df['verbo'].str.lower()
+    verb_bloom = dict(zip(verbs, verb_df['bloom_level']))
+    confidences = {}
+    if 'confidence' in verb_df:
+        confidences = {normalize_text(verb): float(conf) for verb, conf in zip(verbs, verb_df['confidence'])
+                       if isinstance(verb, str) and pd.notna(conf)}
+    return verb_bloom, confidences
+
+def read_cognitive_skills(path):
+    """cognitive_skills.csv → {skill_code: {name, keywords, subjects, description}}"""
+    skills_df = pd.read_csv(path)
+    skills = {}
+    for row in skills_df.to_dict('records'):
+        keywords = row['keywords'].strip('"').split(',')
+        subjects = [s.strip() for s in row['subject_affinity'].split(';')] if pd.notna(row['subject_affinity']) else []
+        skills[row['skill_code']] = {
+            'name': row['skill_name'],
+            'keywords': [k.strip() for k in keywords],
+            'subjects': subjects,
+            'description': row['description']
+        }
+    return skills
+
+def build_bloom_lemmas(verb_bloom):
+    """
+    Tabla forma conjugada → (nivel Bloom, rango de heurística) para puntuar
+    verbos en una sola pasada: 'reconocen', 'identificando' → su infinitivo
+    """
+    verb_levels = {}
+    for verb, level in verb_bloom.items():
+        if not isinstance(verb, str) or len(tokenize(verb)) != 1:
+            continue  # Comentarios del CSV (p. ej. '# Verbos específicos...')
+        if level not in BLOOM_LEVELS:
+            logger.warning(f"Nivel Bloom desconocido para '{verb}' en verb_bloom.csv: {level}")
+            continue
+        verb_levels[normalize_text(verb)] = level
+
+    fallback_ranks = {}
+    for rank, (_, keywords) in enumerate(BLOOM_FALLBACK_KEYWORDS):
+        for keyword in keywords:
+            fallback_ranks.setdefault(normalize_text(keyword), rank)
+
+    lemmas = build_lemma_table(list(verb_levels) + list(fallback_ranks))
+    bloom_lemmas = {
+        form: (verb_levels.get(infinitive), fallback_ranks.get(infinitive))
+        for form, infinitive in lemmas.items()
+    }
+    # Forma → (nivel, confianza) solo para los verbos con nivel (p. ej. el verbo principal en load_847)
+    verb_forms = {
+        form: (verb_levels[infinitive], infinitive)
+        for form, infinitive in lemmas.items() if infinitive in verb_levels
+    }
+    logger.info(f"Tabla de lemas Bloom: {len(bloom_lemmas)} formas de {len(set(lemmas.values()))} verbos")
+    return bloom_lemmas, verb_forms
+
+def build_skill_keyword_index(cognitive_skills):
+    """
+    Indexa todas las keywords de las habilidades en un autómata Aho–Corasick:
+    cada descripción se recorre una sola vez para todas las habilidades
+    """
+    skills = list(cognitive_skills.values())
+    automaton = KeywordAutomaton(keyword.lower() for skill in skills for keyword in skill['keywords'])
+
+    # Por keyword, las habilidades que suma (una vez por aparición en la lista de la habilidad)
+    keyword_ids = {keyword: keyword_id for keyword_id, keyword in enumerate(automaton.keywords)}
+    skill_ids = [[] for _ in automaton.keywords]
+    for skill_id, skill in enumerate(skills):
+        for keyword in skill['keywords']:
+            skill_ids[keyword_ids[keyword.lower()]].append(skill_id)
+
+    logger.info(f"Índice de keywords: {len(automaton)} keywords para {len(skills)} habilidades")
+    return automaton, skill_ids
+
+def source_hash(sources):
+    """Hash de los CSV de referencia (ruta → contenido) y del código que los compila"""
+    digest = hashlib.sha256(f'format={REFERENCE_FORMAT}'.encode())
+    for name, path in sorted(sources.items()):
+        digest.update(f'\0{name}\0'.encode())
+        digest.update(path.read_bytes() if path else b'<default>')
+    for module in COMPILER_MODULES:
+        digest.update(f'\0{module}\0'.encode())
+        digest.update((SCRIPTS_DIR / module).read_bytes())
+    return digest.hexdigest()
+
+def reference_sources():
+    return {'verb_bloom': find_source('verb_bloom.csv'), 'cognitive_skills': find_source('cognitive_skills.csv')}
+
+def compile_reference(sources=None):
+    """Compila las tablas desde los CSV (o los mapeos por defecto si faltan o no se pueden leer)"""
+    sources = sources or reference_sources()
+    confidences = {}
+    try:
+        if sources['verb_bloom']:
+            verb_bloom, confidences = read_verb_bloom(sources['verb_bloom'])
+            logger.info(f"Cargados {len(verb_bloom)} verbos → Bloom")
+        else:
+            logger.warning("No se encontró verb_bloom.csv, usando mapeo por defecto")
+            verb_bloom = dict(DEFAULT_VERB_BLOOM)
+
+        if sources['cognitive_skills']:
+            cognitive_skills = read_cognitive_skills(sources['cognitive_skills'])
+            logger.info(f"Cargadas {len(cognitive_skills)} habilidades cognitivas")
+        else:
+            logger.warning("No se encontró cognitive_skills.csv, usando mapeo por defecto")
+            cognitive_skills = dict(DEFAULT_COGNITIVE_SKILLS)
+    except Exception as e:
+        logger.error(f"Error cargando datos de referencia: {e}")
+        logger.info("Usando mapeos por defecto...")
+        verb_bloom, confidences = dict(DEFAULT_VERB_BLOOM), {}
+        cognitive_skills = dict(DEFAULT_COGNITIVE_SKILLS)
+
+    bloom_lemmas, verb_forms = build_bloom_lemmas(verb_bloom)
+    return {
+        'format': REFERENCE_FORMAT,
+        'source_hash': source_hash(sources),
+        'sources': {name: path.name if path else None for name, path in sources.items()},
+        'verb_bloom': verb_bloom,
+        'bloom_lemmas': bloom_lemmas,
+        'verb_table': {
+            form: (level, confidences.get(infinitive, DEFAULT_CONFIDENCE))
+            for form, (level, infinitive) in verb_forms.items()
+        },
+        'cognitive_skills': cognitive_skills,
+        'skill_keyword_index': build_skill_keyword_index(cognitive_skills),
+    }
+
+def save_reference(reference, path=DEFAULT_ARTIFACT):
+    """Escribe el artefacto: sobre con formato, hashes y las tablas serializadas"""
+    payload = pickle.dumps(reference, protocol=4)
+    envelope = {
+        'format': REFERENCE_FORMAT,
+        'source_hash': reference['source_hash'],
+        'sha256': hashlib.sha256(payload).hexdigest(),
+        'payload': payload,
+    }
+    path = Path(path)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(envelope, f, protocol=4)
+    tmp.replace(path)
+    return envelope['sha256']
+
+def artifact_status(path=DEFAULT_ARTIFACT, sources=None):
+    """(sobre, None) si el artefacto está al día, o (None, motivo) si no se puede usar"""
+    path = Path(path)
+    if not path.exists():
+        return None, f"no existe {path.name}"
+    with open(path, 'rb') as f:
+        envelope = pickle.load(f)
+    if envelope.get('format') != REFERENCE_FORMAT:
+        return None, f"formato {envelope.get('format')} (se espera {REFERENCE_FORMAT})"
+    if hashlib.sha256(envelope['payload']).hexdigest() != envelope['sha256']:
+        return None, "contenido corrupto (SHA-256 no coincide)"
+    if envelope['source_hash'] != source_hash(sources or reference_sources()):
+        return None, "las fuentes cambiaron desde el último build"
+    return envelope, None
+
+def load_reference(path=DEFAULT_ARTIFACT):
+    """
+    Tablas de referencia desde el artefacto. Si falta o está desactualizado se
+    compilan en memoria (con una advertencia para re-ejecutar oa_reference.py)
+    """
+    sources = reference_sources()
+    envelope, problem = artifact_status(path, sources)
+    if envelope is None:
+        logger.warning(f"Artefacto de referencia no utilizable ({problem}): compilando desde los CSV. "
+                       f"Ejecutar: python oa_reference.py")
+        return compile_reference(sources)
+    reference = pickle.loads(envelope['payload'])
+    logger.info(f"Referencia cargada de {Path(path).name} ({envelope['sha256'][:12]})")
+    return reference
+
+def main():
+    """Compila (o verifica) el artefacto de referencia"""
+
+    parser = argparse.ArgumentParser(description='Compila verb_bloom.csv y cognitive_skills.csv en un artefacto binario')
+    parser.add_argument('--out', default=str(DEFAULT_ARTIFACT), help='Artefacto de salida')
+    parser.add_argument('--check', action='store_true', help='Solo verificar que el artefacto esté al día (exit 1 si no)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.check:
+        envelope, problem = artifact_status(args.out)
+        if envelope is None:
+            logger.error(f"❌ {args.out}: {problem}")
+            return False
+        logger.info(f"✅ {args.out} al día ({envelope['sha256'][:12]})")
+        return True
+
+    reference = compile_reference()
+    digest = save_reference(reference, args.out)
+    logger.info(f"✅ Artefacto de referencia: {args.out} ({digest[:12]}, fuentes {reference['source_hash'][:12]})")
+    return True
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
@@ -0,0 +1,46 @@
+"""
+Procesamiento por trozos en un pool de procesos
+Compartido por enrich_oa.py (descripciones únicas en
+OAEnricher.enrich_dataframe) y load_847_oa_to_supabase.py (filas del
+DataFrame): el enriquecimiento es Python puro (tokenizar, buscar lemas,
+recorrer el autómata de keywords), así que los threads no ganan nada por el GIL
+y se reparte en procesos.
+
+La entrada (DataFrame, array o lista) se corta en trozos contiguos de
+`chunk_size` elementos y `executor.map` devuelve los resultados en el orden de
+los trozos, así que concatenarlos conserva el orden de entrada. Las tablas de
+referencia se pasan una sola vez por worker con `initializer`/`initargs` (con
+fork se heredan sin serializar), no con cada trozo.
+
+Uso:
+    parts = map_chunks(enrich_chunk, df, workers=4, initializer=init_worker, initargs=(tables,))
+    enriched = [record for part in parts for record in part]
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CHUNK_SIZE = 2000
+
+def resolve_workers(workers):
+    """workers <= 0 → un proceso por núcleo disponible"""
+    if workers is None or workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+def row_chunks(n_rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Rangos [inicio, fin) contiguos que cubren n_rows filas"""
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size debe ser >= 1: {chunk_size}")
+    return [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+def map_chunks(func, items, workers, chunk_size=DEFAULT_CHUNK_SIZE, initializer=None, initargs=()):
+    """
+    Aplica `func` (función de módulo, serializable) a cada trozo de `items` en un
+    pool de `workers` procesos. Retorna la lista de resultados en el orden de los trozos
+    """
+    rows = items.iloc if hasattr(items, 'iloc') else items
+    chunks = [rows[start:stop] for start, stop in row_chunks(len(items), chunk_size)]
+    workers = min(resolve_workers(workers), len(chunks)) or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, chunks))
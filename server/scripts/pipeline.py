@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Pipeline OA completo en un solo comando: etapas con entradas y salidas explícitas
+Cada etapa ejecuta uno de los scripts del pipeline (oa_reference,
+combinar_final_completo, load_847_oa_to_supabase, create_6_engines_basicos,
+create_90_skins_mat_len, ...; con --scrape, scrape_oa y oa_diff; con --db-url,
+el seed de load_to_supabase) y declara los archivos que lee y escribe. Las
+dependencias entre etapas salen de esas declaraciones: una etapa depende de las
+que producen alguna de sus entradas, y las etapas independientes corren en paralelo.
+
+Una etapa se omite (caché) si no cambió el hash de su código (el script y los
+módulos locales que importa), el hash del contenido de sus entradas ni sus
+argumentos, y sus salidas siguen en disco. El estado queda en .pipeline/state.json
+y la salida de cada etapa en .pipeline/logs/<etapa>.log.
+
+Uso:
+    python pipeline.py                                  # todas las etapas (sin scraping ni seed)
+    python pipeline.py --scrape                         # + scrape de MINEDUC → delta → SQL del delta
+    python pipeline.py --plan                           # oleadas y qué etapas están al día
+    python pipeline.py --stages load_sql skins          # etapas pedidas + sus dependencias
+    python pipeline.py --db-url $SUPABASE_DB_URL        # incluye el seed en Supabase
+    python pipeline.py --force                          # re-ejecutar aunque estén al día
+"""
+
+import argparse
+import ast
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from task_graph import resolve, run_graph, waves
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+STATE_DIR = SCRIPTS_DIR / '.pipeline'
+STATE_FILE = STATE_DIR / 'state.json'
+LOG_DIR = STATE_DIR / 'logs'
+DEFAULT_WORKERS = 4
+
+class Stage:
+    """Etapa del pipeline: script + argumentos, con entradas y salidas relativas a scripts/"""
+
+    def __init__(self, name, script, args=(), inputs=(), outputs=(), volatile=False, env=None):
+        self.name = name
+        self.script = script
+        self.args = list(args)
+        self.inputs = list(inputs)        # archivos, directorios o patrones glob
+        self.outputs = list(outputs)      # archivos o datasets (directorios)
+        self.volatile = volatile          # depende de datos externos: nunca se da por al día
+        self.env = env or {}              # variables extra; entran al hash pero no al estado en claro
+
+    def command(self):
+        return [sys.executable, self.script] + self.args
+
+def build_stages(db_url=None, scrape=False):
+    """Etapas del pipeline en orden de ejecución manual"""
+    stages = [
+        Stage('reference', 'oa_reference.py',
+              inputs=['../datasets/verb_bloom.csv', '../datasets/cognitive_skills.csv'],
+              outputs=['../datasets/oa_reference.pkl']),
+        # combinar_final_completo.py tiene sus archivos fijos en el código
+        Stage('combine', 'combinar_final_completo.py', ['--rule', 'newest', '--conflicts-out', 'oa_merge_conflictos.csv'],
+              inputs=['oa_1b_6b_completo_todas_materias.csv', 'oa_completo_*.csv', 'oa_*_todos_grados.csv'],
+              outputs=['oa_1b_6b_COMPLETO_FINAL_CORREGIDO.csv', 'oa_merge_conflictos.csv']),
+        Stage('load_sql', 'load_847_oa_to_supabase.py',
+              ['--input', 'oa_1b_6b_COMPLETO_FINAL_CORREGIDO.csv',
+               '--sql-out', 'oa_847_completos_supabase.sql',
+               '--enriched-out', 'oa_847_completos_enriquecidos.parquet'],
+              inputs=['oa_1b_6b_COMPLETO_FINAL_CORREGIDO.csv', '../datasets/oa_reference.pkl'],
+              outputs=['oa_847_completos_supabase.sql', 'oa_847_completos_enriquecidos.parquet']),
+        # Las specs de engines y skins están en el código: el hash de los módulos importados las cubre
+        Stage('game_index', 'oa_game_index.py', ['--oa-dataset', 'oa_847_completos_enriquecidos.parquet'],
+              inputs=['oa_847_completos_enriquecidos.parquet'],
+              outputs=['../datasets/oa_game_index.json']),
+        Stage('engines', 'create_6_engines_basicos.py',
+              outputs=['engines_6_basicos_supabase.sql', 'engines_6_basicos_config.json',
+                       'engines_roadmap_implementacion.json']),
+        Stage('skins', 'create_90_skins_mat_len.py',
+              outputs=['skins_90_completos_supabase.sql', 'skins_90_completos_catalogo.json']),
+        # Sin archivos fuente solo se generan layouts y manifest
+        Stage('skin_assets', 'build_skin_assets.py', ['--out-dir', 'skin_assets'],
+              inputs=['../assets/skins'] if (SCRIPTS_DIR / '../assets/skins').is_dir() else [],
+              outputs=['skin_assets']),
+        Stage('question_banks', 'build_question_banks.py', ['--out', 'question_banks.npz'],
+              outputs=['question_banks.npz']),
+    ]
+    if scrape:
+        # Scraping MINEDUC: depende de la red, se ejecuta siempre. Si el resultado no
+        # cambia, diff queda al día por contenido. load_delta enriquece el delta y
+        # genera su SQL; un delta vacío no escribe archivos, así que no declara salidas
+        stages += [
+            Stage('scrape', 'scrape_oa.py', ['--full-scrape', '--out', 'oa_raw.parquet'],
+                  outputs=['oa_raw.parquet'], volatile=True),
+            Stage('diff', 'oa_diff.py', ['--input', 'oa_raw.parquet', '--snapshot', 'oa_snapshot.json',
+                                         '--out', 'oa_delta.parquet'],
+                  inputs=['oa_raw.parquet'],
+                  outputs=['oa_delta.parquet', 'oa_snapshot.json']),
+            Stage('load_delta', 'load_847_oa_to_supabase.py',
+                  ['--input', 'oa_delta.parquet', '--sql-out', 'oa_delta_supabase.sql',
+                   '--enriched-out', 'oa_delta_enriquecidos.parquet'],
+                  inputs=['oa_delta.parquet', '../datasets/oa_reference.pkl']),
+        ]
+    if db_url:
+        stages.append(Stage('seed', 'load_to_supabase.py',
+                            ['--oa-dataset', 'oa_847_completos_enriquecidos.parquet'],
+                            inputs=['oa_847_completos_enriquecidos.parquet'],
+                            env={'SUPABASE_DB_URL': db_url}))
+    return {stage.name: stage for stage in stages}
+
+def _expand(pattern):
+    """Archivos que cubre una entrada (glob, directorio o archivo), relativos a scripts/"""
+    if glob.has_magic(pattern):
+        paths = sorted(glob.glob(pattern, root_dir=SCRIPTS_DIR))
+    else:
+        paths = [pattern]
+    files = []
+    for rel in paths:
+        path = SCRIPTS_DIR / rel
+        if path.is_dir():
+            files.extend(sorted(str(p.relative_to(SCRIPTS_DIR)) for p in path.rglob('*') if p.is_file()))
+        else:
+            files.append(rel)
+    return files
+
+def stage_dependencies(stages):
+    """{etapa: etapas que producen alguna de sus entradas}"""
+    producers = {}
+    for stage in stages.values():
+        for output in stage.outputs:
+            producers[os.path.normpath(output)] = stage.name
+
+    deps = {}
+    for stage in stages.values():
+        found = []
+        for pattern in stage.inputs:
+            for output, producer in producers.items():
+                matches = fnmatch.fnmatch(output, os.path.normpath(pattern)) if glob.has_magic(pattern) \
+                          else output == os.path.normpath(pattern)
+                if matches and producer != stage.name and producer not in found:
+                    found.append(producer)
+        deps[stage.name] = tuple(found)
+    return deps
+
+def _hash_file(path, digest):
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+
+def _local_imports(path):
+    """Módulos de scripts/ importados por un script"""
+    tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split('.')[0])
+    return sorted(name for name in names if (SCRIPTS_DIR / f'{name}.py').exists())
+
+def code_hash(script):
+    """Hash del script y, recursivamente, de los módulos locales que importa"""
+    digest = hashlib.sha256()
+    pending = [Path(script).stem]
+    seen = set()
+    while pending:
+        module = pending.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        path = SCRIPTS_DIR / f'{module}.py'
+        pending.extend(_local_imports(path))
+    for module in sorted(seen):
+        digest.update(module.encode() + b'\0')
+        _hash_file(SCRIPTS_DIR / f'{module}.py', digest)
+    return digest.hexdigest()
+
+def inputs_hash(stage):
+    """Hash del contenido de las entradas (una entrada inexistente también cuenta)"""
+    digest = hashlib.sha256()
+    for pattern in stage.inputs:
+        digest.update(pattern.encode() + b'\0')
+        for rel in _expand(pattern):
+            path = SCRIPTS_DIR / rel
+            digest.update(rel.encode() + b'\0')
+            if path.is_file():
+                _hash_file(path, digest)
+            else:
+                digest.update(b'<missing>')
+    return digest.hexdigest()
+
+def stage_key(stage):
+    """Clave de caché: código + entradas + argumentos + entorno extra"""
+    params = json.dumps({'args': stage.args, 'env': sorted(stage.env.items())}, sort_keys=True)
+    digest = hashlib.sha256()
+    for part in (code_hash(stage.script), inputs_hash(stage), params):
+        digest.update(part.encode() + b'\0')
+    return digest.hexdigest()
+
+def outputs_present(stage):
+    return all((SCRIPTS_DIR / output).exists() for output in stage.outputs)
+
+def is_up_to_date(stage, state):
+    if stage.volatile:
+        return False
+    return state.get(stage.name, {}).get('key') == stage_key(stage) and outputs_present(stage)
+
+def load_state():
+    if STATE_FILE.exists():
+        with open(STATE_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def save_state(state):
+    STATE_DIR.mkdir(exist_ok=True)
+    tmp = STATE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    tmp.replace(STATE_FILE)
+
+def _log_summary(log_file, lines=20):
+    """Línea de error más reciente del log de una etapa (o su última línea)"""
+    with open(log_file, encoding='utf-8', errors='replace') as f:
+        tail = [line.strip() for line in f.readlines()[-lines:] if line.strip()]
+    errors = [line for line in tail if '❌' in line or 'Error' in line]
+    return (errors or tail or ['sin salida'])[-1]
+
+def run_pipeline(stages, tasks, force=False, workers=DEFAULT_WORKERS):
+    """
+    Ejecuta las etapas respetando dependencias; las que están al día se omiten.
+    El estado se guarda al terminar cada etapa. Retorna {etapa: (estado, segundos, resumen)}
+    """
+    deps = stage_dependencies(stages)
+    state = load_state()
+    lock = threading.Lock()
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    def run_stage(name):
+        stage = stages[name]
+        # La clave se calcula recién aquí: las entradas pueden venir de una etapa recién ejecutada
+        key = None if stage.volatile else stage_key(stage)
+        with lock:
+            previous = state.get(name, {})
+        if not force and key is not None and previous.get('key') == key and outputs_present(stage):
+            return 'cached', f"al día desde {previous.get('finished_at', '?')}"
+
+        log_file = LOG_DIR / f'{name}.log'
+        with open(log_file, 'w', encoding='utf-8') as log:
+            completed = subprocess.run(stage.command(), cwd=SCRIPTS_DIR, stdout=log, stderr=subprocess.STDOUT,
+                                       env={**os.environ, 'PYTHONUNBUFFERED': '1', **stage.env})
+        if completed.returncode != 0:
+            return 'error', f"exit {completed.returncode}: {_log_summary(log_file)} (ver {log_file.relative_to(SCRIPTS_DIR)})"
+        missing = [output for output in stage.outputs if not (SCRIPTS_DIR / output).exists()]
+        if missing:
+            return 'error', f"no generó {', '.join(missing)}"
+
+        with lock:
+            # volatile: se guarda la clave igual, para --plan; nunca se usa para omitir
+            state[name] = {'key': key or stage_key(stage), 'finished_at': datetime.now().isoformat(timespec='seconds')}
+            save_state(state)
+        return 'ok', ', '.join(stage.outputs) or 'sin salidas en disco'
+
+    return run_graph(deps, run_stage, tasks, workers=workers)
+
+def main():
+    """Ejecuta el pipeline por etapas, con caché por contenido y tiempos por etapa"""
+
+    parser = argparse.ArgumentParser(description='Pipeline OA por etapas con caché por hash de código y entradas')
+    parser.add_argument('--stages', nargs='+', help='Etapas a ejecutar (se agregan sus dependencias; default: todas)')
+    parser.add_argument('--scrape', action='store_true',
+                        help='Agregar scrape de MINEDUC (red), delta contra el snapshot y SQL del delta')
+    parser.add_argument('--db-url', default=None,
+                        help='Agregar la etapa seed (load_to_supabase.py) contra esta conexión Postgres')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Etapas en paralelo (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--force', action='store_true', help='Ejecutar las etapas aunque estén al día')
+    parser.add_argument('--plan', action='store_true', help='Mostrar oleadas y etapas al día, sin ejecutar')
+    args = parser.parse_args()
+
+    stages = build_stages(args.db_url, scrape=args.scrape)
+    deps = stage_dependencies(stages)
+    unknown = [name for name in args.stages or [] if name not in stages]
+    if unknown:
+        print(f"❌ Error: etapas desconocidas: {', '.join(unknown)} (disponibles: {', '.join(stages)})")
+        return False
+    tasks = resolve(deps, args.stages)
+
+    print("🔄 === PIPELINE OA POR ETAPAS ===")
+    print(f"⏰ Inicio: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    state = load_state()
+    for i, wave in enumerate(waves(deps, tasks), 1):
+        print(f"   Oleada {i}: {', '.join(wave)}")
+    print()
+
+    if args.plan:
+        # Una etapa al día cuyo productor se va a ejecutar puede quedar desactualizada
+        pending = set()
+        for name in tasks:
+            stage = stages[name]
+            if args.force or not is_up_to_date(stage, state):
+                status = '🔁 se ejecuta' + (' (siempre: datos externos)' if stage.volatile else '')
+                pending.add(name)
+            elif any(dep in pending for dep in deps[name]):
+                status = '❔ al día, salvo que cambien las salidas de ' + ', '.join(dep for dep in deps[name] if dep in pending)
+            else:
+                status = '💾 al día'
+            print(f"   {name:14s} {status}")
+        return True
+
+    start = time.perf_counter()
+    results = run_pipeline(stages, tasks, force=args.force, workers=args.workers)
+    wall = time.perf_counter() - start
+
+    icons = {'ok': '✅', 'cached': '💾', 'error': '❌', 'skipped': '⏭️'}
+    print("📊 === TIEMPOS POR ETAPA ===")
+    for name in tasks:
+        status, elapsed, summary = results[name]
+        print(f"   {icons[status]} {name:14s} {elapsed:7.2f}s  {summary}")
+    print()
+    executed = sum(1 for status, _, _ in results.values() if status == 'ok')
+    cached = sum(1 for status, _, _ in results.values() if status == 'cached')
+    print(f"⏱️  Total: {wall:.2f}s ({executed} ejecutadas, {cached} al día, "
+          f"suma secuencial: {sum(r[1] for r in results.values()):.2f}s, {args.workers} en paralelo)")
+
+    return all(status in ('ok', 'cached') for status, _, _ in results.values())
+
+if __name__ == "__main__":
+    success = main()
+    if not success:
+        sys.exit(1)
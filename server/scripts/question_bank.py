@@ -0,0 +1,308 @@
+"""
+Bancos de preguntas precalculados por engine × skin × dificultad
+Los `difficulty_scaling` de create_6_engines_basicos.py (rangos y pasos de
+ENG01, cantidad de ítems y operaciones de ENG02) se convierten aquí en ítems
+concretos, generados con NumPy de a un banco completo por vez y guardados en un
+.npz columnar. El backend sirve el ítem i de un banco sin generar nada por request.
+
+Cada banco tiene su propio generador aleatorio, derivado de la semilla base y de
+(engine, skin, dificultad): el mismo banco sale idéntico aunque cambie el resto
+del catálogo. Los valores que se deben cubrir (pasos de ENG01, operaciones de
+ENG02) se reparten por estratos, así que cada combinación aparece en todo banco
+con al menos tantos ítems como valores.
+
+Archivo (np.savez_compressed):
+    meta                  JSON: formato, semilla, ítems por banco, columnas y operaciones
+    banks.*               engine, skin, difficulty, offset, count (un registro por banco)
+    ENG01.*               start, step, hops, target: desde start, `hops` saltos de `step` llegan a target
+    ENG02.*               values (n × MAX_SORT_ITEMS, relleno -1), size, operation, answer
+
+Los engines de lenguaje y ciencias (ENG05-ENG09) escalan por listas de palabras,
+fonemas u organismos que todavía no existen como datos; no tienen generador.
+
+Uso:
+    banks = build_banks(skins, engines, items_per_bank=200, seed=2024)
+    save_banks('question_banks.npz', banks, engines, seed=2024, items_per_bank=200)
+    QuestionBank.load('question_banks.npz').item('SKIN_MAT_001', 'easy', 0)
+    problems, coverage = verify_banks(QuestionBank.load('question_banks.npz'), skins, engines)
+"""
+
+import hashlib
+import json
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+BANK_FORMAT = 1
+DEFAULT_ITEMS_PER_BANK = 200
+DEFAULT_SEED = 2024
+DIFFICULTIES = ('easy', 'medium', 'hard')
+
+# ENG02 no declara el rango de los números a ordenar: mismo rango que ENG01 por dificultad
+SORT_VALUE_RANGES = {'easy': (1, 20), 'medium': (1, 50), 'hard': (1, 100)}
+MAX_SORT_ITEMS = 12
+
+# Operación de ENG02 → criterio de la respuesta
+SORT_OPERATIONS = {
+    'sort_ascending': 'ascending',
+    'sort': 'ascending',
+    'complex_sort': 'descending',
+    'group_by_property': 'parity',
+    'multi_criteria': 'parity_then_ascending',
+}
+
+def bank_seed(seed, engine_id, skin_id, difficulty):
+    """Semilla de un banco: no depende de qué otros bancos se generen"""
+    digest = hashlib.sha256(f'{engine_id}:{skin_id}:{difficulty}'.encode('utf-8')).digest()
+    return np.random.SeedSequence([seed, int.from_bytes(digest[:8], 'little')])
+
+def stratified(rng, values, n):
+    """n valores de `values` repartidos en partes iguales y barajados"""
+    return rng.permutation(np.resize(np.asarray(values), n))
+
+def counter_limits(scaling, skin):
+    """(mínimo, máximo, pasos) de ENG01; el max_count de la skin acota el rango"""
+    low, high = scaling['range']
+    high = min(high, skin.get('gameplay_config', {}).get('max_count', high))
+    steps = [step for step in np.atleast_1d(scaling['step']).tolist() if step <= high - low]
+    return low, high, steps
+
+def counter_items(rng, n, scaling, skin, difficulty=None):
+    """ENG01: desde `start`, `hops` saltos de `step` sin pasarse del rango"""
+    low, high, steps = counter_limits(scaling, skin)
+    step = stratified(rng, steps, n)
+    hops = rng.integers(1, (high - low) // step + 1)
+    start = rng.integers(low, high - step * hops + 1)
+    return {
+        'start': start.astype(np.int16),
+        'step': step.astype(np.int16),
+        'hops': hops.astype(np.int16),
+        'target': (start + step * hops).astype(np.int16),
+    }
+
+def sort_limits(scaling, skin, difficulty):
+    """(mínimo, máximo, cantidad de números, operaciones) de ENG02"""
+    low, high = SORT_VALUE_RANGES[difficulty]
+    size = skin.get('gameplay_config', {}).get('max_items', scaling['items'])
+    return low, high, min(size, MAX_SORT_ITEMS, high - low + 1), scaling['operations']
+
+def sort_answer(values, criterion):
+    """Respuesta de cada fila: orden de los índices, o grupo (0 par, 1 impar)"""
+    if criterion == 'ascending':
+        return np.argsort(values, axis=1, kind='stable')
+    if criterion == 'descending':
+        return np.argsort(-values, axis=1, kind='stable')
+    if criterion == 'parity':
+        return values % 2
+    return np.lexsort((values, values % 2), axis=1)
+
+def sort_items(rng, n, scaling, skin, difficulty):
+    """ENG02: `size` números distintos del rango y una operación sobre ellos"""
+    low, high, size, operations = sort_limits(scaling, skin, difficulty)
+    for name in operations:
+        if name not in SORT_OPERATIONS:
+            raise ValueError(f"ENG02: operación sin generador: {name}")
+    # Muestra sin reemplazo por fila: las primeras `size` posiciones de una permutación aleatoria
+    values = rng.random((n, high - low + 1)).argsort(axis=1)[:, :size] + low
+    operation = stratified(rng, np.arange(len(operations)), n)
+    answer = np.empty((n, size), dtype=np.int64)
+    for index, name in enumerate(operations):
+        rows = operation == index
+        answer[rows] = sort_answer(values[rows], SORT_OPERATIONS[name])
+    padded_values = np.full((n, MAX_SORT_ITEMS), -1, dtype=np.int16)
+    padded_answer = np.full((n, MAX_SORT_ITEMS), -1, dtype=np.int8)
+    padded_values[:, :size] = values
+    padded_answer[:, :size] = answer
+    return {
+        'values': padded_values,
+        'size': np.full(n, size, dtype=np.int8),
+        'operation': operation.astype(np.int8),
+        'answer': padded_answer,
+    }
+
+# engine_id → generador (rng, n, scaling, skin, difficulty) → {columna: array}
+GENERATORS = {
+    'ENG01': counter_items,
+    'ENG02': sort_items,
+}
+
+def skin_difficulties(skin):
+    """Las skins adaptativas necesitan las tres dificultades; el resto, solo la suya"""
+    if skin.get('gameplay_config', {}).get('difficulty_adaptive'):
+        return list(DIFFICULTIES)
+    return [skin['difficulty']]
+
+def build_banks(skins, engines, items_per_bank=DEFAULT_ITEMS_PER_BANK, seed=DEFAULT_SEED):
+    """
+    Genera los bancos de las skins con engine soportado. Retorna
+    {engine_id: {'banks': [(skin_id, dificultad, offset, count)], 'columns': {columna: array}}}
+    """
+    scaling_by_engine = {engine['engine_id']: engine['difficulty_scaling'] for engine in engines}
+    parts = {}
+    for skin in skins:
+        engine_id = skin['engine_id']
+        if engine_id not in GENERATORS:
+            continue
+        for difficulty in skin_difficulties(skin):
+            rng = np.random.default_rng(bank_seed(seed, engine_id, skin['skin_id'], difficulty))
+            columns = GENERATORS[engine_id](rng, items_per_bank, scaling_by_engine[engine_id][difficulty], skin, difficulty)
+            parts.setdefault(engine_id, []).append((skin['skin_id'], difficulty, columns))
+
+    banks = {}
+    for engine_id, engine_parts in parts.items():
+        index, offset = [], 0
+        for skin_id, difficulty, columns in engine_parts:
+            count = len(next(iter(columns.values())))
+            index.append((skin_id, difficulty, offset, count))
+            offset += count
+        names = engine_parts[0][2].keys()
+        banks[engine_id] = {
+            'banks': index,
+            'columns': {name: np.concatenate([columns[name] for _, _, columns in engine_parts]) for name in names},
+        }
+    return banks
+
+def save_banks(path, banks, engines, seed, items_per_bank):
+    """Escribe los bancos en un .npz comprimido (ver docstring del módulo)"""
+    records = [(engine_id, skin_id, difficulty, offset, count)
+               for engine_id, data in sorted(banks.items())
+               for skin_id, difficulty, offset, count in data['banks']]
+    scaling_by_engine = {engine['engine_id']: engine['difficulty_scaling'] for engine in engines}
+    meta = {
+        'format': BANK_FORMAT,
+        'seed': seed,
+        'items_per_bank': items_per_bank,
+        'columns': {engine_id: list(data['columns']) for engine_id, data in sorted(banks.items())},
+        'difficulty_scaling': {engine_id: scaling_by_engine[engine_id] for engine_id in sorted(banks)},
+        'sort_operations': SORT_OPERATIONS,
+    }
+    arrays = {
+        'meta': np.array(json.dumps(meta, ensure_ascii=False, sort_keys=True)),
+        'banks.engine': np.array([r[0] for r in records], dtype='U8'),
+        'banks.skin': np.array([r[1] for r in records], dtype='U20'),
+        'banks.difficulty': np.array([r[2] for r in records], dtype='U8'),
+        'banks.offset': np.array([r[3] for r in records], dtype=np.int32),
+        'banks.count': np.array([r[4] for r in records], dtype=np.int32),
+    }
+    for engine_id, data in banks.items():
+        for name, column in data['columns'].items():
+            arrays[f'{engine_id}.{name}'] = column
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    return len(records)
+
+class QuestionBank:
+    """Bancos cargados desde el .npz: ítem i de (skin, dificultad) sin generar nada"""
+
+    def __init__(self, arrays):
+        """`arrays`: {nombre: array} con las claves del .npz"""
+        self.meta = json.loads(str(arrays['meta']))
+        self.columns = {key: value for key, value in arrays.items() if key != 'meta' and not key.startswith('banks.')}
+        self.index = {
+            (skin, difficulty): (engine, int(offset), int(count))
+            for engine, skin, difficulty, offset, count in zip(
+                arrays['banks.engine'].tolist(), arrays['banks.skin'].tolist(), arrays['banks.difficulty'].tolist(),
+                arrays['banks.offset'], arrays['banks.count'])
+        }
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def bank(self, skin_id, difficulty):
+        """(engine_id, {columna: array}) del banco completo"""
+        if (skin_id, difficulty) not in self.index:
+            raise KeyError(f"Sin banco para {skin_id} / {difficulty}")
+        engine_id, offset, count = self.index[(skin_id, difficulty)]
+        return engine_id, {name: self.columns[f'{engine_id}.{name}'][offset:offset + count]
+                           for name in self.meta['columns'][engine_id]}
+
+    def item(self, skin_id, difficulty, index):
+        """Ítem `index` del banco como dict (los arrays de ENG02 sin el relleno)"""
+        engine_id, columns = self.bank(skin_id, difficulty)
+        count = len(next(iter(columns.values())))
+        if not 0 <= index < count:
+            raise IndexError(f"{skin_id} / {difficulty}: ítem {index} fuera de 0..{count - 1}")
+        item = {name: column[index].tolist() for name, column in columns.items()}
+        if engine_id == 'ENG02':
+            size = item['size']
+            operations = self.meta['difficulty_scaling'][engine_id][difficulty]['operations']
+            item.update(values=item['values'][:size], answer=item['answer'][:size],
+                        operation=operations[item['operation']])
+        return {'engine_id': engine_id, **item}
+
+def verify_counter_bank(columns, scaling, skin):
+    """Problemas de un banco ENG01 y {paso: (ítems, valores de llegada distintos)}"""
+    low, high, steps = counter_limits(scaling, skin)
+    start, step, hops, target = (columns[name].astype(np.int64) for name in ('start', 'step', 'hops', 'target'))
+    problems = []
+    if (start < low).any() or (target > high).any():
+        problems.append(f"fuera del rango [{low}, {high}]")
+    if (hops < 1).any() or (target != start + step * hops).any():
+        problems.append("target != start + step × hops")
+    if not np.isin(step, steps).all():
+        problems.append(f"pasos fuera de {steps}")
+    coverage = {}
+    for value in steps:
+        rows = step == value
+        if not rows.any():
+            problems.append(f"sin ítems con paso {value}")
+        coverage[value] = (int(rows.sum()), len(np.unique(target[rows])))
+    return problems, coverage
+
+def verify_sort_bank(columns, scaling, skin, difficulty):
+    """Problemas de un banco ENG02 y {operación: (ítems, valores distintos usados)}"""
+    low, high, size, operations = sort_limits(scaling, skin, difficulty)
+    values = columns['values'].astype(np.int64)
+    answer = columns['answer'].astype(np.int64)
+    operation = columns['operation'].astype(np.int64)
+    problems = []
+    if (columns['size'] != size).any() or (values[:, size:] != -1).any() or (answer[:, size:] != -1).any():
+        problems.append(f"tamaño distinto de {size} o relleno inválido")
+    values, answer = values[:, :size], answer[:, :size]
+    if (values < low).any() or (values > high).any():
+        problems.append(f"fuera del rango [{low}, {high}]")
+    if (np.diff(np.sort(values, axis=1), axis=1) == 0).any():
+        problems.append("números repetidos en un ítem")
+    coverage = {}
+    for index, name in enumerate(operations):
+        rows = operation == index
+        if not rows.any():
+            problems.append(f"sin ítems con operación {name}")
+        elif (sort_answer(values[rows], SORT_OPERATIONS[name]) != answer[rows]).any():
+            problems.append(f"respuestas incorrectas en {name}")
+        coverage[name] = (int(rows.sum()), len(np.unique(values[rows])))
+    if ((operation < 0) | (operation >= len(operations))).any():
+        problems.append("operación desconocida")
+    return problems, coverage
+
+def verify_banks(bank, skins, engines):
+    """
+    Revisa cada banco contra la spec de su skin y engine. Retorna (problemas,
+    cobertura) con cobertura {(engine, dificultad, rango, paso u operación): [ítems, máximo de valores distintos]}
+    """
+    skins_by_id = {skin['skin_id']: skin for skin in skins}
+    scaling_by_engine = {engine['engine_id']: engine['difficulty_scaling'] for engine in engines}
+    problems, coverage = [], {}
+    for skin_id, difficulty in sorted(bank.index):
+        engine_id, columns = bank.bank(skin_id, difficulty)
+        skin = skins_by_id.get(skin_id)
+        if skin is None:
+            problems.append(f"{skin_id}: la skin no está en el catálogo")
+            continue
+        scaling = scaling_by_engine[engine_id][difficulty]
+        if engine_id == 'ENG01':
+            bank_problems, bank_coverage = verify_counter_bank(columns, scaling, skin)
+            low, high, _ = counter_limits(scaling, skin)
+        else:
+            bank_problems, bank_coverage = verify_sort_bank(columns, scaling, skin, difficulty)
+            low, high, _, _ = sort_limits(scaling, skin, difficulty)
+        problems.extend(f"{skin_id} / {difficulty}: {problem}" for problem in bank_problems)
+        for combination, (items, distinct) in bank_coverage.items():
+            entry = coverage.setdefault((engine_id, difficulty, f"{low}-{high}", combination), [0, 0])
+            entry[0] += items
+            entry[1] = max(entry[1], distinct)
+    return problems, coverage
+
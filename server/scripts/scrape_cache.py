@@ -0,0 +1,130 @@
+"""
+Caché HTTP en disco para el scraper de OA MINEDUC
+Guarda cada respuesta de curriculumnacional.cl una sola vez (direccionada por
+contenido) junto con su ETag/Last-Modified, y revalida con GET condicional.
+
+Estructura del directorio de caché:
+    <cache_dir>/index/<sha256(url)>.json     # metadatos por URL
+    <cache_dir>/objects/<ab>/<sha256>.html   # cuerpos, deduplicados por contenido
+
+Uso desde scrape_oa.py:
+    python scrape_oa.py --out oa_raw.csv                 # usa y actualiza la caché
+    python scrape_oa.py --from-cache --out oa_raw.csv    # replay offline, sin red
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = os.environ.get('OA_CACHE_DIR', '.oa_cache')
+
+class CacheMiss(Exception):
+    """
+    La URL no está en caché y el modo offline impide descargarla.
+    No hereda de requests.exceptions.RequestException para no importar requests
+    solo por definir la excepción; scrape_oa.py captura ambas
+    """
+
+class ResponseCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.index_dir = self.cache_dir / 'index'
+        self.objects_dir = self.cache_dir / 'objects'
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _sha256(data):
+        return hashlib.sha256(data).hexdigest()
+
+    def _index_path(self, url):
+        return self.index_dir / f"{self._sha256(url.encode('utf-8'))}.json"
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.html"
+
+    @staticmethod
+    def _atomic_write(path, data):
+        """Escribe vía archivo temporal + rename para tolerar workers concurrentes"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def lookup(self, url):
+        """Retorna la entrada de índice de `url`, o None si no hay cuerpo válido en caché"""
+        index_path = self._index_path(url)
+        if not index_path.exists():
+            return None
+
+        try:
+            entry = json.loads(index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+        if not self._object_path(entry['sha256']).exists():
+            return None
+        return entry
+
+    def read_body(self, entry):
+        return self._object_path(entry['sha256']).read_bytes()
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Headers para revalidar una entrada con GET condicional"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write_entry(self, entry):
+        data = json.dumps(entry, ensure_ascii=False, indent=2).encode('utf-8')
+        self._atomic_write(self._index_path(entry['url']), data)
+
+    def store(self, url, response):
+        """Guarda una respuesta 200 y retorna su entrada de índice"""
+        body = response.content
+        digest = self._sha256(body)
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            self._atomic_write(object_path, body)
+
+        now = datetime.now().isoformat()
+        entry = {
+            'url': url,
+            'sha256': digest,
+            'size': len(body),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'validated_at': now
+        }
+        self._write_entry(entry)
+        return entry
+
+    def mark_validated(self, entry):
+        """Registra que el servidor confirmó (304) que la entrada sigue vigente"""
+        entry = dict(entry, validated_at=datetime.now().isoformat())
+        self._write_entry(entry)
+        return entry
+
+    def iter_entries(self):
+        """Itera todas las entradas válidas de la caché"""
+        for index_path in sorted(self.index_dir.glob('*.json')):
+            try:
+                entry = json.loads(index_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            if self._object_path(entry['sha256']).exists():
+                yield entry
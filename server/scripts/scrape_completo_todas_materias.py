@@ -8,10 +8,15 @@ Versión: 1.2.0 - Completo y Correcto
 import sys
 import os
 import subprocess
-import time
+import logging
 import pandas as pd
 from datetime import datetime
 
+from scrape_oa import MinEducOAScraper
+
+# El scraper corre en este mismo proceso: solo mostrar sus advertencias
+logging.getLogger('scrape_oa').setLevel(logging.WARNING)
+
 def log_info(message):
     """Logger simple para el proceso"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -41,77 +46,50 @@ def get_subjects_by_grade():
         '6B': ['MAT', 'LEN', 'CN', 'HIS', 'EDF', 'ART', 'MUS', 'TEC', 'ORI', 'LPO', 'ING']   # Inglés desde 5°
     }
 
-def run_single_grade_scraper(grade, subjects, max_oa=50):
-    """Ejecuta el scraper para un grado específico con asignaturas seleccionadas"""
-    
-    output_file = f"oa_{grade.lower()}_todas_materias.csv"
+def run_all_grades_scraper(subjects_by_grade, max_oa=100):
+    """
+    Scrapea todas las combinaciones grado × asignatura en un solo proceso
+    y retorna los registros en memoria, agrupados por grado
+    """
     
-    # Construir comando
-    command = ["python", "scrape_oa.py"]
-    command.extend(["--grades", grade])
-    command.extend(["--subjects"] + subjects)
-    command.extend(["--max-oa", str(max_oa)])
-    command.extend(["--out", output_file])
-    command.append("--verbose")
+    total_pages = sum(len(subjects) for subjects in subjects_by_grade.values())
+    log_info(f"Procesando {total_pages} combinaciones grado × asignatura en un solo lote...")
     
-    log_info(f"Procesando grado {grade} con {len(subjects)} asignaturas...")
-    log_info(f"Asignaturas: {', '.join(subjects)}")
-    log_info(f"Comando: {' '.join(command)}")
+    scraper = MinEducOAScraper(max_oa_limit=max_oa)
     
+    records_by_grade = {grade: [] for grade in subjects_by_grade}
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=900)  # 15 min timeout
-        
-        if result.returncode == 0:
-            # Verificar que el archivo se creó y tiene contenido
-            if os.path.exists(output_file):
-                df = pd.read_csv(output_file)
-                count = len(df)
-                if count > 0:
-                    log_success(f"Grado {grade}: {count} OA extraídos - {output_file}")
-                    
-                    # Mostrar distribución por asignatura
-                    subject_dist = df['subject'].value_counts()
-                    for subj, cnt in subject_dist.items():
-                        log_info(f"   {subj}: {cnt} OA")
-                    
-                    return True, output_file, count
-                else:
-                    log_error(f"Grado {grade}: Archivo vacío")
-                    return False, None, 0
-            else:
-                log_error(f"Grado {grade}: Archivo no creado")
-                return False, None, 0
-        else:
-            log_error(f"Grado {grade}: Error en scraping")
-            log_error(f"STDERR: {result.stderr[:300]}...")
-            return False, None, 0
-            
-    except subprocess.TimeoutExpired:
-        log_error(f"Grado {grade}: Timeout (15 minutos)")
-        return False, None, 0
+        for record in scraper.scrape_batch(subjects_by_grade):
+            records_by_grade[record['grade']].append(record)
     except Exception as e:
-        log_error(f"Grado {grade}: Excepción - {e}")
-        return False, None, 0
+        log_error(f"Excepción en scraping: {e}")
+    finally:
+        scraper.close()
+    
+    for grade, records in records_by_grade.items():
+        if records:
+            log_success(f"Grado {grade}: {len(records)} OA extraídos")
+            
+            # Mostrar distribución por asignatura
+            subject_dist = pd.Series([r['subject'] for r in records]).value_counts()
+            for subj, cnt in subject_dist.items():
+                log_info(f"   {subj}: {cnt} OA")
+        else:
+            log_error(f"Grado {grade}: Sin OA extraídos")
+    
+    return records_by_grade
 
-def combine_all_files(file_list, output_name="oa_1b_6b_completo_todas_materias.csv"):
-    """Combina múltiples archivos CSV en uno solo con estadísticas detalladas"""
+def combine_all_records(records, output_name="oa_1b_6b_completo_todas_materias.csv"):
+    """Combina todos los registros en un solo CSV con estadísticas detalladas"""
     
-    if not file_list:
-        log_error("No hay archivos para combinar")
-        return False
+    if not records:
+        log_error("No hay registros para combinar")
+        return False, None
         
-    log_info(f"Combinando {len(file_list)} archivos...")
+    log_info(f"Combinando {len(records)} registros...")
     
     try:
-        combined_df = pd.DataFrame()
-        
-        for file in file_list:
-            if os.path.exists(file):
-                df = pd.read_csv(file)
-                combined_df = pd.concat([combined_df, df], ignore_index=True)
-                log_info(f"   📄 {file}: {len(df)} registros")
-            else:
-                log_error(f"   ❌ {file}: No encontrado")
+        combined_df = pd.DataFrame(records)
         
         # Eliminar duplicados basado en oa_code
         before_count = len(combined_df)
@@ -127,7 +105,7 @@ def combine_all_files(file_list, output_name="oa_1b_6b_completo_todas_materias.c
         return True, output_name
         
     except Exception as e:
-        log_error(f"Error combinando archivos: {e}")
+        log_error(f"Error combinando registros: {e}")
         return False, None
 
 def generate_comprehensive_summary(combined_file):
@@ -240,57 +218,40 @@ def main():
     
     max_oa_per_page = 100  # Aumentamos para capturar más OA
     
-    successful_files = []
-    total_oa_count = 0
-    failed_grades = []
+    # Todas las combinaciones en un solo proceso (sin subprocess ni CSV intermedios)
+    records_by_grade = run_all_grades_scraper(subjects_by_grade, max_oa=max_oa_per_page)
     
-    # Procesar grado por grado con sus asignaturas específicas
-    for i, grade in enumerate(all_grades, 1):
-        print(f"\n📚 GRADO {grade} ({i}/{len(all_grades)})")
-        print("-" * 50)
-        
-        grade_subjects = subjects_by_grade[grade]
-        
-        success, output_file, oa_count = run_single_grade_scraper(
-            grade=grade,
-            subjects=grade_subjects,
-            max_oa=max_oa_per_page
-        )
-        
-        if success:
-            successful_files.append(output_file)
-            total_oa_count += oa_count
-            log_success(f"Grado {grade} completado: {oa_count} OA")
+    all_records = []
+    successful_grades = []
+    failed_grades = []
+    for grade in all_grades:
+        if records_by_grade[grade]:
+            all_records.extend(records_by_grade[grade])
+            successful_grades.append(grade)
         else:
             failed_grades.append(grade)
-            log_error(f"Grado {grade} falló")
-        
-        # Pausa entre grados para evitar sobrecarga del servidor
-        if i < len(all_grades):
-            log_info("Pausa de 5 segundos...")
-            time.sleep(5)
     
     # Resumen del proceso individual
     print(f"\n📊 RESUMEN DEL PROCESO INDIVIDUAL")
     print("-" * 50)
-    log_success(f"Grados exitosos: {len(successful_files)}/{len(all_grades)}")
-    log_success(f"Total OA individuales: {total_oa_count}")
+    log_success(f"Grados exitosos: {len(successful_grades)}/{len(all_grades)}")
+    log_success(f"Total OA individuales: {len(all_records)}")
     
     if failed_grades:
         log_error(f"Grados fallidos: {', '.join(failed_grades)}")
     
-    if not successful_files:
+    if not all_records:
         log_error("No se procesó ningún grado exitosamente")
         return
     
-    # Combinar archivos
-    print(f"\n📁 COMBINANDO ARCHIVOS")
+    # Combinar registros
+    print(f"\n📁 COMBINANDO REGISTROS")
     print("-" * 50)
     
-    success, combined_file = combine_all_files(successful_files)
+    success, combined_file = combine_all_records(all_records)
     
     if not success:
-        log_error("Error combinando archivos")
+        log_error("Error combinando registros")
         return
     
     # Generar resumen estadístico
@@ -312,19 +273,6 @@ def main():
         log_error("Enriquecimiento falló, pero archivo base disponible")
         log_success(f"Archivo base: {combined_file}")
     
-    # Limpieza opcional
-    print(f"\n🧹 LIMPIEZA")
-    print("-" * 50)
-    
-    response = input("¿Eliminar archivos individuales por grado? (y/N): ").strip().lower()
-    if response == 'y':
-        for file in successful_files:
-            try:
-                os.remove(file)
-                log_info(f"Eliminado: {file}")
-            except:
-                log_error(f"No se pudo eliminar: {file}")
-    
     print(f"\n🎉 PROCESO COMPLETADO")
     print("=" * 70)
     print(f"⏰ Fin: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
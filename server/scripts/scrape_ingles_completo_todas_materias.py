@@ -12,6 +12,8 @@ import time
 import pandas as pd
 from datetime import datetime
 
+from oa_merge import DEFAULT_RULE, merge_oa, read_partials, write_conflict_report
+
 def log_info(message):
     """Logger simple"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -145,39 +147,22 @@ def main():
     # COMBINAR TODOS LOS ARCHIVOS NUEVOS CON LOS EXISTENTES
     log_info("🔄 Combinando todos los archivos...")
     
-    all_dataframes = []
-    
-    # Cargar archivo existente si existe
-    if os.path.exists(existing_file):
-        try:
-            existing_df = pd.read_csv(existing_file)
-            all_dataframes.append(existing_df)
-            log_info(f"📄 Cargados {len(existing_df)} registros existentes")
-        except Exception as e:
-            log_error(f"Error cargando archivo existente: {e}")
-    
-    # Cargar archivos nuevos
-    for file_path in all_files:
-        if os.path.exists(file_path):
-            try:
-                df = pd.read_csv(file_path)
-                all_dataframes.append(df)
-                log_info(f"📄 Cargado {file_path}: {len(df)} registros")
-            except Exception as e:
-                log_error(f"Error cargando {file_path}: {e}")
+    # Existente primero y luego los nuevos, leídos en paralelo
+    files = ([existing_file] if os.path.exists(existing_file) else []) + [f for f in all_files if os.path.exists(f)]
+    all_dataframes, errors = read_partials(files)
+    for file_path, df in all_dataframes:
+        log_info(f"📄 Cargado {file_path}: {len(df)} registros")
+    for file_path, error in errors:
+        log_error(f"Error cargando {file_path}: {error}")
     
-    # Combinar y eliminar duplicados
+    # Combinar y resolver duplicados con regla explícita
     if all_dataframes:
-        combined_df = pd.concat(all_dataframes, ignore_index=True)
-        
-        # Eliminar duplicados basado en código OA
-        initial_count = len(combined_df)
-        combined_df = combined_df.drop_duplicates(subset=['oa_code'], keep='first')
-        final_count = len(combined_df)
+        combined_df, conflicts, stats = merge_oa(all_dataframes, rule=DEFAULT_RULE)
+        final_count = stats['unique']
         
-        duplicates_removed = initial_count - final_count
-        if duplicates_removed > 0:
-            log_info(f"🔄 Duplicados eliminados: {duplicates_removed}")
+        if stats['duplicates'] > 0:
+            log_info(f"🔄 Duplicados resueltos ({DEFAULT_RULE}): {stats['duplicates']}, {stats['conflicts']} con contenido distinto")
+        write_conflict_report(conflicts, "oa_1b_6b_completo_todas_materias_final_conflictos.csv")
         
         # Guardar archivo final
         final_file = "oa_1b_6b_completo_todas_materias_final.csv"
@@ -0,0 +1,112 @@
+"""
+Journal de checkpoints para el scraper de OA MINEDUC
+Registra en un JSONL append-only el resultado de cada página grado × asignatura
+apenas termina, de modo que una corrida larga interrumpida (red, Ctrl+C) pueda
+retomarse con --resume sin volver a descargar las páginas ya procesadas.
+
+Formato (una línea por página procesada):
+    {"url": ..., "grade": "1B", "subject": "MAT", "status": "ok", "max_oa": 100, "records": [...], ...}
+    {"url": ..., "grade": "1B", "subject": "LEN", "status": "error", "max_oa": 100, "error": "...", ...}
+
+Una página con status "ok" y sin registros es una página vacía (no se reintenta);
+una con status "error" falló al descargarse o al parsearse y se reintenta al
+retomar. max_oa es el límite de OA por página de la corrida (null = sin límite):
+al retomar con otro --max-oa las páginas ya hechas se vuelven a procesar.
+
+Uso desde scrape_oa.py:
+    python scrape_oa.py --full-scrape --out oa_raw.csv            # escribe oa_raw.csv.journal.jsonl
+    python scrape_oa.py --full-scrape --out oa_raw.csv --resume   # retoma desde el journal
+
+Como biblioteca se usa con `with` (o close() en un finally) para cerrar el
+archivo también ante una interrupción:
+    with ScrapeJournal('oa_raw.csv.journal.jsonl') as journal:
+        journal.record('1B', 'MAT', url, records)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+class ScrapeJournal:
+    def __init__(self, path, resume=False, max_oa=None):
+        self.path = path
+        self.max_oa = max_oa
+        self._lock = threading.Lock()
+        self.failed = set()
+        # Páginas completadas con otro límite de OA por página (se vuelven a procesar)
+        self.stale = set()
+
+        # Páginas ya completadas en corridas anteriores: {url: registros}
+        self.completed = self._load() if resume else {}
+
+        # Sin --resume se parte de cero; con --resume se sigue agregando al final
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+        if resume and self._file.tell() > 0 and not self._ends_with_newline():
+            # La última línea quedó truncada por un corte: no pegarle la siguiente
+            self._file.write('\n')
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _load(self):
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Línea truncada por una interrupción
+
+                # Sin "max_oa" (journal anterior) el límite es desconocido: no se reutiliza
+                if entry.get('status') == 'ok' and entry.get('max_oa', 'unknown') == self.max_oa:
+                    completed[entry['url']] = entry['records']
+                    self.stale.discard(entry['url'])
+                else:
+                    completed.pop(entry['url'], None)
+                    if entry.get('status') == 'ok':
+                        self.stale.add(entry['url'])
+                    else:
+                        self.stale.discard(entry['url'])
+        return completed
+
+    def record(self, grade, subject, url, records, error=None):
+        """Registra el resultado de una página; seguro para llamar desde varios workers"""
+        entry = {
+            'url': url,
+            'grade': grade,
+            'subject': subject,
+            'status': 'error' if error else 'ok',
+            'max_oa': self.max_oa,
+            'records': records,
+            'finished_at': datetime.now().isoformat()
+        }
+        if error:
+            entry['error'] = error
+
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            if error:
+                self.failed.add(url)
+            else:
+                self.failed.discard(url)
+
+    def close(self):
+        """Cierra el archivo del journal; seguro de llamar más de una vez"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
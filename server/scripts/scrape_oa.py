@@ -1,25 +1,55 @@
 #!/usr/bin/env python3
 """
-Script de scraping OA MINEDUC → CSV
+Script de scraping OA MINEDUC → dataset Parquet (o CSV)
 Implementa el pipeline especificado en MODULO II - Planificación EDU21
 Actualizado para usar la estructura real del portal curriculumnacional.cl
 
 Uso:
-    pip install requests beautifulsoup4 pandas psycopg[binary]
-    python scrape_oa.py --year 2023 --out oa_raw.csv --max-oa 100
+    pip install -r requirements.txt
+    python scrape_oa.py --year 2023 --out oa_raw.parquet --max-oa 100
+
+    # Export CSV en vez del dataset particionado (ver oa_dataset.py)
+    python scrape_oa.py --out oa_raw.csv
+
+    # Descarga concurrente (8 workers, máximo 8 requests/segundo por host)
+    python scrape_oa.py --full-scrape --concurrency 8 --rps 8 --out oa_raw.parquet
+
+    # Replay offline desde la caché HTTP en disco (sin red)
+    python scrape_oa.py --from-cache --out oa_raw.parquet
+
+    # Retomar una corrida larga interrumpida (páginas ya hechas no se descargan)
+    python scrape_oa.py --full-scrape --out oa_raw.parquet --resume
+
+    # Verificar que el parser lxml extrae lo mismo que BeautifulSoup (páginas en caché)
+    python scrape_oa.py --verify-parsers
 """
 
-import requests
-import pandas as pd
 import argparse
 import time
 import logging
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 import re
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from lazy_imports import lazy_import, module_available
+from oa_dataset import write_oa
+from scrape_cache import DEFAULT_CACHE_DIR, CacheMiss, ResponseCache
+from scrape_journal import ScrapeJournal
+
+# Dependencias pesadas: se importan recién al descargar o parsear (no para --help)
+requests = lazy_import('requests')
+pd = lazy_import('pandas')
+bs4 = lazy_import('bs4')
+bs4_dammit = lazy_import('bs4.dammit')
+lxml_html = lazy_import('lxml.html')
+etree = lazy_import('lxml.etree')
+
+# Sin lxml se usa solo el backend BeautifulSoup
+LXML_AVAILABLE = module_available('lxml')
 
 # Configurar logging
 logging.basicConfig(
@@ -28,15 +58,203 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class HostRateLimiter:
+    """
+    Limitador de tasa por host, compartido entre todos los workers de descarga.
+    Reserva un "turno" por request de modo que nunca se superen
+    `requests_per_second` requests a un mismo host, sin importar la concurrencia.
+    """
+    def __init__(self, requests_per_second=1.0):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """Bloquea hasta que el host de `url` tenga un turno disponible"""
+        if not self.min_interval:
+            return
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+# Headers de objetivos: <h4>Objetivo de aprendizaje LE01OA 01</h4>
+OBJECTIVE_HEADER_RE = re.compile(r'Objetivo de aprendizaje.*', re.IGNORECASE)
+
+class BS4ParserBackend:
+    """
+    Backend de referencia: BeautifulSoup + html.parser.
+    Es el más lento, pero el único que soporta todos los métodos de extracción.
+    """
+    name = 'bs4'
+
+    def parse(self, content):
+        return bs4.BeautifulSoup(content, 'html.parser')
+
+    def objective_headers(self, doc):
+        return doc.find_all('h4', string=OBJECTIVE_HEADER_RE)
+
+    def text(self, node):
+        return node.get_text(strip=True)
+
+    def next_sibling_text(self, node):
+        """Texto del siguiente elemento hermano, o None si no hay"""
+        sibling = node.find_next_sibling()
+        return sibling.get_text(strip=True) if sibling else None
+
+    def next_paragraph_text(self, node):
+        """Texto del siguiente <p> en orden de documento (incluye descendientes), o None"""
+        paragraph = node.find_next('p')
+        return paragraph.get_text(strip=True) if paragraph else None
+
+class LxmlParserBackend:
+    """
+    Backend rápido con lxml: selecciona los headers con XPath sobre el árbol de libxml2.
+    Replica la semántica de BeautifulSoup usada por extract_oa_mineduc_structure
+    (.string, get_text(strip=True), find_next_sibling, find_next) para que la
+    extracción sea idéntica; se verifica con `scrape_oa.py --verify-parsers`.
+    """
+    name = 'lxml'
+
+    # html.parser asigna a estos tags un tipo de string propio, que get_text()
+    # solo incluye cuando se llama sobre un tag del mismo tipo
+    STRING_CONTAINERS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+
+    HEADERS_XPATH = ("//h4[contains(translate(string(.), 'OBJETIVO DE APRENDIZAJE', "
+                     "'objetivo de aprendizaje'), 'objetivo de aprendizaje')]")
+    NEXT_PARAGRAPH_XPATH = '(descendant::p | following::p)[1]'
+
+    def parse(self, content):
+        # Misma detección de encoding que BeautifulSoup
+        if isinstance(content, bytes):
+            content = bs4_dammit.UnicodeDammit(content, is_html=True).unicode_markup
+        try:
+            return lxml_html.document_fromstring(content)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"lxml no pudo parsear el documento: {e}")
+            return None
+
+    @staticmethod
+    def _is_element(node):
+        # Comentarios e instrucciones de procesamiento no tienen tag de tipo str
+        return isinstance(node.tag, str)
+
+    def _single_string(self, node):
+        """Equivalente a Tag.string de BeautifulSoup"""
+        contents = [node.text] if node.text else []
+        for child in node:
+            contents.append(child)
+            if child.tail:
+                contents.append(child.tail)
+
+        if len(contents) != 1:
+            return None
+        only = contents[0]
+        if isinstance(only, str):
+            return only
+        if not self._is_element(only):
+            return only.text or ''  # Comentario: BeautifulSoup lo expone como .string
+        return self._single_string(only)
+
+    def objective_headers(self, doc):
+        if doc is None:
+            return []
+        headers = []
+        for h4 in doc.xpath(self.HEADERS_XPATH):
+            string = self._single_string(h4)
+            if string is not None and OBJECTIVE_HEADER_RE.search(string):
+                headers.append(h4)
+        return headers
+
+    def _container(self, node):
+        """Tag contenedor más cercano que define el tipo de los strings de `node`"""
+        for ancestor in node.iterancestors():
+            if ancestor.tag in self.STRING_CONTAINERS:
+                return ancestor.tag
+        return None
+
+    def text(self, node):
+        """Equivalente a Tag.get_text(strip=True) de BeautifulSoup con html.parser"""
+        wanted = node.tag if node.tag in self.STRING_CONTAINERS else None
+        kind = node.tag if node.tag in self.STRING_CONTAINERS else self._container(node)
+        parts = []
+        self._collect_text(node, kind, wanted, parts)
+        return ''.join(parts)
+
+    def _collect_text(self, node, kind, wanted, parts):
+        if node.text and kind == wanted:
+            text = node.text.strip()
+            if text:
+                parts.append(text)
+        for child in node:
+            if self._is_element(child):
+                child_kind = child.tag if child.tag in self.STRING_CONTAINERS else kind
+                self._collect_text(child, child_kind, wanted, parts)
+            if child.tail and kind == wanted:
+                tail = child.tail.strip()
+                if tail:
+                    parts.append(tail)
+
+    def next_sibling_text(self, node):
+        for sibling in node.itersiblings():
+            if self._is_element(sibling):
+                return self.text(sibling)
+        return None
+
+    def next_paragraph_text(self, node):
+        paragraphs = node.xpath(self.NEXT_PARAGRAPH_XPATH)
+        return self.text(paragraphs[0]) if paragraphs else None
+
+PARSER_BACKENDS = {
+    'bs4': BS4ParserBackend,
+    'lxml': LxmlParserBackend,
+}
+DEFAULT_PARSER = 'lxml' if LXML_AVAILABLE else 'bs4'
+
 class MinEducOAScraper:
-    def __init__(self, year="2023", max_oa_limit=100):
+    def __init__(self, year="2023", max_oa_limit=100, concurrency=1, requests_per_second=1.0,
+                 cache_dir=DEFAULT_CACHE_DIR, offline=False, parser=DEFAULT_PARSER,
+                 journal_path=None, resume=False):
         self.year = year
         self.max_oa_limit = max_oa_limit  # Límite para testing
+        self.concurrency = max(1, concurrency)  # Páginas descargadas en paralelo
         self.base_url = "https://www.curriculumnacional.cl"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        
+        # requests.Session no es thread-safe: cada worker usa su propia sesión
+        self._local = threading.local()
+        self._local.session = self.session
+        
+        # Reemplaza el time.sleep(1) fijo entre páginas (1 req/s por defecto)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        
+        # Caché HTTP en disco (None = desactivada); offline = solo replay desde caché
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.offline = offline
+        if self.offline and not self.cache:
+            raise ValueError("El modo offline (--from-cache) requiere una caché")
+        
+        # Backend de parsing para el método estructura MINEDUC (BeautifulSoup = fallback)
+        if parser == 'lxml' and not LXML_AVAILABLE:
+            logger.warning("⚠️  lxml no está instalado, usando parser BeautifulSoup")
+            parser = 'bs4'
+        self.parser_backend = PARSER_BACKENDS[parser]()
+        self.bs4_backend = PARSER_BACKENDS['bs4']()
+        
+        # Journal de checkpoints por página (None = desactivado); resume = saltar páginas ya hechas
+        self.journal = ScrapeJournal(journal_path, resume=resume, max_oa=max_oa_limit) if journal_path else None
+        if resume and not self.journal:
+            raise ValueError("--resume requiere un journal de checkpoints")
         
         # Mapeo de asignaturas basado en URLs reales del sitio
         self.subjects = {
@@ -86,105 +304,53 @@ class MinEducOAScraper:
             '4M': ('3o-4o-medio', '4-medio'),
         }
         
-        # Patrones de códigos OA por asignatura (actualizados para 1°-6° básico)
+        # Prefijo del código OA por asignatura (MA01 OA 01, LE03 OA 12, ...)
+        self.oa_code_prefixes = {
+            'MAT': 'MA',
+            'LEN': 'LE',
+            'CN': 'CN',
+            'HIS': 'HI',
+            'ING': 'IN',
+            'ING_PROP': 'EN',  # Inglés Propuesta 1°-4°
+            'EDF': 'EF',
+            'ART': 'AR',
+            'MUS': 'MU',
+            'TEC': 'TE',
+            'ORI': 'OR',
+            'LPO': 'LP',
+        }
+        
+        # Patrones de códigos OA por asignatura, generados para todos los grados
+        # de self.grade_cycles (MA01OA\d+ ... MA08OA\d+, MA1MOA\d+ ... MA4MOA\d+)
+        grade_tokens = [self.oa_grade_token(grade) for grade in self.grade_cycles]
         self.oa_patterns = {
-            'MAT': [
-                r'MA01OA\d+',  # MA01OA01, MA01OA02, etc.
-                r'MA02OA\d+',  # MA02OA01, MA02OA02, etc.
-                r'MA03OA\d+',  # MA03OA01, MA03OA02, etc.
-                r'MA04OA\d+',  # MA04OA01, MA04OA02, etc.
-                r'MA05OA\d+',  # MA05OA01, MA05OA02, etc.
-                r'MA06OA\d+'   # MA06OA01, MA06OA02, etc.
-            ],
-            'LEN': [
-                r'LE01OA\d+',  # LE01OA01, LE01OA02, etc.
-                r'LE02OA\d+',  # LE02OA01, LE02OA02, etc.
-                r'LE03OA\d+',  # LE03OA01, LE03OA02, etc.
-                r'LE04OA\d+',  # LE04OA01, LE04OA02, etc.
-                r'LE05OA\d+',  # LE05OA01, LE05OA02, etc.
-                r'LE06OA\d+'   # LE06OA01, LE06OA02, etc.
-            ],
-            'CN': [
-                r'CN01OA\d+',  # CN01OA01, CN01OA02, etc.
-                r'CN02OA\d+',  # CN02OA01, CN02OA02, etc.
-                r'CN03OA\d+',  # CN03OA01, CN03OA02, etc.
-                r'CN04OA\d+',  # CN04OA01, CN04OA02, etc.
-                r'CN05OA\d+',  # CN05OA01, CN05OA02, etc.
-                r'CN06OA\d+'   # CN06OA01, CN06OA02, etc.
-            ],
-            'HIS': [
-                r'HI01OA\d+',  # HI01OA01, HI01OA02, etc.
-                r'HI02OA\d+',  # HI02OA01, HI02OA02, etc.
-                r'HI03OA\d+',  # HI03OA01, HI03OA02, etc.
-                r'HI04OA\d+',  # HI04OA01, HI04OA02, etc.
-                r'HI05OA\d+',  # HI05OA01, HI05OA02, etc.
-                r'HI06OA\d+'   # HI06OA01, HI06OA02, etc.
-            ],
-            'ING': [
-                r'IN01OA\d+',  # IN01OA01, IN01OA02, etc.
-                r'IN02OA\d+',  # IN02OA01, IN02OA02, etc.
-                r'IN03OA\d+',  # IN03OA01, IN03OA02, etc.
-                r'IN04OA\d+',  # IN04OA01, IN04OA02, etc.
-                r'IN05OA\d+',  # IN05OA01, IN05OA02, etc.
-                r'IN06OA\d+'   # IN06OA01, IN06OA02, etc.
-            ],
-            'ING_PROP': [
-                r'EN01OA\d+',  # EN01OA01, EN01OA02, etc. (Inglés Propuesta 1°-4°)
-                r'EN02OA\d+',  # EN02OA01, EN02OA02, etc.
-                r'EN03OA\d+',  # EN03OA01, EN03OA02, etc.
-                r'EN04OA\d+'   # EN04OA01, EN04OA02, etc.
-            ],
-            'EDF': [
-                r'EF01OA\d+',  # EF01OA01, EF01OA02, etc.
-                r'EF02OA\d+',  # EF02OA01, EF02OA02, etc.
-                r'EF03OA\d+',  # EF03OA01, EF03OA02, etc.
-                r'EF04OA\d+',  # EF04OA01, EF04OA02, etc.
-                r'EF05OA\d+',  # EF05OA01, EF05OA02, etc.
-                r'EF06OA\d+'   # EF06OA01, EF06OA02, etc.
-            ],
-            'ART': [
-                r'AR01OA\d+',  # AR01OA01, AR01OA02, etc.
-                r'AR02OA\d+',  # AR02OA01, AR02OA02, etc.
-                r'AR03OA\d+',  # AR03OA01, AR03OA02, etc.
-                r'AR04OA\d+',  # AR04OA01, AR04OA02, etc.
-                r'AR05OA\d+',  # AR05OA01, AR05OA02, etc.
-                r'AR06OA\d+'   # AR06OA01, AR06OA02, etc.
-            ],
-            'MUS': [
-                r'MU01OA\d+',  # MU01OA01, MU01OA02, etc.
-                r'MU02OA\d+',  # MU02OA01, MU02OA02, etc.
-                r'MU03OA\d+',  # MU03OA01, MU03OA02, etc.
-                r'MU04OA\d+',  # MU04OA01, MU04OA02, etc.
-                r'MU05OA\d+',  # MU05OA01, MU05OA02, etc.
-                r'MU06OA\d+'   # MU06OA01, MU06OA02, etc.
-            ],
-            'TEC': [
-                r'TE01OA\d+',  # TE01OA01, TE01OA02, etc.
-                r'TE02OA\d+',  # TE02OA01, TE02OA02, etc.
-                r'TE03OA\d+',  # TE03OA01, TE03OA02, etc.
-                r'TE04OA\d+',  # TE04OA01, TE04OA02, etc.
-                r'TE05OA\d+',  # TE05OA01, TE05OA02, etc.
-                r'TE06OA\d+'   # TE06OA01, TE06OA02, etc.
-            ],
-            'ORI': [
-                r'OR01OA\d+',  # OR01OA01, OR01OA02, etc.
-                r'OR02OA\d+',  # OR02OA01, OR02OA02, etc.
-                r'OR03OA\d+',  # OR03OA01, OR03OA02, etc.
-                r'OR04OA\d+',  # OR04OA01, OR04OA02, etc.
-                r'OR05OA\d+',  # OR05OA01, OR05OA02, etc.
-                r'OR06OA\d+'   # OR06OA01, OR06OA02, etc.
-            ],
-            'LPO': [
-                r'LP01OA\d+',  # LP01OA01, LP01OA02, etc.
-                r'LP02OA\d+',  # LP02OA01, LP02OA02, etc.
-                r'LP03OA\d+',  # LP03OA01, LP03OA02, etc.
-                r'LP04OA\d+',  # LP04OA01, LP04OA02, etc.
-                r'LP05OA\d+',  # LP05OA01, LP05OA02, etc.
-                r'LP06OA\d+'   # LP06OA01, LP06OA02, etc.
-            ]
+            subj: [rf'{prefix}{token}OA\d+' for token in grade_tokens]
+            for subj, prefix in self.oa_code_prefixes.items()
+        }
+        
+        # Un solo regex compilado por método, en vez de un re.search por patrón y header.
+        # Grupos: prefix (asignatura), grade (01-08, 1M-4M) y number (número de OA)
+        prefix_alt = '|'.join(sorted(set(self.oa_code_prefixes.values()), key=len, reverse=True))
+        grade_alt = '|'.join(grade_tokens)
+        code_head = rf'(?P<prefix>{prefix_alt})(?P<grade>{grade_alt})'
+        # Header MINEDUC: "LE01OA 01" (sin espacio antes de OA)
+        self.oa_header_regex = re.compile(rf'{code_head}OA\s+(?P<number>\d{{2}})', re.IGNORECASE)
+        # Método alternativo: espacios opcionales ("LE01 OA 01", "LE01OA01")
+        self.oa_loose_regex = re.compile(rf'{code_head}\s*OA\s*(?P<number>\d{{2}})', re.IGNORECASE)
+        self.oa_text_regexes = {
+            subj: re.compile(rf'{prefix}(?:{grade_alt})OA\d+', re.IGNORECASE)
+            for subj, prefix in self.oa_code_prefixes.items()
         }
         
         self.oa_data = []
+    
+    @staticmethod
+    def oa_grade_token(grade):
+        """
+        Parte de grado del código OA: '1B' -> '01', '8B' -> '08', '2M' -> '2M'
+        """
+        number, level = grade[:-1], grade[-1]
+        return number.zfill(2) if level == 'B' else grade
         
     def build_url(self, grade, subject):
         """
@@ -249,11 +415,29 @@ class MinEducOAScraper:
         
         return description
     
+    def limit_page(self, items):
+        """
+        Aplica max_oa_limit a los elementos de una página. Retorna (elementos,
+        página completa): con la página recortada, un OA que no aparece puede
+        estar más allá del límite y oa_diff.py no lo da por eliminado
+        """
+        if self.max_oa_limit and len(items) > self.max_oa_limit:
+            return items[:self.max_oa_limit], False
+        return items, True
+    
+    @staticmethod
+    def mark_page_complete(oa_data, complete):
+        """Anota en cada registro si su página se extrajo completa (columna page_complete)"""
+        for record in oa_data:
+            record['page_complete'] = complete
+        return oa_data
+    
     def alternative_extraction_method(self, soup, grade, subject, url):
         """
         Método alternativo de extracción para casos donde el método principal no funciona
         """
         oa_data = []
+        complete = True
         
         try:
             # Buscar todos los elementos h4 que podrían contener OA
@@ -261,23 +445,12 @@ class MinEducOAScraper:
             
             logger.info(f"🔄 Método alternativo: encontrados {len(h4_elements)} elementos h4")
             
-            for i, h4 in enumerate(h4_elements[:self.max_oa_limit]):
+            limited, complete = self.limit_page(h4_elements)
+            for i, h4 in enumerate(limited):
                 text = h4.get_text(strip=True)
                 
-                # Buscar patrones de OA en el texto usando patrones dinámicos
-                oa_pattern = None
-                
-                # Usar todos los patrones disponibles
-                for subj_code, patterns in self.oa_patterns.items():
-                    for pattern in patterns:
-                        # Convertir patrón regex a búsqueda con espacios opcionales
-                        search_pattern = pattern.replace('OA\\d+', r'\s*OA\s*\d{2}')
-                        match = re.search(search_pattern, text, re.IGNORECASE)
-                        if match:
-                            oa_pattern = match
-                            break
-                    if oa_pattern:
-                        break
+                # Buscar patrones de OA en el texto (un solo regex para todas las asignaturas)
+                oa_pattern = self.oa_loose_regex.search(text)
                 
                 if oa_pattern:
                     oa_code = oa_pattern.group(0).replace(' ', '')
@@ -318,47 +491,38 @@ class MinEducOAScraper:
                     logger.debug(f"   📝 Texto: {text[:80]}...")
                     
                     if len(oa_data) >= 5:  # Limitar extracción alternativa
+                        complete = complete and i == len(limited) - 1
                         break
         
         except Exception as e:
             logger.warning(f"Error en método alternativo: {e}")
         
-        return oa_data
+        return self.mark_page_complete(oa_data, complete)
     
-    def extract_oa_mineduc_structure(self, soup, grade, subject, url):
+    def extract_oa_mineduc_structure(self, doc, grade, subject, url, backend=None):
         """
         Extracción específica para la estructura real del portal curriculumnacional.cl
         Basado en el patrón: h4 > "Objetivo de aprendizaje LE01 OA 01" seguido por descripción
+        `doc` es el árbol producido por `backend.parse()` (BeautifulSoup por defecto)
         """
+        backend = backend or self.bs4_backend
         oa_data = []
+        complete = True
         
         try:
             # Buscar todos los h4 que contengan "Objetivo de aprendizaje"
-            objective_headers = soup.find_all('h4', string=re.compile(r'Objetivo de aprendizaje.*', re.IGNORECASE))
+            objective_headers = backend.objective_headers(doc)
             
             logger.info(f"🎯 Método estructura MINEDUC: encontrados {len(objective_headers)} objetivos")
             
-            for header in objective_headers[:self.max_oa_limit]:
+            limited, complete = self.limit_page(objective_headers)
+            for header in limited:
                 try:
-                    header_text = header.get_text(strip=True)
+                    header_text = backend.text(header)
                     logger.debug(f"📋 Procesando header: {header_text}")
                     
-                    # Extraer código OA del header
-                    # Patrones dinámicos basados en self.oa_patterns para todas las asignaturas
-                    oa_match = None
-                    
-                    # Buscar patrón de OA usando todos los patrones disponibles
-                    for subj_code, patterns in self.oa_patterns.items():
-                        for pattern in patterns:
-                            # Convertir patrón regex a búsqueda en texto con espacios
-                            # TE01OA\d+ -> TE01 OA \d+
-                            search_pattern = pattern.replace('OA\\d+', r'OA\s+\d{2}')
-                            match = re.search(search_pattern, header_text, re.IGNORECASE)
-                            if match:
-                                oa_match = match
-                                break
-                        if oa_match:
-                            break
+                    # Extraer código OA del header (prefijo, grado y número en un solo match)
+                    oa_match = self.oa_header_regex.search(header_text)
                     
                     if oa_match:
                         oa_code = oa_match.group(0).replace(' ', '')
@@ -374,19 +538,15 @@ class MinEducOAScraper:
                             
                         # Método 2: Buscar en el siguiente elemento sibling
                         if not description:
-                            next_sibling = header.find_next_sibling()
-                            if next_sibling:
-                                desc_text = next_sibling.get_text(strip=True)
-                                if len(desc_text) > 20:
-                                    description = desc_text
+                            desc_text = backend.next_sibling_text(header)
+                            if desc_text and len(desc_text) > 20:
+                                description = desc_text
                         
                         # Método 3: Buscar en el siguiente p o div
                         if not description:
-                            next_p = header.find_next('p')
-                            if next_p:
-                                desc_text = next_p.get_text(strip=True)
-                                if len(desc_text) > 20:
-                                    description = desc_text
+                            desc_text = backend.next_paragraph_text(header)
+                            if desc_text and len(desc_text) > 20:
+                                description = desc_text
                         
                         if description:
                             oa_data.append({
@@ -410,20 +570,100 @@ class MinEducOAScraper:
         except Exception as e:
             logger.warning(f"Error en método estructura MINEDUC: {e}")
         
-        return oa_data
+        return self.mark_page_complete(oa_data, complete)
+    
+    def get_session(self):
+        """Retorna la sesión HTTP del thread actual (una por worker)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+    
+    def fetch_page(self, url):
+        """
+        Descarga el HTML de una página respetando el límite de tasa por host.
+        Si hay caché, revalida con GET condicional (ETag/Last-Modified) y
+        reutiliza el cuerpo guardado cuando el servidor responde 304.
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        
+        if self.offline:
+            if entry is None:
+                raise CacheMiss(f"{url} no está en caché ({self.cache.cache_dir})")
+            logger.debug(f"💾 Replay desde caché: {url}")
+            return self.cache.read_body(entry)
+        
+        headers = ResponseCache.conditional_headers(entry) if entry else {}
+        
+        self.rate_limiter.wait(url)
+        response = self.get_session().get(url, timeout=15, headers=headers)
+        
+        if response.status_code == 304 and entry:
+            logger.debug(f"💾 Sin cambios (304), usando caché: {url}")
+            self.cache.mark_validated(entry)
+            return self.cache.read_body(entry)
+        
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response)
+        return response.content
     
     def extract_oa_from_page(self, url, grade, subject):
         """
         Extrae OA desde una página específica del portal MINEDUC
         Parseando la estructura HTML real del sitio
         """
+        oa_data, _ = self.fetch_and_parse(url, grade, subject)
+        return oa_data
+    
+    def fetch_and_parse(self, url, grade, subject):
+        """
+        Como extract_oa_from_page, pero distingue una página vacía de una que falló.
+        Retorna (oa_data, error) con error = None si la página se descargó y parseó bien
+        """
         try:
             logger.info(f"🔍 Extrayendo OA de {grade}-{subject}: {url}")
             
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            content = self.fetch_page(url)
+            
+        except (requests.exceptions.RequestException, CacheMiss) as e:
+            logger.error(f"❌ Error al acceder {url}: {e}")
+            return [], str(e)
+        
+        try:
+            return self.parse_oa_page(content, url, grade, subject), None
+        except Exception as e:
+            return [], f"Error procesando la página: {e}"
+    
+    def process_page(self, grade, subject, url):
+        """Procesa una página y la registra en el journal apenas termina (corre en el worker)"""
+        oa_data, error = self.fetch_and_parse(url, grade, subject)
+        if self.journal:
+            self.journal.record(grade, subject, url, oa_data, error)
+        return oa_data
+    
+    def parse_oa_page(self, content, url, grade, subject, backend=None):
+        """
+        Parsea el HTML ya descargado de una página y extrae sus OA. Un error
+        inesperado se propaga: fetch_and_parse registra la página como fallida
+        """
+        try:
+            # Backend rápido: solo cubre el método estructura MINEDUC; si no
+            # encuentra nada se repite todo el proceso con BeautifulSoup
+            backend = backend or self.parser_backend
+            if backend.name != 'bs4':
+                logger.info(f"🎯 Intentando método estructura específica MINEDUC ({backend.name})...")
+                doc = backend.parse(content)
+                oa_data = self.extract_oa_mineduc_structure(doc, grade, subject, url, backend)
+                if oa_data:
+                    logger.info(f"✅ Método estructura MINEDUC exitoso: {len(oa_data)} OA encontrados")
+                    logger.info(f"📊 Total extraídos: {len(oa_data)} OA de {grade}-{subject}")
+                    return oa_data
+                logger.info(f"↩️  {backend.name} sin resultados, usando BeautifulSoup")
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = bs4.BeautifulSoup(content, 'html.parser')
             
             oa_data = []
             
@@ -447,8 +687,9 @@ class MinEducOAScraper:
                 
                 logger.info(f"📋 Encontrados {len(oa_elements)} elementos potenciales de OA")
                 
-                # Procesar elementos encontrados con métodos alternativos
-                for item in oa_elements[:self.max_oa_limit]:  # Limitar para testing
+                # Procesar elementos encontrados con métodos alternativos (límite para testing)
+                limited, complete = self.limit_page(oa_elements)
+                for item in limited:
                     try:
                         if hasattr(item, 'get_text'):
                             text = item.get_text(strip=True)
@@ -480,6 +721,8 @@ class MinEducOAScraper:
                         logger.warning(f"⚠️  Error procesando item OA: {e}")
                         continue
                 
+                self.mark_page_complete(oa_data, complete)
+                
                 # Si aún no encontramos nada, intentar método alternativo final
                 if not oa_data:
                     logger.info("🔄 Intentando método alternativo de extracción...")
@@ -491,12 +734,151 @@ class MinEducOAScraper:
             logger.info(f"📊 Total extraídos: {len(oa_data)} OA de {grade}-{subject}")
             return oa_data
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ Error al acceder {url}: {e}")
-            return []
         except Exception as e:
             logger.error(f"💥 Error inesperado procesando {url}: {e}")
-            return []
+            raise
+    
+    def labels_from_url(self, url):
+        """Recupera (grado, asignatura) desde una URL construida por build_url"""
+        parts = urlparse(url).path.rstrip('/').split('/')
+        if len(parts) < 3:
+            return '', ''
+        cycle, subject_name, grade_name = parts[-3:]
+        grade = next((g for g, info in self.grade_cycles.items() if info == (cycle, grade_name)), grade_name)
+        subject = next((s for s, name in self.subjects.items() if name == subject_name), subject_name)
+        return grade, subject
+    
+    def verify_parsers(self):
+        """
+        Prueba de equivalencia: extrae los OA de cada página en caché con el backend
+        configurado y con BeautifulSoup, y compara los resultados (sin scraped_at).
+        Retorna (páginas verificadas, URLs con diferencias, segundos por backend)
+        """
+        if not self.cache:
+            raise ValueError("La verificación de parsers requiere una caché con páginas guardadas")
+        
+        def comparable(records):
+            return [{k: v for k, v in r.items() if k != 'scraped_at'} for r in records]
+        
+        pages = 0
+        mismatches = []
+        elapsed = {self.parser_backend.name: 0.0, self.bs4_backend.name: 0.0}
+        
+        for entry in self.cache.iter_entries():
+            url = entry['url']
+            content = self.cache.read_body(entry)
+            grade, subject = self.labels_from_url(url)
+            
+            results = {}
+            for backend in (self.parser_backend, self.bs4_backend):
+                start = time.perf_counter()
+                try:
+                    results[backend.name] = comparable(self.parse_oa_page(content, url, grade, subject, backend))
+                except Exception:
+                    results[backend.name] = None  # Error de parsing: cuenta como diferencia
+                elapsed[backend.name] += time.perf_counter() - start
+            
+            pages += 1
+            fast, reference = results[self.parser_backend.name], results[self.bs4_backend.name]
+            if fast is None or reference is None or fast != reference:
+                mismatches.append(url)
+                found = {name: 'error' if records is None else f"{len(records)} OA" for name, records in results.items()}
+                logger.error(f"❌ Diferencia en {url}: {found[self.parser_backend.name]} ({self.parser_backend.name}) "
+                             f"vs {found[self.bs4_backend.name]} (bs4)")
+        
+        return pages, mismatches, elapsed
+    
+    def close(self):
+        """Cierra el journal de checkpoints (si hay); seguro de llamar más de una vez"""
+        if self.journal:
+            self.journal.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+    
+    def _rate_description(self):
+        interval = self.rate_limiter.min_interval
+        return f"{1.0 / interval:g} req/s" if interval else "sin límite"
+    
+    def iter_page_results(self, pages):
+        """
+        Descarga y parsea una lista de páginas (grade, subject, url).
+        Con concurrency > 1 usa un pool de threads acotado; en ambos casos
+        entrega (grade, subject, url, oa_data) en el mismo orden de `pages`.
+        Las páginas ya completadas en el journal (--resume) no se vuelven a descargar.
+        """
+        completed = self.journal.completed if self.journal else {}
+        if completed:
+            resumed = sum(1 for _, _, url in pages if url in completed)
+            logger.info(f"⏩ Retomando: {resumed}/{len(pages)} páginas ya completadas en {self.journal.path}")
+        stale = sum(1 for _, _, url in pages if self.journal and url in self.journal.stale)
+        if stale:
+            logger.info(f"🔁 {stale} páginas del journal se hicieron con otro --max-oa: se vuelven a procesar")
+        
+        if self.concurrency == 1 or len(pages) <= 1:
+            for grade, subject, url in pages:
+                if url in completed:
+                    yield grade, subject, url, completed[url]
+                else:
+                    yield grade, subject, url, self.process_page(grade, subject, url)
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='oa-fetch')
+        try:
+            futures = [
+                None if url in completed else executor.submit(self.process_page, grade, subject, url)
+                for grade, subject, url in pages
+            ]
+            for (grade, subject, url), future in zip(pages, futures):
+                yield grade, subject, url, completed[url] if future is None else future.result()
+        finally:
+            # Si el consumidor corta antes (límite de OA), no descargar el resto
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def build_pages(self, combinations):
+        """
+        Convierte combinaciones (grade, subject) en páginas (grade, subject, url),
+        descartando las que no tienen URL válida
+        """
+        pages = []
+        for grade, subject in combinations:
+            url = self.build_url(grade, subject)
+            if url:
+                pages.append((grade, subject, url))
+            else:
+                logger.warning(f"⚠️  No se pudo construir URL para {grade}-{subject}")
+        return pages
+    
+    def scrape_batch(self, combinations):
+        """
+        API de biblioteca para los drivers batch: procesa muchas combinaciones
+        grado × asignatura en un solo proceso y retorna los registros en memoria.
+        
+        `combinations` puede ser un dict {grado: [asignaturas]} o un iterable de
+        tuplas (grado, asignatura). A diferencia de scrape_all_oa, max_oa_limit se
+        aplica solo por página (no al total) y no se eliminan duplicados: eso
+        queda a cargo del driver al combinar. El scraper puede procesar varios
+        lotes; quien lo crea lo cierra (`with MinEducOAScraper(...) as scraper`).
+        """
+        if isinstance(combinations, dict):
+            combinations = [
+                (grade, subject)
+                for grade, subjects in combinations.items()
+                for subject in subjects
+            ]
+        
+        pages = self.build_pages(combinations)
+        logger.info(f"📦 Lote de {len(pages)} páginas (concurrencia {self.concurrency}, {self._rate_description()})")
+        
+        records = []
+        for grade, subject, url, oa_data in self.iter_page_results(pages):
+            logger.info(f"📄 {grade}-{subject}: {len(oa_data)} OA")
+            records.extend(oa_data)
+        
+        return records
     
     def scrape_all_oa(self, grades=None, subjects=None):
         """
@@ -517,34 +899,28 @@ class MinEducOAScraper:
         total_combinations = len(target_grades) * len(target_subjects)
         processed = 0
         
-        for grade in target_grades:
-            for subject in target_subjects:
-                processed += 1
-                
-                logger.info(f"📈 Progreso: {processed}/{total_combinations} - Procesando {grade}-{subject}")
-                
-                url = self.build_url(grade, subject)
-                if url:
-                    oa_data = self.extract_oa_from_page(url, grade, subject)
-                    all_oa_data.extend(oa_data)
-                    
-                    # Mostrar muestra de lo extraído
-                    if oa_data:
-                        logger.info(f"✅ Muestra extraída de {grade}-{subject}:")
-                        for oa in oa_data[:2]:  # Mostrar solo primeros 2
-                            logger.info(f"   🎯 {oa['oa_code']}: {oa['oa_desc'][:80]}...")
-                    
-                    # Delay entre requests para ser respetuoso
-                    time.sleep(1)
-                    
-                    # Límite total para testing
-                    if len(all_oa_data) >= self.max_oa_limit:
-                        logger.info(f"🛑 Límite de testing alcanzado: {self.max_oa_limit} OA")
-                        break
-                else:
-                    logger.warning(f"⚠️  No se pudo construir URL para {grade}-{subject}")
+        logger.info(f"   ⚡ Concurrencia: {self.concurrency} | Límite por host: {self._rate_description()}")
+        
+        pages = self.build_pages((grade, subject) for grade in target_grades for subject in target_subjects)
+        
+        # Los resultados se consumen en el orden grado × asignatura original,
+        # así el CSV es idéntico al del modo secuencial
+        for grade, subject, url, oa_data in self.iter_page_results(pages):
+            processed += 1
+            
+            logger.info(f"📈 Progreso: {processed}/{len(pages)} páginas ({total_combinations} combinaciones) - {grade}-{subject}")
+            
+            all_oa_data.extend(oa_data)
+            
+            # Mostrar muestra de lo extraído
+            if oa_data:
+                logger.info(f"✅ Muestra extraída de {grade}-{subject}:")
+                for oa in oa_data[:2]:  # Mostrar solo primeros 2
+                    logger.info(f"   🎯 {oa['oa_code']}: {oa['oa_desc'][:80]}...")
             
-            if len(all_oa_data) >= self.max_oa_limit:
+            # Límite total para testing
+            if self.max_oa_limit and len(all_oa_data) >= self.max_oa_limit:
+                logger.info(f"🛑 Límite de testing alcanzado: {self.max_oa_limit} OA")
                 break
         
         # Eliminar duplicados manteniendo el primer registro
@@ -557,6 +933,9 @@ class MinEducOAScraper:
                 seen_codes.add(oa['oa_code'])
         
         logger.info(f"🎉 Scraping completado: {len(all_oa_data)} OA extraídos ({len(unique_oa_data)} únicos)")
+        if self.journal and self.journal.failed:
+            logger.warning(f"⚠️  {len(self.journal.failed)} páginas fallaron; reintentar con --resume "
+                           f"(journal: {self.journal.path})")
         
         # Mostrar resumen detallado
         if unique_oa_data:
@@ -568,9 +947,10 @@ class MinEducOAScraper:
         
         return unique_oa_data
     
-    def save_to_csv(self, oa_data, output_file):
+    def save_dataset(self, oa_data, output_file):
         """
-        Guarda los OA extraídos a CSV con las columnas especificadas
+        Guarda los OA extraídos con las columnas especificadas: dataset Parquet
+        particionado por grado/asignatura, o CSV si output_file termina en .csv
         """
         if not oa_data:
             logger.error("No hay datos de OA para guardar")
@@ -581,18 +961,17 @@ class MinEducOAScraper:
             df = pd.DataFrame(oa_data)
             
             # Reordenar columnas según especificación
-            df = df[['oa_code', 'oa_desc', 'grade', 'subject', 'source_url', 'scraped_at']]
+            df = df.reindex(columns=['oa_code', 'oa_desc', 'grade', 'subject', 'source_url', 'scraped_at', 'page_complete'])
             
-            # Guardar CSV con encoding UTF-8
-            df.to_csv(output_file, index=False, encoding='utf-8')
+            write_oa(df, output_file)
             
-            logger.info(f"📄 Archivo CSV guardado: {output_file}")
+            logger.info(f"📄 OA guardados: {output_file}")
             logger.info(f"📊 Registros guardados: {len(df)}")
             
             return True
             
         except Exception as e:
-            logger.error(f"Error al guardar CSV: {e}")
+            logger.error(f"Error al guardar OA: {e}")
             return False
 
     def extract_oa_from_text(self, text, subject, grade):
@@ -601,46 +980,98 @@ class MinEducOAScraper:
         """
         oa_codes = set()
         
-        # Usar patrones específicos para la asignatura actual
-        if subject in self.oa_patterns:
-            for pattern in self.oa_patterns[subject]:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                oa_codes.update(matches)
+        # Usar el patrón compilado de la asignatura actual
+        regex = self.oa_text_regexes.get(subject)
+        if regex:
+            oa_codes.update(regex.findall(text))
         
         return list(oa_codes)
 
 def main():
     parser = argparse.ArgumentParser(description='Scraper de OA desde portal MINEDUC - Versión Testing')
     parser.add_argument('--year', default='2023', help='Año de la malla curricular')
-    parser.add_argument('--out', default='oa_raw.csv', help='Archivo CSV de salida')
+    parser.add_argument('--out', default='oa_raw.parquet', help='Dataset Parquet de salida (o archivo .csv)')
     parser.add_argument('--grades', nargs='+', help='Grados específicos (ej: 1B 2B 7B)')
     parser.add_argument('--subjects', nargs='+', help='Asignaturas específicas (ej: MAT LEN)')
     parser.add_argument('--max-oa', type=int, default=100, help='Máximo OA para testing (default: 100)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Logging detallado')
     parser.add_argument('--full-scrape', action='store_true', help='Scraping completo (desactivar límites)')
+    parser.add_argument('--concurrency', type=int, default=1, help='Páginas descargadas en paralelo (default: 1)')
+    parser.add_argument('--rps', type=float, default=1.0, help='Máximo de requests por segundo por host (default: 1, 0 = sin límite)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'Directorio de la caché HTTP (default: {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--no-cache', action='store_true', help='No leer ni escribir la caché HTTP')
+    parser.add_argument('--from-cache', action='store_true', help='Replay offline: usar solo páginas en caché, sin red')
+    parser.add_argument('--parser', choices=sorted(PARSER_BACKENDS), default=DEFAULT_PARSER,
+                        help=f'Backend de parsing HTML (default: {DEFAULT_PARSER}; bs4 siempre es el fallback)')
+    parser.add_argument('--journal', help='Journal JSONL de checkpoints por página (default: <out>.journal.jsonl)')
+    parser.add_argument('--no-journal', action='store_true', help='No escribir journal de checkpoints')
+    parser.add_argument('--resume', action='store_true', help='Retomar una corrida interrumpida saltando las páginas ya completadas')
+    parser.add_argument('--verify-parsers', action='store_true',
+                        help='Comparar la extracción del backend vs BeautifulSoup sobre las páginas en caché y salir')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.no_cache and args.from_cache:
+        parser.error("--from-cache no se puede combinar con --no-cache")
+    if args.resume and args.no_journal:
+        parser.error("--resume no se puede combinar con --no-journal")
+    if args.verify_parsers and args.no_cache:
+        parser.error("--verify-parsers necesita la caché HTTP (no usar --no-cache)")
+    
     # Determinar límite de OA
     max_limit = None if args.full_scrape else args.max_oa
     
+    journal_path = None
+    if not args.no_journal and not args.verify_parsers:
+        journal_path = args.journal or f"{args.out}.journal.jsonl"
+    
     # Inicializar scraper
-    scraper = MinEducOAScraper(year=args.year, max_oa_limit=max_limit)
+    scraper = MinEducOAScraper(
+        year=args.year,
+        max_oa_limit=max_limit,
+        concurrency=args.concurrency,
+        requests_per_second=args.rps,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        offline=args.from_cache,
+        parser=args.parser,
+        journal_path=journal_path,
+        resume=args.resume
+    )
+    
+    if args.verify_parsers:
+        # Solo mostrar diferencias y tiempos, no el log de cada página
+        if not args.verbose:
+            logger.setLevel(logging.WARNING)
+        pages, mismatches, elapsed = scraper.verify_parsers()
+        for name, seconds in elapsed.items():
+            print(f"⏱️  {name}: {seconds:.2f}s en {pages} páginas")
+        if mismatches:
+            print(f"❌ {len(mismatches)}/{pages} páginas con extracción distinta a BeautifulSoup")
+            sys.exit(1)
+        print(f"✅ Extracción idéntica en {pages} páginas ({scraper.parser_backend.name} vs bs4)")
+        sys.exit(0)
     
     logger.info("🎯 SCRAPER OA MINEDUC - VERSIÓN TESTING")
     logger.info(f"🔢 Límite OA: {max_limit if max_limit else 'SIN LÍMITE'}")
     logger.info(f"📅 Año: {args.year}")
+    logger.info(f"🧩 Parser HTML: {scraper.parser_backend.name}")
+    if scraper.cache:
+        modo = "offline (solo caché)" if args.from_cache else "revalidación condicional"
+        logger.info(f"💾 Caché HTTP: {scraper.cache.cache_dir} - {modo}")
+    if scraper.journal:
+        modo = "retomando" if args.resume else "nuevo"
+        logger.info(f"📒 Journal de checkpoints: {scraper.journal.path} ({modo})")
     
     try:
         # Ejecutar scraping
         oa_data = scraper.scrape_all_oa(grades=args.grades, subjects=args.subjects)
         
         if oa_data:
-            # Guardar en CSV
-            success = scraper.save_to_csv(oa_data, args.out)
+            # Guardar dataset (o CSV)
+            success = scraper.save_dataset(oa_data, args.out)
             
             if success:
                 logger.info("🎉 ¡SCRAPING COMPLETADO EXITOSAMENTE!")
@@ -657,7 +1088,7 @@ def main():
                 
                 sys.exit(0)
             else:
-                logger.error("❌ Error al guardar CSV")
+                logger.error("❌ Error al guardar OA")
                 sys.exit(1)
         else:
             logger.error("❌ No se pudieron extraer OA")
@@ -673,11 +1104,16 @@ def main():
             
     except KeyboardInterrupt:
         logger.info("⏹️  Scraping interrumpido por el usuario")
+        if scraper.journal:
+            logger.info(f"💡 Para continuar: repetir el comando con --resume (journal: {scraper.journal.path})")
         sys.exit(1)
     except Exception as e:
         logger.error(f"💥 Error inesperado: {e}")
         logger.error("🔧 Ejecuta con --verbose para más información")
         sys.exit(1)
+    finally:
+        # El journal queda cerrado (y con todo lo registrado en disco) también ante Ctrl+C
+        scraper.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
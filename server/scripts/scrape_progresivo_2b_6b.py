@@ -8,10 +8,15 @@ Versión: 1.1.0 - Escalamiento Estable
 import sys
 import os
 import subprocess
-import time
+import logging
 import pandas as pd
 from datetime import datetime
 
+from scrape_oa import MinEducOAScraper
+
+# El scraper corre en este mismo proceso: solo mostrar sus advertencias
+logging.getLogger('scrape_oa').setLevel(logging.WARNING)
+
 def log_info(message):
     """Logger simple para el proceso progresivo"""
     timestamp = datetime.now().strftime("%H:%M:%S")
@@ -27,70 +32,38 @@ def log_error(message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"[{timestamp}] ❌ {message}")
 
-def run_single_scraper(grade, subjects, max_oa=50):
-    """Ejecuta el scraper para un grado específico con todas las asignaturas"""
-    
-    output_file = f"oa_{grade.lower()}_all_subjects.csv"
-    
-    # Construir comando
-    command = ["python", "scrape_oa.py"]
-    command.extend(["--grades", grade])
-    command.extend(["--subjects"] + subjects)
-    command.extend(["--max-oa", str(max_oa)])
-    command.extend(["--out", output_file])
-    command.append("--verbose")
+def run_single_scraper(scraper, grade, subjects):
+    """Scrapea un grado específico con todas las asignaturas, en memoria"""
     
     log_info(f"Procesando grado {grade}...")
-    log_info(f"Comando: {' '.join(command)}")
+    log_info(f"Asignaturas: {', '.join(subjects)}")
     
     try:
-        result = subprocess.run(command, capture_output=True, text=True, timeout=600)
+        records = scraper.scrape_batch({grade: subjects})
+        count = len(records)
         
-        if result.returncode == 0:
-            # Verificar que el archivo se creó y tiene contenido
-            if os.path.exists(output_file):
-                df = pd.read_csv(output_file)
-                count = len(df)
-                if count > 0:
-                    log_success(f"Grado {grade}: {count} OA extraídos - {output_file}")
-                    return True, output_file, count
-                else:
-                    log_error(f"Grado {grade}: Archivo vacío")
-                    return False, None, 0
-            else:
-                log_error(f"Grado {grade}: Archivo no creado")
-                return False, None, 0
+        if count > 0:
+            log_success(f"Grado {grade}: {count} OA extraídos")
+            return True, records, count
         else:
-            log_error(f"Grado {grade}: Error en scraping")
-            log_error(f"STDERR: {result.stderr[:200]}...")
-            return False, None, 0
+            log_error(f"Grado {grade}: Sin OA extraídos")
+            return False, [], 0
             
-    except subprocess.TimeoutExpired:
-        log_error(f"Grado {grade}: Timeout (10 minutos)")
-        return False, None, 0
     except Exception as e:
         log_error(f"Grado {grade}: Excepción - {e}")
-        return False, None, 0
+        return False, [], 0
 
-def combine_csv_files(file_list, output_name="oa_2b_6b_combinado.csv"):
-    """Combina múltiples archivos CSV en uno solo"""
+def combine_records(records, output_name="oa_2b_6b_combinado.csv"):
+    """Combina los registros de todos los grados en un solo CSV"""
     
-    if not file_list:
-        log_error("No hay archivos para combinar")
+    if not records:
+        log_error("No hay registros para combinar")
         return False
         
-    log_info(f"Combinando {len(file_list)} archivos...")
+    log_info(f"Combinando {len(records)} registros...")
     
     try:
-        combined_df = pd.DataFrame()
-        
-        for file in file_list:
-            if os.path.exists(file):
-                df = pd.read_csv(file)
-                combined_df = pd.concat([combined_df, df], ignore_index=True)
-                log_info(f"   📄 {file}: {len(df)} registros")
-            else:
-                log_error(f"   ❌ {file}: No encontrado")
+        combined_df = pd.DataFrame(records)
         
         # Eliminar duplicados basado en oa_code
         before_count = len(combined_df)
@@ -106,7 +79,7 @@ def combine_csv_files(file_list, output_name="oa_2b_6b_combinado.csv"):
         return True
         
     except Exception as e:
-        log_error(f"Error combinando archivos: {e}")
+        log_error(f"Error combinando registros: {e}")
         return False
 
 def generate_summary(combined_file):
@@ -168,55 +141,56 @@ def main():
     log_info(f"Máximo OA por página: {max_oa_per_page}")
     print()
     
-    successful_files = []
+    # Un solo scraper (sesión HTTP, caché y límite de tasa compartidos) para todos los grados
+    scraper = MinEducOAScraper(max_oa_limit=max_oa_per_page)
+    
+    all_records = []
+    successful_grades = []
     total_oa_count = 0
     failed_grades = []
     
     # Procesar grado por grado
-    for i, grade in enumerate(grades, 1):
-        print(f"\n📚 GRADO {grade} ({i}/{len(grades)})")
-        print("-" * 30)
-        
-        success, output_file, oa_count = run_single_scraper(
-            grade=grade,
-            subjects=subjects,
-            max_oa=max_oa_per_page
-        )
-        
-        if success:
-            successful_files.append(output_file)
-            total_oa_count += oa_count
-            log_success(f"Grado {grade} completado exitosamente")
-        else:
-            failed_grades.append(grade)
-            log_error(f"Grado {grade} falló")
-        
-        # Pausa entre grados para evitar sobrecarga del servidor
-        if i < len(grades):
-            log_info("Pausa de 3 segundos...")
-            time.sleep(3)
+    with scraper:
+        for i, grade in enumerate(grades, 1):
+            print(f"\n📚 GRADO {grade} ({i}/{len(grades)})")
+            print("-" * 30)
+            
+            success, records, oa_count = run_single_scraper(
+                scraper=scraper,
+                grade=grade,
+                subjects=subjects
+            )
+            
+            if success:
+                all_records.extend(records)
+                successful_grades.append(grade)
+                total_oa_count += oa_count
+                log_success(f"Grado {grade} completado exitosamente")
+            else:
+                failed_grades.append(grade)
+                log_error(f"Grado {grade} falló")
     
     # Resumen del proceso
     print(f"\n📊 RESUMEN DEL PROCESO")
     print("-" * 30)
-    log_success(f"Grados exitosos: {len(successful_files)}/{len(grades)}")
+    log_success(f"Grados exitosos: {len(successful_grades)}/{len(grades)}")
     log_success(f"Total OA extraídos: {total_oa_count}")
     
     if failed_grades:
         log_error(f"Grados fallidos: {', '.join(failed_grades)}")
     
-    # Combinar archivos si hay éxitos
-    if successful_files:
-        print(f"\n🔄 COMBINANDO ARCHIVOS")
+    # Combinar registros si hay éxitos
+    if all_records:
+        print(f"\n🔄 COMBINANDO REGISTROS")
         print("-" * 30)
         
-        combined_success = combine_csv_files(
-            successful_files, 
+        combined_success = combine_records(
+            all_records, 
             "oa_2b_6b_completo_progresivo.csv"
         )
         
         if combined_success:
-            log_success("Archivos combinados exitosamente")
+            log_success("Registros combinados exitosamente")
             
             # Generar resumen estadístico
             print(f"\n📈 GENERANDO RESUMEN")
@@ -267,9 +241,9 @@ def main():
                 log_error(f"❌ Error en enriquecimiento: {e}")
                 
         else:
-            log_error("Error combinando archivos")
+            log_error("Error combinando registros")
     else:
-        log_error("No se generaron archivos exitosos")
+        log_error("No se extrajo ningún OA")
     
     print()
     print("=" * 50)
@@ -0,0 +1,328 @@
+"""
+Assets compartidos de las skins: deduplicación, atlas de texturas y audio sprites
+Cada skin declara en `assets_needed` cuántos sprites, sonidos, animaciones, etc.
+necesita, y el resumen del catálogo solo los sumaba. Pero las skins de una misma
+temática usan los mismos elementos (perros, cohetes, ...) y las de un mismo
+engine los mismos sonidos y animaciones. Aquí cada conteo se traduce a assets
+lógicos de un pool compartido:
+
+    sprites, backgrounds          pool de la temática   'animales/perros_0', 'animales/background_001'
+    animations, sounds,           pool del engine       'ENG01/sound_003'
+    voice_clips, text_content
+    fonts                         pool global           'global/font_001'
+
+Una skin con 15 sprites usa los 15 primeros del pool de su temática; otra con 20
+reusa esos 15 y agrega 5. Si existe el archivo fuente (<assets_dir>/<pool>/<nombre>.*)
+el asset se identifica por el hash de su contenido, así que dos archivos
+idénticos en pools distintos se empaquetan una sola vez.
+
+Bundles:
+    atlas            sprites de cada temática y animaciones de cada engine,
+                     empaquetados por estantes en páginas de hasta max_size px
+                     (JSON estilo TexturePacker 'hash')
+    audio            sonidos y voces de cada engine en un WAV con offsets
+                     (formato de sprite de howler.js)
+    pack             fuentes y textos de cada pool en un zip
+    file             fondos, uno por archivo (no conviene meterlos en un atlas)
+
+Sin archivo fuente el asset usa un tamaño o duración de referencia: el layout y
+el manifest se generan igual y el bundle queda con "built": false.
+
+Uso:
+    source = AssetSource('../assets/skins')
+    manifest, bundles = build_manifest(skins, themes, source)
+    write_bundles(bundles, out_dir)
+"""
+
+import hashlib
+import json
+import os
+import struct
+import wave
+import zipfile
+from pathlib import Path
+
+from lazy_imports import lazy_import, module_available
+
+Image = lazy_import('PIL.Image')
+PIL_AVAILABLE = module_available('PIL')
+
+MANIFEST_FORMAT = 1
+
+# assets_needed → (tipo de asset, pool, tipo de bundle)
+ASSET_KINDS = {
+    'sprites': ('sprite', 'theme', 'atlas'),
+    'backgrounds': ('background', 'theme', 'file'),
+    'animations': ('animation', 'engine', 'atlas'),
+    'sounds': ('sound', 'engine', 'audio'),
+    'voice_clips': ('voice_clip', 'engine', 'audio'),
+    'text_content': ('text', 'engine', 'pack'),
+    'fonts': ('font', 'global', 'pack'),
+}
+
+# Extensiones de los archivos fuente por tipo de bundle
+SOURCE_EXTENSIONS = {
+    'atlas': ('.png',),
+    'file': ('.png', '.jpg', '.webp'),
+    'audio': ('.wav',),
+    'pack': ('.json', '.txt', '.ttf', '.otf', '.woff2'),
+}
+
+# Medidas de referencia para assets sin archivo fuente
+PLACEHOLDER_SIZES = {'sprite': (128, 128), 'animation': (256, 256)}
+PLACEHOLDER_DURATIONS_MS = {'sound': 800, 'voice_clip': 1500}
+
+DEFAULT_MAX_ATLAS_SIZE = 2048
+DEFAULT_PADDING = 2
+AUDIO_GAP_MS = 100   # silencio entre sonidos del audio sprite
+
+def asset_name(kind, index, theme=None):
+    """Nombre del asset `index` de un pool: los sprites recorren los elementos de la temática"""
+    if kind == 'sprite' and theme:
+        elements = theme['elements']
+        return f"{elements[index % len(elements)]}_{index // len(elements)}"
+    return f"{kind}_{index + 1:03d}"
+
+def skin_assets(skin, themes):
+    """[(clave, tipo, pool, tipo de bundle)] de los assets que usa una skin"""
+    assets = []
+    for field, count in skin.get('assets_needed', {}).items():
+        if field not in ASSET_KINDS:
+            raise ValueError(f"{skin['skin_id']}: assets_needed desconocido: {field}")
+        kind, scope, bundle_type = ASSET_KINDS[field]
+        pool = {'theme': skin['theme'], 'engine': skin['engine_id'], 'global': 'global'}[scope]
+        theme = themes.get(skin['theme']) if scope == 'theme' else None
+        for index in range(count):
+            assets.append((f"{pool}/{asset_name(kind, index, theme)}", kind, pool, bundle_type))
+    return assets
+
+class AssetSource:
+    """Archivos fuente de los assets: <assets_dir>/<pool>/<nombre>.<ext>"""
+
+    def __init__(self, assets_dir=None):
+        self.assets_dir = Path(assets_dir) if assets_dir else None
+        self._listing = {}
+
+    def find(self, key, bundle_type):
+        if not self.assets_dir:
+            return None
+        pool, name = key.split('/', 1)
+        if pool not in self._listing:
+            directory = self.assets_dir / pool
+            self._listing[pool] = {p.name: p for p in directory.iterdir() if p.is_file()} if directory.is_dir() else {}
+        for ext in SOURCE_EXTENSIONS[bundle_type]:
+            path = self._listing[pool].get(name + ext)
+            if path:
+                return path
+        return None
+
+def content_hash(path, key):
+    """sha256 del archivo fuente; sin archivo, de la clave lógica (el asset no se comparte)"""
+    digest = hashlib.sha256()
+    if path is None:
+        digest.update(b'placeholder:' + key.encode('utf-8'))
+    else:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+def png_size(path):
+    """(ancho, alto) desde el chunk IHDR de un PNG, sin decodificar la imagen"""
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n' or header[12:16] != b'IHDR':
+        raise ValueError(f"No es un PNG: {path}")
+    return struct.unpack('>II', header[16:24])
+
+def wav_duration_ms(path):
+    with wave.open(str(path), 'rb') as w:
+        return round(w.getnframes() * 1000 / w.getframerate())
+
+def next_pow2(value):
+    return 1 << max(0, value - 1).bit_length()
+
+def pack_shelves(sizes, max_size=DEFAULT_MAX_ATLAS_SIZE, padding=DEFAULT_PADDING):
+    """
+    Empaqueta rectángulos {nombre: (ancho, alto)} por estantes: ordenados por alto,
+    de izquierda a derecha y un estante nuevo cuando no caben en el ancho. Una
+    página nueva cuando no caben en el alto. Retorna [{'size': (w, h), 'frames': {nombre: (x, y, w, h)}}]
+    con páginas de lado potencia de 2
+    """
+    pages = []
+    page = shelf_y = shelf_h = x = None
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        if w + 2 * padding > max_size or h + 2 * padding > max_size:
+            raise ValueError(f"{name} ({w}x{h}) no cabe en un atlas de {max_size}px")
+        if page is not None and x + w + 2 * padding > max_size:
+            shelf_y, shelf_h, x = shelf_y + shelf_h, 0, 0
+        if page is None or shelf_y + h + 2 * padding > max_size:
+            page = {'frames': {}, 'used': [0, 0]}
+            pages.append(page)
+            shelf_y, shelf_h, x = 0, 0, 0
+        page['frames'][name] = (x + padding, shelf_y + padding, w, h)
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+        page['used'] = [max(page['used'][0], x + padding), max(page['used'][1], shelf_y + shelf_h + padding)]
+    return [{'size': (min(next_pow2(p['used'][0]), max_size), min(next_pow2(p['used'][1]), max_size)),
+             'frames': p['frames']} for p in pages]
+
+def _measure(asset, kind):
+    if kind in PLACEHOLDER_SIZES:
+        return png_size(asset['path']) if asset['path'] else PLACEHOLDER_SIZES[kind]
+    return wav_duration_ms(asset['path']) if asset['path'] else PLACEHOLDER_DURATIONS_MS[kind]
+
+def build_manifest(skins, themes, source, max_size=DEFAULT_MAX_ATLAS_SIZE, padding=DEFAULT_PADDING):
+    """
+    Deduplica los assets de todas las skins y arma los bundles. Retorna
+    (manifest, bundles): el manifest es JSON-serializable y determinista; bundles
+    es {bundle_id: plan} para write_bundles
+    """
+    assets = {}        # clave → {'kind', 'pool', 'bundle_type', 'path', 'hash'}
+    canonical = {}     # hash de contenido → clave que lo empaqueta
+    skin_entries = {}
+    naive_files = 0
+    for skin in skins:
+        keys = []
+        for key, kind, pool, bundle_type in skin_assets(skin, themes):
+            naive_files += 1
+            if key not in assets:
+                path = source.find(key, bundle_type)
+                digest = content_hash(path, key)
+                assets[key] = {'kind': kind, 'pool': pool, 'bundle_type': bundle_type, 'path': path, 'hash': digest}
+                canonical.setdefault(digest, key)
+            keys.append(key)
+        skin_entries[skin['skin_id']] = keys
+
+    # Agrupar los assets canónicos por bundle
+    groups = {}
+    for key in sorted(canonical.values()):
+        asset = assets[key]
+        if asset['bundle_type'] == 'file':
+            group = f"file_{key.replace('/', '_')}"
+        elif asset['bundle_type'] == 'pack':
+            group = f"pack_{asset['pool']}_{asset['kind']}"
+        else:
+            group = f"{asset['bundle_type']}_{asset['pool']}"
+        groups.setdefault(group, []).append(key)
+
+    bundles = {}
+    locations = {}     # clave canónica → ubicación en su bundle
+    for group, keys in sorted(groups.items()):
+        bundle_type = assets[keys[0]]['bundle_type']
+        if bundle_type == 'atlas':
+            sizes = {key: _measure(assets[key], assets[key]['kind']) for key in keys}
+            for page_number, page in enumerate(pack_shelves(sizes, max_size, padding)):
+                bundle_id = f"{group}_{page_number}"
+                bundles[bundle_id] = {'type': 'atlas', 'file': f"atlas/{bundle_id}.png", 'data': f"atlas/{bundle_id}.json",
+                                      'size': page['size'], 'frames': page['frames'],
+                                      'sources': {key: assets[key]['path'] for key in page['frames']}}
+                for key, frame in page['frames'].items():
+                    locations[key] = {'bundle': bundle_id, 'frame': list(frame)}
+        elif bundle_type == 'audio':
+            sprite, offset = {}, 0
+            for key in keys:
+                duration = _measure(assets[key], assets[key]['kind'])
+                sprite[key] = [offset, duration]
+                offset += duration + AUDIO_GAP_MS
+            bundles[group] = {'type': 'audio', 'file': f"audio/{group}.wav", 'data': f"audio/{group}.json",
+                              'sprite': sprite, 'sources': {key: assets[key]['path'] for key in keys}}
+            for key in keys:
+                locations[key] = {'bundle': group, 'sprite': key}
+        else:
+            folder = 'packs' if bundle_type == 'pack' else 'files'
+            bundles[group] = {'type': bundle_type, 'sources': {key: assets[key]['path'] for key in keys},
+                              'file': f"{folder}/{group}.zip" if bundle_type == 'pack' else None}
+            for key in keys:
+                locations[key] = {'bundle': group, 'entry': key}
+
+    for bundle_id, bundle in bundles.items():
+        # Sin Pillow el atlas queda solo como layout
+        bundle['built'] = (all(path is not None for path in bundle['sources'].values())
+                           and (bundle['type'] != 'atlas' or PIL_AVAILABLE))
+        if bundle['file'] is None:
+            path = next(iter(bundle['sources'].values()))
+            suffix = path.suffix if path else SOURCE_EXTENSIONS['file'][0]
+            bundle['file'] = f"files/{bundle_id[len('file_'):]}{suffix}"
+
+    asset_table = {key: {**locations[canonical[asset['hash']]], 'hash': asset['hash'][:16]}
+                   for key, asset in sorted(assets.items())}
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'bundles': {bundle_id: {'type': bundle['type'], 'file': bundle['file'], 'built': bundle['built'],
+                                **({'data': bundle['data']} if 'data' in bundle else {})}
+                    for bundle_id, bundle in sorted(bundles.items())},
+        'assets': asset_table,
+        'skins': {skin_id: {'bundles': sorted({asset_table[key]['bundle'] for key in keys}), 'assets': keys}
+                  for skin_id, keys in skin_entries.items()},
+        'stats': {'skins': len(skin_entries), 'naive_files': naive_files, 'unique_assets': len(assets),
+                  'packed_assets': len(canonical), 'bundles': len(bundles)},
+    }
+    payload = json.dumps(manifest, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    manifest['version'] = hashlib.sha256(payload).hexdigest()[:16]
+    return manifest, bundles
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+def _write_atlas_image(path, bundle):
+    atlas = Image.new('RGBA', tuple(bundle['size']), (0, 0, 0, 0))
+    for key, (x, y, _, _) in bundle['frames'].items():
+        with Image.open(bundle['sources'][key]) as sprite:
+            atlas.paste(sprite.convert('RGBA'), (x, y))
+    atlas.save(path, optimize=True)
+
+def _write_audio_sprite(path, bundle):
+    params = None
+    with wave.open(str(path), 'wb') as out:
+        for key in bundle['sprite']:
+            with wave.open(str(bundle['sources'][key]), 'rb') as clip:
+                clip_params = (clip.getnchannels(), clip.getsampwidth(), clip.getframerate())
+                if params is None:
+                    params = clip_params
+                    out.setnchannels(params[0])
+                    out.setsampwidth(params[1])
+                    out.setframerate(params[2])
+                elif clip_params != params:
+                    raise ValueError(f"{key}: formato WAV distinto al resto del audio sprite {clip_params} != {params}")
+                out.writeframes(clip.readframes(clip.getnframes()))
+            gap_frames = params[2] * AUDIO_GAP_MS // 1000
+            out.writeframes(b'\x00' * gap_frames * params[0] * params[1])
+
+def write_bundles(bundles, out_dir):
+    """
+    Escribe los layouts (JSON de atlas y audio sprites) y, para los bundles con
+    todos sus archivos fuente, el bundle en sí. Retorna {bundle_id: bytes escritos o None}
+    """
+    out_dir = Path(out_dir)
+    written = {}
+    for bundle_id, bundle in sorted(bundles.items()):
+        target = out_dir / bundle['file']
+        if bundle['type'] == 'atlas':
+            _write_json(out_dir / bundle['data'], {
+                'frames': {key: {'frame': dict(zip('xywh', frame)), 'sourceSize': {'w': frame[2], 'h': frame[3]}}
+                           for key, frame in bundle['frames'].items()},
+                'meta': {'image': target.name, 'size': dict(zip('wh', bundle['size'])), 'format': 'RGBA8888'},
+            })
+        elif bundle['type'] == 'audio':
+            _write_json(out_dir / bundle['data'], {'src': [target.name], 'sprite': bundle['sprite']})
+        if not bundle['built']:
+            written[bundle_id] = None
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if bundle['type'] == 'atlas':
+            _write_atlas_image(target, bundle)
+        elif bundle['type'] == 'audio':
+            _write_audio_sprite(target, bundle)
+        elif bundle['type'] == 'pack':
+            with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as pack:
+                for key, path in sorted(bundle['sources'].items()):
+                    pack.write(path, key + path.suffix)
+        else:
+            with open(next(iter(bundle['sources'].values())), 'rb') as src, open(target, 'wb') as dst:
+                dst.write(src.read())
+        written[bundle_id] = os.path.getsize(target)
+    return written
@@ -0,0 +1,185 @@
+"""
+Especificación declarativa de skins: temática × engine × dificultad × variante
+Los catálogos de skins se declaraban como loops anidados que copiaban el dict
+completo de cada skin y se cortaban con `if len(skins) >= 15: break`. Aquí cada
+familia declara sus ejes y una plantilla de campos, y expand_skins la expande
+de forma perezosa: genera una skin a la vez, así que un catálogo de miles de
+skins se escribe a JSON, SQL o COPY sin tenerlo completo en memoria.
+
+Ejes de una familia:
+    mode='product'   engine × grado × temática × dificultad × variante (en ese orden)
+    mode='cycle'     `count` skins; la skin i toma themes[i % n], engines[i % n], ...
+
+Plantillas: los strings se formatean con el contexto de la skin ('{theme_name}',
+'{element}', '{Difficulty}', '{variant_number}', '{grade}', ...), By(...) elige un
+valor según un campo del contexto y dicts/listas se recorren recursivamente.
+
+Dos skins con la misma configuración (todo salvo skin_id y name) se emiten una
+sola vez: se guarda un hash de 16 bytes por skin, no la skin.
+
+Uso:
+    catalog = SkinCatalog('MAT', 'SKIN_MAT_', MATH_THEMES, [
+        SkinFamily([('ENG01', 'COUNTER')], ['animales', 'espacio'], COUNTER_TEMPLATE, variants=5),
+    ])
+    for skin in expand_skins(catalog):
+        ...
+"""
+
+import hashlib
+import json
+from itertools import product
+
+DIFFICULTIES = ['easy', 'medium', 'hard']
+
+# Orden de campos de cada skin (columnas de game_skin salvo status)
+SKIN_FIELDS = [
+    'skin_id', 'engine_id', 'engine_code', 'name', 'description', 'theme', 'subject',
+    'recommended_grades', 'bloom_level', 'difficulty', 'visual_config', 'gameplay_config',
+    'learning_objectives', 'appeal_rating', 'estimated_dev_time', 'assets_needed',
+]
+
+# Campos que no cuentan para decidir si dos skins son la misma configuración
+IDENTITY_FIELDS = ('skin_id', 'name')
+
+# Colores de la temática, comunes a todos los visual_config
+THEME_COLORS = {
+    'primary_color': '{primary_color}',
+    'secondary_color': '{secondary_color}',
+    'accent_color': '{accent_color}',
+}
+
+class By:
+    """Valor según un campo del contexto: By('difficulty', easy=10, medium=50, hard=100)"""
+
+    def __init__(self, field, values=None, default=None, **kwargs):
+        self.field = field
+        self.values = {**(values or {}), **kwargs}
+        self.default = default
+
+    def resolve(self, context):
+        key = context[self.field]
+        if key in self.values:
+            return self.values[key]
+        if self.default is None:
+            raise KeyError(f"By('{self.field}'): sin valor para {key!r}")
+        return self.default
+
+class SkinFamily:
+    """Familia de skins: ejes a expandir y plantilla de campos"""
+
+    def __init__(self, engines, themes, template, difficulties=DIFFICULTIES, variants=1,
+                 grades=None, mode='product', count=None, limit=None):
+        if mode not in ('product', 'cycle'):
+            raise ValueError(f"mode desconocido: {mode}")
+        if mode == 'cycle' and (count is None or grades):
+            raise ValueError("mode='cycle' requiere count y no admite grades")
+        self.engines = list(engines)        # pares (engine_id, engine_code)
+        self.themes = list(themes)          # claves de SkinCatalog.themes
+        self.template = template
+        self.difficulties = list(difficulties)
+        self.variants = variants
+        self.grades = list(grades) if grades else None
+        self.mode = mode
+        self.count = count
+        self.limit = limit                  # máximo de combinaciones (antes de deduplicar)
+
+    def slots(self):
+        """(engine, grado, temática, dificultad, variante, índice) de cada skin, en orden"""
+        if self.mode == 'cycle':
+            for i in range(self.count):
+                yield (self.engines[i % len(self.engines)], None, self.themes[i % len(self.themes)],
+                       self.difficulties[i % len(self.difficulties)], i, i)
+            return
+        combos = product(self.engines, self.grades or [None], self.themes, self.difficulties, range(self.variants))
+        for i, (engine, grade, theme, difficulty, variant) in enumerate(combos):
+            if self.limit is not None and i >= self.limit:
+                return
+            yield engine, grade, theme, difficulty, variant, i
+
+class SkinCatalog:
+    """Skins de una asignatura: temáticas, familias y prefijo de skin_id"""
+
+    def __init__(self, subject, id_prefix, themes, families, id_width=3):
+        self.subject = subject
+        self.id_prefix = id_prefix
+        self.themes = themes
+        self.families = list(families)
+        self.id_width = id_width
+
+    def skin_id(self, number):
+        return f"{self.id_prefix}{number:0{self.id_width}d}"
+
+def render(template, context):
+    """Instancia una plantilla (str, By, dict, list o literal) con el contexto de una skin"""
+    if isinstance(template, str):
+        return template.format(**context)
+    if isinstance(template, By):
+        return render(template.resolve(context), context)
+    if isinstance(template, dict):
+        return {key: render(value, context) for key, value in template.items()}
+    if isinstance(template, (list, tuple)):
+        return [render(value, context) for value in template]
+    return template
+
+def slot_context(catalog, family, slot):
+    """Variables disponibles para las plantillas de una skin"""
+    (engine_id, engine_code), grade, theme_key, difficulty, variant, index = slot
+    theme = catalog.themes[theme_key]
+    colors = theme['colors']
+    return {
+        'subject': catalog.subject,
+        'engine_id': engine_id,
+        'engine_code': engine_code,
+        'grade': grade,
+        'theme': theme_key,
+        'theme_name': theme['name'],
+        'theme_name_lower': theme['name'].lower(),
+        'appeal': theme['appeal'],
+        'primary_color': colors[0],
+        'secondary_color': colors[1],
+        'accent_color': colors[2],
+        'element': theme['elements'][variant % len(theme['elements'])],
+        'difficulty': difficulty,
+        'Difficulty': difficulty.title(),
+        'variant': variant,
+        'variant_number': variant + 1,
+        'variant_parity': 'even' if variant % 2 == 0 else 'odd',
+        'round': index // len(family.themes) + 1,
+    }
+
+def skin_content_hash(skin):
+    """Hash de la configuración de una skin, sin skin_id ni name"""
+    config = {key: value for key, value in skin.items() if key not in IDENTITY_FIELDS}
+    payload = json.dumps(config, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+def build_skin(context, fields):
+    """Skin con los campos en el orden de SKIN_FIELDS (los extra de la plantilla al final)"""
+    values = {key: context[key] for key in ('engine_id', 'engine_code', 'theme', 'subject', 'difficulty')}
+    values.update(fields)
+    skin = {key: values[key] for key in SKIN_FIELDS if key in values}
+    skin.update((key, value) for key, value in values.items() if key not in skin)
+    return skin
+
+def expand_skins(catalog, stats=None):
+    """
+    Genera las skins de un catálogo una a una, numeradas en orden y sin
+    configuraciones repetidas. `stats` (dict opcional) acumula 'generated' y 'duplicates'
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault('generated', 0)
+    stats.setdefault('duplicates', 0)
+    seen = set()
+    number = 0
+    for family in catalog.families:
+        for slot in family.slots():
+            context = slot_context(catalog, family, slot)
+            skin = build_skin(context, render(family.template, context))
+            key = skin_content_hash(skin)
+            if key in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(key)
+            number += 1
+            stats['generated'] += 1
+            yield {'skin_id': catalog.skin_id(number), **skin}
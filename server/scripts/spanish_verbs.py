@@ -0,0 +1,117 @@
+"""
+Tokenización y lematización de verbos en español para el mapeo Bloom
+Las descripciones de OA usan los verbos conjugados ("reconocen", "identificando",
+"expresarse", "demostrando que comprenden") mientras que verb_bloom.csv lista
+infinitivos. Este módulo normaliza el texto (minúsculas, sin tildes) y genera
+una tabla precalculada forma → infinitivo para los verbos de referencia, de modo
+que el scoring Bloom sea un solo lookup por token.
+
+Formas generadas por infinitivo (-ar / -er / -ir):
+    presente 3ª persona:  identifica, identifican / reconoce, reconocen
+    gerundio:             identificando, reconociendo, leyendo, construyendo
+    participio:           identificado, identificada, identificados, identificadas
+    pronominal:           expresarse, expresandose
+
+Uso desde enrich_oa.py:
+    lemmas = build_lemma_table(['reconocer', 'identificar'])
+    [lemmas.get(token) for token in tokenize('Reconocen e identifican...')]
+"""
+
+import re
+import unicodedata
+from itertools import islice
+
+TOKEN_RE = re.compile(r'\w+')
+NON_ASCII_RE = re.compile(r'[^\x00-\x7f]')
+
+# Raíces irregulares del presente (3ª persona) de verbos frecuentes en los OA
+IRREGULAR_STEMS = {
+    'demostrar': 'demuestr',
+    'comprobar': 'comprueb',
+    'probar': 'prueb',
+    'encontrar': 'encuentr',
+    'recordar': 'recuerd',
+    'mostrar': 'muestr',
+    'resolver': 'resuelv',
+    'medir': 'mid',
+    'elegir': 'elig',
+    'seguir': 'sigu',
+    'competir': 'compit',
+    'repetir': 'repit',
+    'inferir': 'infier',
+    'predecir': 'predic',
+}
+
+# Gerundios irregulares (cambio e → i en verbos -ir)
+IRREGULAR_GERUNDS = {
+    'medir': 'midiendo',
+    'elegir': 'eligiendo',
+    'seguir': 'siguiendo',
+    'competir': 'compitiendo',
+    'repetir': 'repitiendo',
+    'inferir': 'infiriendo',
+    'predecir': 'prediciendo',
+}
+
+def normalize_text(text):
+    """
+    Minúsculas y sin tildes ni diéresis (NFKD sin marcas combinantes): 'Diseñar' → 'disenar'.
+    Las marcas se quitan con una sola sustitución, así que sirve también para una
+    columna entera concatenada (enrich_oa.py)
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    if decomposed.isascii():
+        return decomposed
+    marks = [char for char in set(NON_ASCII_RE.findall(decomposed)) if unicodedata.combining(char)]
+    if not marks:
+        return decomposed
+    return re.sub(f"[{''.join(map(re.escape, marks))}]", '', decomposed)
+
+def tokenize(text, limit=None):
+    """Tokens normalizados del texto en una sola pasada (hasta `limit` tokens)"""
+    tokens = (match.group() for match in TOKEN_RE.finditer(normalize_text(text)))
+    return list(islice(tokens, limit))
+
+def verb_forms(infinitive):
+    """Formas conjugadas (normalizadas) de un infinitivo regular -ar/-er/-ir"""
+    infinitive = normalize_text(infinitive)
+    stem, ending = infinitive[:-2], infinitive[-2:]
+    if ending not in ('ar', 'er', 'ir') or not stem:
+        return {infinitive}
+
+    vowel = 'a' if ending == 'ar' else 'e'
+    participle = 'ad' if ending == 'ar' else 'id'
+    if infinitive in IRREGULAR_GERUNDS:
+        gerund = IRREGULAR_GERUNDS[infinitive]
+    elif ending == 'ar':
+        gerund = stem + 'ando'
+    elif stem[-1] in 'aeiou' and not stem.endswith('qu') and not stem.endswith('gu'):
+        gerund = stem + 'yendo'   # leer → leyendo, construir → construyendo
+    else:
+        gerund = stem + 'iendo'
+
+    # Presente 3ª persona: raíz irregular, -uir → -uye(n), o regular
+    if infinitive in IRREGULAR_STEMS:
+        present = IRREGULAR_STEMS[infinitive] + vowel
+    elif ending == 'ir' and stem.endswith('u') and not stem.endswith(('qu', 'gu')):
+        present = stem + 'ye'   # construir → construye, concluir → concluye
+    else:
+        present = stem + vowel
+
+    forms = {infinitive, infinitive + 'se', present, present + 'n', gerund, gerund + 'se'}
+    forms.update(stem + participle + suffix for suffix in ('o', 'a', 'os', 'as'))
+    return forms
+
+def build_lemma_table(infinitives):
+    """
+    Tabla forma → infinitivo. Ante una forma compartida por dos verbos gana el
+    primero; un infinitivo siempre se mapea a sí mismo
+    """
+    infinitives = [normalize_text(infinitive) for infinitive in infinitives]
+    table = {}
+    for infinitive in infinitives:
+        for form in sorted(verb_forms(infinitive)):  # orden estable: artefacto reproducible
+            table.setdefault(form, infinitive)
+    for infinitive in infinitives:
+        table[infinitive] = infinitive
+    return table
@@ -0,0 +1,160 @@
+"""
+Codificación tipada de valores para Postgres, compartida por los generadores
+Una sola implementación de comillas y escapes para todos los scripts que emiten
+SQL o cargan con COPY: texto (comillas simples y backslashes), arrays de texto,
+jsonb, timestamps, uuid, enteros y booleanos. NaN/None de pandas → NULL.
+
+Cada RowEncoder resuelve la función de codificación de cada columna una sola
+vez, y puede emitir la misma fila en tres formatos:
+    literals(row)  → tupla de literales SQL (para sql_writer.insert_statements)
+    copy_line(row) → línea COPY en formato texto (tab-separada, \\N = NULL)
+    params(row)    → valores para un INSERT parametrizado (con placeholders())
+
+Uso:
+    encoder = RowEncoder([('oa_code', 'text'), ('semester', 'int'), ('visual_config', 'jsonb')])
+    insert_statements('learning_objective', encoder.columns, map(encoder.literals, records))
+"""
+
+import json
+from datetime import date, datetime
+
+TYPES = ('text', 'uuid', 'int', 'bool', 'timestamp', 'jsonb', 'text[]')
+
+# Escapes del formato texto de COPY (una sola pasada con str.translate)
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+def is_null(value):
+    """None, NaN de pandas/numpy y NaT cuentan como NULL"""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)  # NaN / NaT
+    except (TypeError, ValueError):
+        return False
+
+def _timestamp_text(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def _json_text(value):
+    return json.dumps(value, ensure_ascii=False)
+
+def _array_element(value):
+    """Elemento de un array literal de Postgres: {"a","b \\"c\\""}"""
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+# --- Literales SQL ---------------------------------------------------------
+
+def sql_text(value):
+    """Literal de texto. Con backslashes usa E'' para no depender de standard_conforming_strings"""
+    if is_null(value):
+        return 'NULL'
+    text = str(value)
+    if "'" in text:
+        text = text.replace("'", "''")
+    if '\\' in text:
+        return "E'" + text.replace('\\', '\\\\') + "'"
+    return "'" + text + "'"
+
+def sql_int(value):
+    if is_null(value):
+        return 'NULL'
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Valor no entero para columna int: {value}")
+    return str(int(value))
+
+def sql_bool(value):
+    if is_null(value):
+        return 'NULL'
+    if isinstance(value, str):
+        value = value.strip().lower() in ('true', 't', '1', 'yes')
+    return 'true' if value else 'false'
+
+def sql_timestamp(value):
+    return 'NULL' if is_null(value) else sql_text(_timestamp_text(value))
+
+def _array_text(values):
+    return '{' + ','.join(_array_element(value) for value in values) + '}'
+
+def sql_jsonb(value):
+    return 'NULL' if is_null(value) else sql_text(_json_text(value)) + '::jsonb'
+
+def sql_text_array(values):
+    return 'NULL' if is_null(values) else sql_text(_array_text(values)) + '::text[]'
+
+SQL_ENCODERS = {
+    'text': sql_text,
+    'uuid': sql_text,
+    'int': sql_int,
+    'bool': sql_bool,
+    'timestamp': sql_timestamp,
+    'jsonb': sql_jsonb,
+    'text[]': sql_text_array,
+}
+
+# --- COPY (formato texto) --------------------------------------------------
+
+def _copy_scalar(text):
+    return text.translate(COPY_ESCAPES)
+
+COPY_ENCODERS = {
+    'text': lambda v: _copy_scalar(str(v)),
+    'uuid': str,
+    'int': sql_int,
+    'bool': lambda v: 't' if sql_bool(v) == 'true' else 'f',
+    'timestamp': lambda v: _copy_scalar(_timestamp_text(v)),
+    'jsonb': lambda v: _copy_scalar(_json_text(v)),
+    'text[]': lambda v: _copy_scalar(_array_text(v)),
+}
+
+# --- Parámetros (psycopg) --------------------------------------------------
+
+PARAM_ENCODERS = {
+    'text': str,
+    'uuid': str,
+    'int': lambda v: int(sql_int(v)),
+    'bool': lambda v: sql_bool(v) == 'true',
+    'timestamp': _timestamp_text,
+    'jsonb': _json_text,
+    'text[]': list,
+}
+
+PARAM_CASTS = {'uuid': '::uuid', 'timestamp': '::timestamp', 'jsonb': '::jsonb', 'text[]': '::text[]'}
+
+class RowEncoder:
+    def __init__(self, columns):
+        """`columns`: lista de (nombre, tipo) con tipo en TYPES"""
+        for name, col_type in columns:
+            if col_type not in TYPES:
+                raise ValueError(f"Tipo SQL desconocido para {name}: {col_type}")
+        self.columns = [name for name, _ in columns]
+        self.types = [col_type for _, col_type in columns]
+        self._sql = [SQL_ENCODERS[t] for t in self.types]
+        self._copy = [COPY_ENCODERS[t] for t in self.types]
+        self._params = [PARAM_ENCODERS[t] for t in self.types]
+
+    def _values(self, row):
+        """Valores en orden de columnas desde un dict o una secuencia"""
+        if isinstance(row, dict):
+            return [row.get(name) for name in self.columns]
+        return row
+
+    def literals(self, row):
+        return tuple(encode(value) for encode, value in zip(self._sql, self._values(row)))
+
+    def copy_line(self, row):
+        return '\t'.join(
+            '\\N' if is_null(value) else encode(value)
+            for encode, value in zip(self._copy, self._values(row))
+        ) + '\n'
+
+    def params(self, row):
+        return tuple(
+            None if is_null(value) else encode(value)
+            for encode, value in zip(self._params, self._values(row))
+        )
+
+    def placeholders(self):
+        """Placeholders psycopg con el cast de cada columna: (%s::uuid, %s, ...)"""
+        return '(' + ', '.join('%s' + PARAM_CASTS.get(t, '') for t in self.types) + ')'
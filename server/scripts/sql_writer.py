@@ -0,0 +1,54 @@
+"""
+Emisor de SQL en streaming para los generadores de carga a Supabase
+Los scripts generan su SQL como generadores de fragmentos (header, lotes de
+INSERT, footer) que se escriben directo al archivo abierto: la memoria no crece
+con la cantidad de filas y cada lote de `batch_size` filas va en un solo
+INSERT multi-fila en vez de un INSERT por fila.
+
+Las filas llegan como tuplas de literales SQL ya codificados.
+
+Uso:
+    with open('salida.sql', 'w', encoding='utf-8') as f:
+        write_sql(f, generate_sql(df, batch_size=500))
+
+    def generate_sql(df, batch_size=DEFAULT_BATCH_SIZE):
+        yield HEADER
+        yield from insert_statements('learning_objective', COLUMNS, rows(df),
+                                     batch_size=batch_size, on_conflict='ON CONFLICT (oa_code) DO NOTHING')
+        yield FOOTER
+"""
+
+from itertools import islice
+
+# Filas por INSERT multi-fila; 1 = un INSERT por fila (formato anterior)
+DEFAULT_BATCH_SIZE = 500
+
+def batched(rows, size):
+    """Agrupa un iterable en listas de hasta `size` elementos, sin materializarlo"""
+    if size < 1:
+        raise ValueError(f"batch_size debe ser >= 1: {size}")
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+def insert_statements(table, columns, rows, batch_size=DEFAULT_BATCH_SIZE, on_conflict=None):
+    """
+    Genera un INSERT multi-fila por lote de filas. `rows` es un iterable de
+    tuplas de literales SQL; `on_conflict` es la cláusula ON CONFLICT (sin ';')
+    que se agrega a cada lote
+    """
+    header = f"INSERT INTO {table} ({', '.join(columns)}) VALUES\n"
+    suffix = f"\n{on_conflict};\n\n" if on_conflict else ";\n\n"
+    for batch in batched(rows, batch_size):
+        values = ",\n".join(f"({', '.join(row)})" for row in batch)
+        yield header + values + suffix
+
+def write_sql(f, fragments):
+    """Escribe cada fragmento a medida que se genera; retorna los bytes de texto escritos"""
+    written = 0
+    for fragment in fragments:
+        written += f.write(fragment)
+    return written
@@ -0,0 +1,37 @@
+"""
+Identificadores deterministas (uuid5) para OA, engines y skins
+Los generadores asignaban un uuid4 nuevo a cada fila en cada corrida: cada
+recarga cambiaba las claves primarias (y sus índices), el SQL y el CSV de una
+misma corrida traían ids distintos, y dos corridas no se podían comparar.
+Aquí el id se deriva de la clave natural (oa_code, engine_id, skin_id), así que
+el mismo OA tiene el mismo oa_id en cada corrida, en cada archivo y en el
+backend, y los joins entre tablas se pueden precalcular offline.
+
+    id = uuid5(EDU21_NAMESPACE, '<tipo>:<clave>')     p. ej. 'oa:MA01OA01'
+
+EDU21_NAMESPACE es fijo (uuid5(NAMESPACE_URL, 'https://edu21.cl/plataformav3/ids'));
+cambiarlo cambia todos los ids. Desde Node: uuidv5('oa:MA01OA01', EDU21_NAMESPACE).
+
+Uso:
+    from stable_ids import oa_uuid, engine_uuid, skin_uuid
+    oa_uuid('MA01OA01')        # siempre el mismo uuid
+"""
+
+import uuid
+
+EDU21_NAMESPACE = uuid.UUID('c41b9a20-3c97-5e5c-8831-da62948b248e')
+
+def stable_uuid(kind, key):
+    """uuid5 de `key` (clave natural, sin espacios de borde) dentro de su tipo"""
+    if key is None or str(key).strip() == '':
+        raise ValueError(f"Clave vacía para id {kind}")
+    return str(uuid.uuid5(EDU21_NAMESPACE, f'{kind}:{str(key).strip()}'))
+
+def oa_uuid(oa_code):
+    return stable_uuid('oa', oa_code)
+
+def engine_uuid(engine_id):
+    return stable_uuid('engine', engine_id)
+
+def skin_uuid(skin_id):
+    return stable_uuid('skin', skin_id)
@@ -0,0 +1,86 @@
+"""
+Ejecución de tareas con dependencias (DAG) en paralelo
+Compartido por load_to_supabase.py (tablas) y pipeline.py (etapas del pipeline
+de OA): cada tarea declara de qué tareas depende, parte apenas terminan todas
+ellas y las independientes corren en paralelo en un pool de threads. Si una
+tarea falla, sus dependientes se omiten.
+
+`run(name)` retorna (estado, resumen); los estados los define quien llama
+('ok', 'cached', ...). Una excepción se registra como 'error' y un dependiente
+solo corre si sus dependencias terminaron en un estado de `success_states`.
+
+Uso:
+    deps = {'enrich': ('scrape',), 'scrape': ()}
+    results = run_graph(deps, lambda name: ('ok', f'{name} listo'), workers=4)
+    # {'scrape': ('ok', 0.01, 'scrape listo'), 'enrich': ('ok', 0.02, 'enrich listo')}
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+def resolve(deps, selected=None):
+    """Tareas pedidas más sus dependencias (transitivas), en el orden de `deps`"""
+    pending = list(selected or deps)
+    required = set()
+    while pending:
+        name = pending.pop()
+        if name not in deps:
+            raise ValueError(f"Tarea desconocida: {name}")
+        if name not in required:
+            required.add(name)
+            pending.extend(deps[name])
+    return [name for name in deps if name in required]
+
+def waves(deps, tasks=None):
+    """Agrupa las tareas en oleadas: cada oleada depende solo de las anteriores"""
+    remaining = list(tasks or deps)
+    done = set()
+    result = []
+    while remaining:
+        wave = [name for name in remaining if all(dep in done or dep not in remaining for dep in deps[name])]
+        if not wave:
+            raise ValueError(f"Dependencias circulares entre: {remaining}")
+        result.append(wave)
+        done.update(wave)
+        remaining = [name for name in remaining if name not in done]
+    return result
+
+def _timed(run, name):
+    """Corre la tarea y mide su duración, también cuando lanza una excepción"""
+    start = time.perf_counter()
+    try:
+        status, summary = run(name)
+    except Exception as e:
+        message = str(e).strip()
+        status, summary = 'error', message.splitlines()[0] if message else repr(e)
+    return status, time.perf_counter() - start, summary
+
+def run_graph(deps, run, tasks=None, workers=4, success_states=('ok', 'cached')):
+    """
+    Ejecuta `tasks` (default: todas) respetando `deps`, con hasta `workers` en
+    paralelo. Retorna {tarea: (estado, segundos, resumen)}
+    """
+    tasks = list(tasks or deps)
+    waves(deps, tasks)  # valida que no haya ciclos antes de empezar
+    results = {}
+    pending = list(tasks)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            for name in list(pending):
+                dependencies = [dep for dep in deps[name] if dep in tasks]
+                if any(dep in results and results[dep][0] not in success_states for dep in dependencies):
+                    results[name] = ('skipped', 0.0, 'dependencia fallida')
+                    pending.remove(name)
+                elif all(dep in results for dep in dependencies):
+                    running[executor.submit(_timed, run, name)] = name
+                    pending.remove(name)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results[running.pop(future)] = future.result()
+
+    return results